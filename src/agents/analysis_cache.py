@@ -0,0 +1,235 @@
+import hashlib
+import json
+import sqlite3
+from collections import OrderedDict
+from dataclasses import astuple
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.agents.ticket_analysis import ANALYSIS_VERSION, TicketAnalysis, TicketAnalysisAgent
+from src.agents.vader_lexicon import lexicon_version
+
+
+def normalize_content(ticket_content: str) -> str:
+    """
+    Normalizes ticket text for cache keys without changing its analysis.
+
+    Each line is stripped and blank lines are dropped. Key points are built from
+    stripped non-empty lines, and VADER splits on whitespace, so two tickets with
+    the same normalized text always get the same analysis.
+    """
+    return "\n".join(line.strip() for line in ticket_content.split("\n") if line.strip())
+
+
+def analysis_version(agent: TicketAnalysisAgent) -> str:
+    """
+    Returns the fingerprint of everything an agent's analyses depend on:
+    ANALYSIS_VERSION, the keyword rules, the VADER lexicon, the sentiment backend
+    and the long-content policy.
+    """
+    policy = agent.long_content
+    long_content = "full" if policy is None else ",".join(map(str, astuple(policy)))
+    return (f"{ANALYSIS_VERSION}:{agent.rules.fingerprint()}:{lexicon_version()}:"
+            f"{agent.sentiment_analyzer.backend}:{long_content}")
+
+
+class AnalysisCache:
+    """
+    Content-addressed cache of TicketAnalysis results.
+
+    Entries are keyed by a hash of the normalized ticket text and a version string
+    (see analysis_version). Recent entries live in a bounded
+    in-memory LRU; with a path, every entry is also written to an SQLite store so
+    it survives restarts. Entries from other versions are purged when the store is opened.
+    """
+
+    def __init__(self, max_entries: int = 10000, path: Optional[str] = None):
+        """
+        Initializes the cache.
+
+        Args:
+            max_entries (int): Maximum number of analyses kept in memory.
+            path (Optional[str]): SQLite file for the persistent store (memory only if None).
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.version: Optional[str] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS analysis_cache (key TEXT PRIMARY KEY, version TEXT NOT NULL, value TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    def bind(self, version: str):
+        """
+        Sets the version the cache serves, dropping entries computed under any other version.
+
+        Args:
+            version (str): Fingerprint of the analysis settings (see analysis_version).
+        """
+        if version == self.version:
+            return
+        self.version = version
+        self._entries.clear()
+        if self._db is not None:
+            self._db.execute("DELETE FROM analysis_cache WHERE version != ?", (version,))
+            self._db.commit()
+
+    def key(self, ticket_content: str) -> str:
+        """
+        Returns the cache key of a ticket under the bound version.
+        """
+        digest = hashlib.sha256(self.version.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(normalize_content(ticket_content).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[TicketAnalysis]:
+        """
+        Returns a fresh copy of the cached analysis for a key, or None.
+        """
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return TicketAnalysis.from_dict(data)
+        if self._db is not None:
+            row = self._db.execute("SELECT value FROM analysis_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                data = json.loads(row[0])
+                self._remember(key, data)
+                self.disk_hits += 1
+                return TicketAnalysis.from_dict(data)
+        self.misses += 1
+        return None
+
+    def put_many(self, items: Iterable[Tuple[str, TicketAnalysis]]):
+        """
+        Stores analyses by key, writing them to the persistent store in one transaction.
+        """
+        rows = []
+        for key, analysis in items:
+            data = analysis.to_dict()
+            self._remember(key, data)
+            rows.append((key, self.version, json.dumps(data)))
+        if self._db is not None and rows:
+            self._db.executemany("INSERT OR REPLACE INTO analysis_cache (key, version, value) VALUES (?, ?, ?)", rows)
+            self._db.commit()
+
+    def put(self, key: str, analysis: TicketAnalysis):
+        """
+        Stores one analysis by key.
+        """
+        self.put_many([(key, analysis)])
+
+    def _remember(self, key: str, data: dict):
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the cache counters.
+        """
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+        }
+
+    def close(self):
+        """
+        Closes the persistent store.
+        """
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class CachingAnalysisAgent:
+    """
+    Puts an AnalysisCache in front of a TicketAnalysisAgent.
+
+    It exposes the same analyze_ticket / analyze_batch interface. The cache version
+    is derived from ANALYSIS_VERSION, the agent's keyword rules and the VADER lexicon,
+    so changing any of them invalidates previously cached analyses automatically.
+    """
+
+    def __init__(self, agent: Optional[TicketAnalysisAgent] = None, cache: Optional[AnalysisCache] = None):
+        """
+        Initializes the caching agent.
+
+        Args:
+            agent (Optional[TicketAnalysisAgent]): The agent computing cache misses.
+            cache (Optional[AnalysisCache]): The cache to use (defaults to an in-memory cache).
+        """
+        self.agent = agent or TicketAnalysisAgent()
+        self.cache = cache or AnalysisCache()
+        self.cache.bind(self.version())
+
+    def version(self) -> str:
+        """
+        Returns the fingerprint of everything an analysis depends on.
+        """
+        return analysis_version(self.agent)
+
+    async def analyze_ticket(self, ticket_content: str, customer_info: Optional[dict] = None,
+                             fields: Optional[Iterable[str]] = None) -> TicketAnalysis:
+        """
+        Returns the cached analysis of the ticket, computing and caching it on a miss.
+
+        With a field mask, a cached analysis is returned when there is one; otherwise the
+        wrapped agent's lazy analysis is returned without caching it.
+        """
+        key = self.cache.key(ticket_content)
+        analysis = self.cache.get(key)
+        if analysis is None and fields is not None:
+            return self.agent.analyze_lazy(ticket_content, fields)
+        if analysis is None:
+            analysis = await self.agent.analyze_ticket(ticket_content, customer_info)
+            self.cache.put(key, analysis)
+        return analysis
+
+    async def analyze_batch(self, tickets: Iterable[Tuple[str, Optional[dict]]],
+                            batch_size: Optional[int] = None) -> List[TicketAnalysis]:
+        """
+        Analyzes a batch, sending only the cache misses to the wrapped agent's analyze_batch.
+        """
+        tickets = list(tickets)
+        keys = [self.cache.key(content) for content, _ in tickets]
+        results: List[Optional[TicketAnalysis]] = [None] * len(tickets)
+        missing: Dict[str, List[int]] = {}
+        for index, key in enumerate(keys):
+            if key in missing:
+                # Duplicate of a miss earlier in this batch: served without recomputation
+                missing[key].append(index)
+                self.cache.hits += 1
+                continue
+            results[index] = self.cache.get(key)
+            if results[index] is None:
+                missing[key] = [index]
+
+        if missing:
+            first = [indexes[0] for indexes in missing.values()]
+            analyses = await self.agent.analyze_batch([tickets[i] for i in first], batch_size)
+            self.cache.put_many((keys[i], analysis) for i, analysis in zip(first, analyses))
+            for indexes, analysis in zip(missing.values(), analyses):
+                results[indexes[0]] = analysis
+                for index in indexes[1:]:
+                    results[index] = TicketAnalysis.from_dict(analysis.to_dict())
+        return results
+
+    def __getattr__(self, name):
+        # Everything else (rules, matcher, batch_size, ...) comes from the wrapped agent
+        if name == "agent":
+            raise AttributeError(name)
+        return getattr(self.agent, name)
@@ -0,0 +1,345 @@
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from src.agents.keyword_rules import KeywordRules
+from src.agents.ticket_analysis import Priority, TicketAnalysis, TicketCategory
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the pure-Python paths give the same results
+    np = None
+
+CATEGORIES: List[TicketCategory] = list(TicketCategory)
+_CATEGORY_CODES = {category: code for code, category in enumerate(CATEGORIES)}
+
+# Bitmasks are stored as unsigned 64-bit integers
+MAX_URGENCY_VOCABULARY = 64
+
+
+class _Vocabulary:
+    # Dictionary encoding: interned strings <-> small integer codes
+    def __init__(self, words: Iterable[str] = ()):
+        self.words: List[str] = []
+        self.codes: Dict[str, int] = {}
+        for word in words:
+            self.code(word)
+
+    def code(self, word: str) -> int:
+        code = self.codes.get(word)
+        if code is None:
+            code = self.codes[word] = len(self.words)
+            self.words.append(word)
+        return code
+
+
+class TicketAnalysisColumns:
+    """
+    Compact, column-oriented store for many TicketAnalysis results.
+
+    Each field is kept in its own typed array instead of one object per ticket:
+    category and priority as int8 codes, sentiment as float64, urgency indicators as
+    a 64-bit mask over a vocabulary, follow-up flags as a packed bit array, short
+    strings dictionary-encoded, and list fields (key points, required expertise) as
+    offset-indexed pools. Rows are read back through lazy TicketAnalysisRow views.
+
+    Example:
+        columns = TicketAnalysisColumns.from_analyses(analyses)
+        columns.count_by("category", "priority")
+        columns.mean_sentiment(by="category")
+    """
+
+    def __init__(self, urgency_vocabulary: Optional[Sequence[str]] = None):
+        """
+        Initializes an empty store.
+
+        Args:
+            urgency_vocabulary (Optional[Sequence[str]]): Urgency words in report order
+                (defaults to the built-in KeywordRules urgency words). Indicators are read
+                back in this order, which matches the order analyze_ticket reports them in.
+        """
+        self._category = array("b")
+        self._priority = array("b")
+        self._sentiment = array("d")
+        self._urgency = array("Q")
+        self._follow_up = bytearray()
+        self._business_impact = array("B")
+        self._response_type = array("B")
+        self._key_point_offsets = array("Q", [0])
+        self._key_points: List[str] = []
+        self._expertise_offsets = array("Q", [0])
+        self._expertise = array("H")
+        self._urgency_words = _Vocabulary(urgency_vocabulary if urgency_vocabulary is not None
+                                          else KeywordRules().urgency_words)
+        self._impact_words = _Vocabulary()
+        self._response_types = _Vocabulary()
+        self._expertise_words = _Vocabulary()
+        # Long-content truncation records are rare, so they are kept sparsely by row index
+        self._truncation: Dict[int, dict] = {}
+
+    @classmethod
+    def from_analyses(cls, analyses: Iterable[TicketAnalysis], **kwargs) -> "TicketAnalysisColumns":
+        """
+        Builds a store from TicketAnalysis objects (or row views).
+        """
+        columns = cls(**kwargs)
+        columns.extend(analyses)
+        return columns
+
+    def __len__(self) -> int:
+        return len(self._category)
+
+    def append(self, analysis: TicketAnalysis):
+        """
+        Appends one analysis to the store.
+
+        Raises:
+            ValueError: If more than MAX_URGENCY_VOCABULARY distinct urgency indicators are stored.
+        """
+        index = len(self._category)
+        mask = 0
+        for word in analysis.urgency_indicators:
+            code = self._urgency_words.code(word)
+            if code >= MAX_URGENCY_VOCABULARY:
+                raise ValueError(f"At most {MAX_URGENCY_VOCABULARY} distinct urgency indicators can be stored")
+            mask |= 1 << code
+
+        self._category.append(_CATEGORY_CODES[analysis.category])
+        self._priority.append(int(analysis.priority))
+        self._sentiment.append(analysis.sentiment)
+        self._urgency.append(mask)
+        if index % 8 == 0:
+            self._follow_up.append(0)
+        if analysis.follow_up_required:
+            self._follow_up[index >> 3] |= 1 << (index & 7)
+        self._business_impact.append(self._impact_words.code(analysis.business_impact))
+        self._response_type.append(self._response_types.code(analysis.suggested_response_type))
+        self._key_points.extend(analysis.key_points)
+        self._key_point_offsets.append(len(self._key_points))
+        self._expertise.extend(self._expertise_words.code(word) for word in analysis.required_expertise)
+        self._expertise_offsets.append(len(self._expertise))
+        if analysis.truncation is not None:
+            self._truncation[index] = analysis.truncation
+
+    def extend(self, analyses: Iterable[TicketAnalysis]):
+        """
+        Appends many analyses to the store.
+        """
+        for analysis in analyses:
+            self.append(analysis)
+
+    def __getitem__(self, index: int) -> "TicketAnalysisRow":
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TicketAnalysisColumns index out of range")
+        return TicketAnalysisRow(self, index)
+
+    def __iter__(self) -> Iterator["TicketAnalysisRow"]:
+        return (TicketAnalysisRow(self, index) for index in range(len(self)))
+
+    def to_analysis(self, index: int) -> TicketAnalysis:
+        """
+        Materializes one row as a regular TicketAnalysis.
+        """
+        row = self[index]
+        return TicketAnalysis(
+            category=row.category,
+            priority=row.priority,
+            key_points=row.key_points,
+            required_expertise=row.required_expertise,
+            sentiment=row.sentiment,
+            urgency_indicators=row.urgency_indicators,
+            business_impact=row.business_impact,
+            suggested_response_type=row.suggested_response_type,
+            follow_up_required=row.follow_up_required,
+            truncation=row.truncation,
+        )
+
+    # --- Aggregation helpers ---
+
+    def _codes(self, field: str):
+        if field == "category":
+            return self._category
+        if field == "priority":
+            return self._priority
+        raise ValueError(f"Cannot group by {field!r}; expected 'category' or 'priority'")
+
+    @staticmethod
+    def _label(field: str, code: int):
+        return CATEGORIES[code] if field == "category" else Priority(code)
+
+    def count_by(self, *fields: str) -> Dict:
+        """
+        Counts tickets per category, per priority, or per (category, priority).
+
+        Args:
+            *fields (str): "category" and/or "priority".
+
+        Returns:
+            Dict: Count per label (or per tuple of labels when grouping by several fields).
+        """
+        if not fields:
+            raise ValueError("count_by needs at least one field")
+        keys, radix = self._group_keys(fields)
+        if np is not None:
+            counts = np.bincount(keys, minlength=1).tolist() if len(self) else []
+        else:
+            counts = [0] * (max(keys) + 1 if len(self) else 0)
+            for key in keys:
+                counts[key] += 1
+        return {self._decode(fields, radix, key): count for key, count in enumerate(counts) if count}
+
+    def mean_sentiment(self, by: Optional[str] = None):
+        """
+        Returns the mean sentiment, overall or per category / priority.
+
+        Args:
+            by (Optional[str]): None, "category" or "priority".
+
+        Returns:
+            float or Dict: The overall mean (0.0 when empty), or the mean per label.
+        """
+        if by is None:
+            if not len(self):
+                return 0.0
+            if np is not None:
+                return float(np.frombuffer(self._sentiment, dtype=np.float64).mean())
+            return sum(self._sentiment) / len(self)
+        keys, radix = self._group_keys((by,))
+        if np is not None:
+            if not len(self):
+                return {}
+            counts = np.bincount(keys)
+            sums = np.bincount(keys, weights=np.frombuffer(self._sentiment, dtype=np.float64))
+            return {self._decode((by,), radix, key): float(sums[key] / counts[key])
+                    for key in range(len(counts)) if counts[key]}
+        totals: Dict[int, List[float]] = {}
+        for key, sentiment in zip(keys, self._sentiment):
+            total = totals.setdefault(key, [0.0, 0])
+            total[0] += sentiment
+            total[1] += 1
+        return {self._decode((by,), radix, key): total[0] / total[1] for key, total in sorted(totals.items())}
+
+    def follow_up_count(self) -> int:
+        """
+        Returns the number of tickets that require a follow-up.
+        """
+        return sum(bin(byte).count("1") for byte in self._follow_up)
+
+    def urgency_counts(self) -> Dict[str, int]:
+        """
+        Returns how many tickets contain each urgency indicator.
+        """
+        counts = {}
+        for code, word in enumerate(self._urgency_words.words):
+            bit = 1 << code
+            if np is not None:
+                masks = np.frombuffer(self._urgency, dtype=np.uint64)
+                count = int(np.count_nonzero(masks & np.uint64(bit)))
+            else:
+                count = sum(1 for mask in self._urgency if mask & bit)
+            if count:
+                counts[word] = count
+        return counts
+
+    def _group_keys(self, fields: Sequence[str]) -> Tuple[object, int]:
+        # Combine the small-int codes of several columns into one key per row
+        radix = 8
+        columns = [self._codes(field) for field in fields]
+        if np is not None:
+            keys = np.zeros(len(self), dtype=np.int64)
+            for column in columns:
+                keys = keys * radix + np.frombuffer(column, dtype=np.int8)
+            return keys, radix
+        keys = [0] * len(self)
+        for column in columns:
+            keys = [key * radix + code for key, code in zip(keys, column)]
+        return keys, radix
+
+    def _decode(self, fields: Sequence[str], radix: int, key: int):
+        labels = []
+        for field in reversed(fields):
+            labels.append(self._label(field, key % radix))
+            key //= radix
+        labels.reverse()
+        return labels[0] if len(labels) == 1 else tuple(labels)
+
+    def nbytes(self) -> int:
+        """
+        Approximates the memory held by the column buffers (excluding the key point strings).
+        """
+        buffers = [self._category, self._priority, self._sentiment, self._urgency, self._business_impact,
+                   self._response_type, self._key_point_offsets, self._expertise_offsets, self._expertise]
+        return sum(buf.itemsize * len(buf) for buf in buffers) + len(self._follow_up)
+
+
+class TicketAnalysisRow:
+    """
+    Lazy, read-only view of one row of a TicketAnalysisColumns store.
+
+    It exposes the same attributes as TicketAnalysis, decoded on access.
+    """
+
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns: TicketAnalysisColumns, index: int):
+        self._columns = columns
+        self._index = index
+
+    @property
+    def category(self) -> TicketCategory:
+        return CATEGORIES[self._columns._category[self._index]]
+
+    @property
+    def priority(self) -> Priority:
+        return Priority(self._columns._priority[self._index])
+
+    @property
+    def sentiment(self) -> float:
+        return self._columns._sentiment[self._index]
+
+    @property
+    def key_points(self) -> List[str]:
+        offsets = self._columns._key_point_offsets
+        return self._columns._key_points[offsets[self._index]:offsets[self._index + 1]]
+
+    @property
+    def required_expertise(self) -> List[str]:
+        columns = self._columns
+        offsets = columns._expertise_offsets
+        words = columns._expertise_words.words
+        return [words[code] for code in columns._expertise[offsets[self._index]:offsets[self._index + 1]]]
+
+    @property
+    def urgency_indicators(self) -> List[str]:
+        mask = self._columns._urgency[self._index]
+        return [word for code, word in enumerate(self._columns._urgency_words.words) if mask >> code & 1]
+
+    @property
+    def business_impact(self) -> str:
+        return self._columns._impact_words.words[self._columns._business_impact[self._index]]
+
+    @property
+    def suggested_response_type(self) -> str:
+        return self._columns._response_types.words[self._columns._response_type[self._index]]
+
+    @property
+    def follow_up_required(self) -> bool:
+        return bool(self._columns._follow_up[self._index >> 3] >> (self._index & 7) & 1)
+
+    @property
+    def truncation(self) -> Optional[dict]:
+        return self._columns._truncation.get(self._index)
+
+    def to_dict(self) -> dict:
+        """
+        Converts the row into the same plain-JSON layout as TicketAnalysis.to_dict.
+        """
+        return self._columns.to_analysis(self._index).to_dict()
+
+    def __eq__(self, other):
+        if isinstance(other, (TicketAnalysis, TicketAnalysisRow)):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def __repr__(self):
+        return f"TicketAnalysisRow({self._index}, {self.to_dict()!r})"
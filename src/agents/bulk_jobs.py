@@ -0,0 +1,246 @@
+import hashlib
+import json
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.agents.analysis_cache import analysis_version, normalize_content
+from src.agents.bulk_orchestration import CustomJSONEncoder, normalize_ticket
+from src.agents.ticket_analysis import TicketAnalysis
+
+
+def ticket_fingerprint(ticket: dict, version: str) -> str:
+    """
+    Hashes everything a ticket's result depends on: its normalized content, its customer
+    info and the job version (analysis_version and the templates).
+    """
+    payload = json.dumps([version, normalize_content(ticket["content"]), ticket["customer_info"]],
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CheckpointLog:
+    """
+    Append-only JSONL log of completed tickets.
+
+    Each line is a result record {"ticket_id", "fingerprint", "ticket_analysis", "response"}.
+    Records are appended a batch at a time, then flushed and fsync'd, so a crash loses at
+    most the batch in progress. When the log is reopened, a torn last line left by a crash
+    is truncated away and every complete record is indexed. Only each ticket's fingerprint
+    and the position of its line are kept in memory; lines are read back from the file.
+    """
+
+    def __init__(self, path: str, fsync: bool = True):
+        """
+        Opens (or creates) the log and indexes the records it already holds.
+
+        Args:
+            path (str): Path of the JSONL log.
+            fsync (bool): Whether to fsync after every batch.
+        """
+        self.path = path
+        self.fsync = fsync
+        self._records: Dict[str, Tuple[Optional[str], int, int]] = {}
+        self._size = self._recover()
+        self._file = open(path, "ab")
+        self._reader = open(path, "rb")
+
+    def _recover(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+        valid_end = 0
+        with open(self.path, "rb") as file:
+            for raw in file:
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    break
+                self._records[str(record["ticket_id"])] = (record.get("fingerprint"), valid_end, len(raw) - 1)
+                valid_end += len(raw)
+        if valid_end != os.path.getsize(self.path):
+            with open(self.path, "r+b") as file:
+                file.truncate(valid_end)
+        return valid_end
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def fingerprint(self, key: str) -> Optional[str]:
+        """
+        Returns the fingerprint a ticket was completed with, or None if it is not in the log.
+        """
+        entry = self._records.get(key)
+        return None if entry is None else entry[0]
+
+    def get(self, key: str, fingerprint: str) -> Optional[str]:
+        """
+        Returns the logged record line of a ticket if it was completed with the same fingerprint.
+        """
+        if key not in self._records or self.fingerprint(key) != fingerprint:
+            return None
+        return self.line(key)
+
+    def line(self, key: str) -> str:
+        """
+        Returns the logged record line of a ticket, read back from the log.
+        """
+        _, offset, length = self._records[key]
+        self._reader.seek(offset)
+        return self._reader.read(length).decode("utf-8")
+
+    def append_batch(self, entries: List[Tuple[str, str, str]]):
+        """
+        Appends (key, fingerprint, record line) entries and makes them durable.
+        """
+        if not entries:
+            return
+        data = [(key, fingerprint, line.encode("utf-8")) for key, fingerprint, line in entries]
+        self._file.write(b"".join(encoded + b"\n" for _, _, encoded in data))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        for key, fingerprint, encoded in data:
+            self._records[key] = (fingerprint, self._size, len(encoded))
+            self._size += len(encoded) + 1
+
+    def close(self):
+        self._file.close()
+        self._reader.close()
+
+
+class _PreviousOutput:
+    # Fingerprinted records of an earlier JSONL run, indexed by ticket_id -> (fingerprint, offset, length).
+    # Records without a fingerprint (e.g. the data/processed_tickets.json layout) come from older
+    # analysis logic, so they are never reused and are not indexed.
+    def __init__(self, path: str):
+        self.path = path
+        self._records: Dict[str, Tuple[str, int, int]] = {}
+        self._file = open(path, "rb")
+        self.legacy = False
+        offset = 0
+        for raw in self._file:
+            stripped = raw.strip()
+            if stripped.startswith(b"["):
+                self.legacy = True  # a JSON array: the legacy layout, without fingerprints
+                break
+            if stripped and b'"fingerprint"' in stripped:
+                record = json.loads(stripped)
+                if "fingerprint" in record and "ticket_id" in record:
+                    self._records[str(record["ticket_id"])] = (record["fingerprint"], offset, len(raw))
+            offset += len(raw)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def find(self, key: str, fingerprint: str) -> Optional[dict]:
+        # The earlier record of a ticket, if it was produced with the same fingerprint
+        entry = self._records.get(key)
+        if entry is None or entry[0] != fingerprint:
+            return None
+        self._file.seek(entry[1])
+        return json.loads(self._file.read(entry[2]))
+
+    def close(self):
+        self._file.close()
+
+
+async def run_bulk_job(tickets: Iterable, checkpoint_path: str, output=None, processor=None,
+                       batch_size: int = 256, previous: Optional[str] = None, fsync: bool = True) -> Dict[str, int]:
+    """
+    Processes tickets as a resumable job, logging each finished batch to a checkpoint.
+
+    Tickets already in the checkpoint with an unchanged fingerprint are skipped, so rerunning
+    an interrupted job only processes the remaining tickets. With previous, the results of an
+    earlier run of this job (its JSONL output) are reused for tickets whose fingerprint is
+    unchanged. Records without a fingerprint, such as data/processed_tickets.json, were
+    produced by older analysis logic, so those tickets are analyzed again (and a note says
+    so on stderr). A ticket_id seen earlier in the same input becomes an error record, since
+    the checkpoint and previous output identify tickets by id.
+
+    Results are written to output batch by batch, in input order, so memory stays bounded
+    and a crash leaves the output of every completed batch.
+
+    Args:
+        tickets (Iterable): Tickets (strings or {"content", "customer_info"[, "ticket_id"]} dicts);
+            tickets without a ticket_id are identified by their position.
+        checkpoint_path (str): Path of the append-only checkpoint log (created if missing).
+        output: Optional text file object receiving every result as JSONL, in input order.
+        processor (TicketProcessor): Processor to use (defaults to a quiet TicketProcessor).
+        batch_size (int): Tickets analyzed (and checkpointed) per batch.
+        previous (Optional[str]): Path of an earlier run's JSONL output, for incremental runs.
+        fsync (bool): Whether to fsync the checkpoint after every batch.
+
+    Returns:
+        Dict[str, int]: {"processed", "resumed", "reused", "errors"} counts.
+    """
+    from src.processor import TicketProcessor
+
+    processor = processor or TicketProcessor(verbose=False)
+    version = f"{analysis_version(processor.analysis_agent)}:{processor.templates.version}"
+    log = CheckpointLog(checkpoint_path, fsync)
+    prior = _PreviousOutput(previous) if previous else None
+    if prior is not None and not prior:
+        reason = "a legacy JSON array without fingerprints" if prior.legacy else "no fingerprinted records"
+        print(f"{previous}: {reason}; no earlier results can be reused", file=sys.stderr)
+    stats = {"processed": 0, "resumed": 0, "reused": 0, "errors": 0}
+    # Tickets since the last flush, in input order: (key, error record line or None)
+    batch: List[Tuple[str, Optional[str]]] = []
+    ready: List[Tuple[str, str, str]] = []
+    pending: List[Tuple[str, object, str, dict]] = []
+    seen = set()
+
+    def record_line(ticket_id, fingerprint, analysis: TicketAnalysis, response) -> str:
+        return json.dumps({"ticket_id": ticket_id, "fingerprint": fingerprint,
+                           "ticket_analysis": analysis.to_dict(), "response": response}, cls=CustomJSONEncoder)
+
+    async def flush():
+        if pending:
+            results = await processor.process_tickets([dict(ticket, ticket_id=ticket_id) for _, ticket_id, _, ticket in pending])
+            for (key, ticket_id, fingerprint, _), result in zip(pending, results):
+                ready.append((key, fingerprint, record_line(ticket_id, fingerprint, result["ticket_analysis"],
+                                                            result["response"])))
+            stats["processed"] += len(pending)
+            pending.clear()
+        log.append_batch(ready)
+        ready.clear()
+        if output is not None and batch:
+            output.write("".join((error if error is not None else log.line(key)) + "\n" for key, error in batch))
+            output.flush()
+        batch.clear()
+
+    try:
+        for index, raw in enumerate(tickets):
+            explicit_id = isinstance(raw, dict) and "ticket_id" in raw
+            ticket_id = raw["ticket_id"] if explicit_id else index
+            key = str(ticket_id)
+            try:
+                if key in seen:
+                    raise ValueError(f"duplicate ticket_id {ticket_id!r}")
+                seen.add(key)
+                ticket = normalize_ticket(raw)
+            except ValueError as error:
+                batch.append((key, json.dumps({"ticket_id": ticket_id, "error": str(error)})))
+                stats["errors"] += 1
+                continue
+            batch.append((key, None))
+
+            fingerprint = ticket_fingerprint(ticket, version)
+            if log.fingerprint(key) == fingerprint:
+                stats["resumed"] += 1
+            else:
+                earlier = prior.find(key, fingerprint) if prior else None
+                if earlier is not None:
+                    ready.append((key, fingerprint, json.dumps(dict(earlier, ticket_id=ticket_id), cls=CustomJSONEncoder)))
+                    stats["reused"] += 1
+                else:
+                    pending.append((key, ticket_id, fingerprint, ticket))
+
+            if len(batch) >= batch_size:
+                await flush()
+        await flush()
+    finally:
+        log.close()
+        if prior is not None:
+            prior.close()
+    return stats
@@ -1,6 +1,6 @@
 import json
+import sys
 from datetime import datetime
-from nltk.sentiment import SentimentIntensityAnalyzer
 
 class CustomJSONEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -8,21 +8,361 @@ class CustomJSONEncoder(json.JSONEncoder):
             return obj.isoformat()
         return super().default(obj)
 
-async def process_bulk_tickets(tickets, user_info, response_templates):
+async def process_bulk_tickets(tickets, user_info, response_templates, batch_size=256, output_format="json",
+                               workers=None):
     
+    import io
     from src.agents.orchestrator import Orchestrator  
+    from src.agents.output_formats import make_writer
+
+    if output_format not in ("json", "jsonl"):
+        raise ValueError(f"process_bulk_tickets returns text; output_format must be 'json' or 'jsonl', not {output_format!r}")
 
     orchestrator = Orchestrator()
+    tickets = list(tickets)
     results = []
-    for ticket in tickets:
-        result = await orchestrator.process_ticket(ticket, user_info, response_templates)
-        results.append(result)
+    if workers and workers > 1 and len(tickets) > 1:
+        # Score sentiment in worker processes, then build the responses here in input order
+        from src.agents.sharded import ShardedAnalyzer
+
+        with ShardedAnalyzer(orchestrator.analysis_agent, workers=workers, chunk_size=batch_size) as analyzer:
+            compounds = await analyzer.score_sentiment(tickets)
+        results = [orchestrator._build_response(ticket, compound) for ticket, compound in zip(tickets, compounds)]
+    elif len(tickets) <= 1:
+        for ticket in tickets:
+            result = await orchestrator.process_ticket(ticket, user_info, response_templates)
+            results.append(result)
+    else:
+        # Score sentiment batch by batch instead of one ticket at a time
+        for start in range(0, len(tickets), batch_size):
+            batch = tickets[start:start + batch_size]
+            results.extend(await orchestrator.process_batch(batch, user_info, response_templates))
     
-    return json.dumps(results, indent=4, cls=CustomJSONEncoder)
+    output = io.StringIO()
+    writer = make_writer(output, output_format)
+    for result in results:
+        writer.write(result)
+    writer.finish()
+    return output.getvalue()
+
+def iter_tickets(path, chunk_size=1 << 16):
+    """
+    Lazily yields tickets from a JSONL file or a JSON-array file (e.g. data/sample_tickets.json).
+
+    The format is detected from the first non-whitespace character. Only one chunk of
+    the file and the ticket being decoded are held in memory at a time.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        head = file.read(chunk_size)
+        if head.lstrip().startswith("["):
+            yield from _iter_json_array(file, head, chunk_size)
+            return
+        pending = ""
+        while head:
+            lines = (pending + head).split("\n")
+            pending = lines.pop()
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+            head = file.read(chunk_size)
+        if pending.strip():
+            yield json.loads(pending)
+
+def _iter_json_array(file, buffer, chunk_size):
+    decoder = json.JSONDecoder()
+    pos = buffer.index("[") + 1
+    eof = False
+    while True:
+        # Skip separators, refilling the buffer as needed
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+        if pos >= len(buffer):
+            raise ValueError("Unterminated JSON array")
+        if buffer[pos] == "]":
+            return
+        try:
+            obj, end = decoder.raw_decode(buffer, pos)
+            # A number at the very end of the buffer may continue in the next chunk
+            truncated = end == len(buffer) and not eof
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            truncated = True
+        if truncated:
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        yield obj
+        pos = end
+        if pos > chunk_size:
+            buffer, pos = buffer[pos:], 0
+
+# customer_info fields rendered into responses or stored in the ticket history
+SCALAR_CUSTOMER_FIELDS = ("customer_name", "customer_tier", "role")
+
+def normalize_ticket(ticket):
+    """
+    Converts a ticket given as a string or a dict into {"content", "customer_info"}.
+
+    Raises:
+        ValueError: If the ticket has no string content, its customer_info is not an object, or
+            one of its customer_info fields used in responses and history is not a scalar.
+    """
+    if isinstance(ticket, str):
+        return {"content": ticket, "customer_info": {}}
+    if not isinstance(ticket, dict) or not isinstance(ticket.get("content"), str):
+        raise ValueError("ticket must be a string or an object with a string 'content'")
+    customer_info = ticket.get("customer_info")
+    if customer_info is not None and not isinstance(customer_info, dict):
+        raise ValueError("ticket 'customer_info' must be an object")
+    for field in SCALAR_CUSTOMER_FIELDS:
+        value = (customer_info or {}).get(field)
+        if value is not None and not isinstance(value, (str, int, float)):
+            raise ValueError(f"ticket customer_info '{field}' must be a string or a number")
+    return {"content": ticket["content"], "customer_info": customer_info or {}}
+
+class _ResultWriter:
+    # Writes result records as they complete, optionally restoring input order
+    def __init__(self, records, preserve_order, in_flight):
+        self.records = records
+        self.preserve_order = preserve_order
+        self.in_flight = in_flight
+        self.pending = {}
+        self.next_index = 0
+        self.written = 0
+
+    def submit(self, index, record):
+        if not self.preserve_order:
+            self._write(record)
+            return
+        self.pending[index] = record
+        while self.next_index in self.pending:
+            self._write(self.pending.pop(self.next_index))
+            self.next_index += 1
+
+    def _write(self, record):
+        self.records.write(record)
+        self.written += 1
+        self.in_flight.release()
+
+async def stream_bulk_tickets(tickets, output, processor=None, max_concurrency=8,
+                              preserve_order=True, batch_size=32, max_in_flight=None, metrics=None,
+                              output_format="jsonl"):
+    """
+    Processes tickets through a bounded asyncio pipeline and writes results as they complete.
+
+    Args:
+        tickets: Iterable of tickets (strings or {"content", "customer_info"[, "ticket_id"]} dicts),
+            e.g. from iter_tickets(). It is consumed lazily.
+        output: File object receiving the results (opened in binary mode for "binary").
+        processor (TicketProcessor): Processor to use (defaults to a quiet TicketProcessor).
+        max_concurrency (int): Number of worker tasks.
+        preserve_order (bool): Write results in input order instead of completion order.
+        batch_size (int): Maximum tickets a worker analyzes in one analyze_batch call.
+        max_in_flight (int): Maximum tickets read but not yet written (backpressure bound).
+        metrics (Instrumentation): Optional metrics sink; registers queue depth and reorder
+            buffer gauges and is passed to the default TicketProcessor.
+        output_format (str): "jsonl" (compact JSON Lines), "json" (one JSON array, written at
+            the end) or "binary" (see src.agents.output_formats).
+
+    Returns:
+        dict: {"processed": ..., "errors": ...} counts.
+    """
+    import asyncio
+    from src.agents.output_formats import make_writer
+    from src.processor import TicketProcessor
+
+    records = make_writer(output, output_format)
+    processor = processor or TicketProcessor(verbose=False, metrics=metrics)
+    max_in_flight = max_in_flight or max_concurrency * batch_size * 2
+    in_flight = asyncio.Semaphore(max_in_flight)
+    queue = asyncio.Queue(maxsize=max_in_flight)
+    writer = _ResultWriter(records, preserve_order, in_flight)
+    errors = 0
+    if metrics is not None:
+        metrics.register_gauge("bulk_queue_depth", queue.qsize, "Tickets read and waiting for a worker.")
+        metrics.register_gauge("bulk_reorder_buffer", lambda: len(writer.pending),
+                               "Finished results waiting for earlier tickets to be written.")
+        metrics.register_gauge("bulk_written", lambda: writer.written, "Result lines written.")
+
+    async def read():
+        for index, ticket in enumerate(tickets):
+            await in_flight.acquire()
+            await queue.put((index, ticket))
+        for _ in range(max_concurrency):
+            await queue.put(None)
+
+    async def work():
+        nonlocal errors
+        stop = False
+        while not stop:
+            item = await queue.get()
+            if item is None:
+                return
+            batch = [item]
+            while len(batch) < batch_size and not queue.empty():
+                item = queue.get_nowait()
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            valid = []
+            for index, ticket in batch:
+                ticket_id = ticket.get("ticket_id", index) if isinstance(ticket, dict) else index
+                try:
+                    valid.append((index, ticket_id, normalize_ticket(ticket)))
+                except ValueError as error:
+                    errors += 1
+                    writer.submit(index, {"ticket_id": ticket_id, "error": str(error)})
+            if not valid:
+                continue
+
+            try:
+                results = await processor.process_tickets([dict(ticket, ticket_id=ticket_id) for _, ticket_id, ticket in valid])
+            except Exception:
+                # One failing ticket must not abort the stream: retry them one at a time (they are
+                # already in the near-duplicate index)
+                results = []
+                for _, ticket_id, ticket in valid:
+                    try:
+                        results.extend(await processor.process_tickets([dict(ticket, ticket_id=ticket_id)],
+                                                                       index_duplicates=False))
+                    except Exception as error:
+                        results.append(error)
+            for (index, ticket_id, _), result in zip(valid, results):
+                if isinstance(result, Exception):
+                    errors += 1
+                    writer.submit(index, {"ticket_id": ticket_id, "error": str(result)})
+                    continue
+                record = {
+                    "ticket_id": ticket_id,
+                    "ticket_analysis": result["ticket_analysis"],
+                    "response": result["response"],
+                }
+                if "incident" in result:
+                    record["incident"] = result["incident"]
+                writer.submit(index, record)
+            # Yield so the reader can refill the queue
+            await asyncio.sleep(0)
+
+    await asyncio.gather(read(), *(work() for _ in range(max_concurrency)))
+    records.finish()
+    return {"processed": writer.written - errors, "errors": errors}
+
+def main(argv=None):
+    import argparse
+    import asyncio
+
+    parser = argparse.ArgumentParser(description="Stream tickets from a JSONL/JSON-array file through the ticket pipeline.")
+    parser.add_argument("input", help="JSONL or JSON-array file of tickets (e.g. data/sample_tickets.json)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--format", choices=("jsonl", "json", "binary"), default="jsonl",
+                        help="output format; binary needs --output and cannot be combined with --checkpoint")
+    parser.add_argument("--max-concurrency", type=int, default=8, help="number of concurrent workers")
+    parser.add_argument("--batch-size", type=int, default=32, help="tickets per analysis batch")
+    parser.add_argument("--unordered", action="store_true", help="write results in completion order")
+    parser.add_argument("--workers", type=int, help="analyze in this many worker processes")
+    parser.add_argument("--checkpoint", help="resumable mode: append-only progress log (skips finished tickets)")
+    parser.add_argument("--previous", help="with --checkpoint: earlier output whose unchanged results are reused")
+    parser.add_argument("--near-duplicates", type=float, metavar="THRESHOLD",
+                        help="group near-identical tickets (MinHash similarity, e.g. 0.6) and reuse their sentiment score")
+    parser.add_argument("--long-content", action="store_true",
+                        help="bound the analysis of tickets over 16 KB (see src/agents/long_content.py)")
+    parser.add_argument("--history", help="also append results to this SQLite ticket history (for dashboard queries)")
+    parser.add_argument("--metrics-file", help="write Prometheus metrics to this file when done")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on localhost:PORT/metrics")
+    args = parser.parse_args(argv)
+    if args.format != "jsonl" and args.checkpoint:
+        parser.error("--checkpoint writes JSONL output")
+    if args.format == "binary" and args.output == "-":
+        parser.error("--format binary needs an --output file")
+
+    metrics = None
+    if args.metrics_file or args.metrics_port:
+        from src.agents.instrumentation import Instrumentation
+
+        metrics = Instrumentation()
+        if args.metrics_port:
+            metrics.serve(args.metrics_port)
+
+    from src.processor import TicketProcessor
+
+    near_duplicates = None
+    if args.near_duplicates:
+        from src.agents.near_duplicates import NearDuplicateIndex
+
+        near_duplicates = NearDuplicateIndex(threshold=args.near_duplicates)
+    history = None
+    if args.history:
+        from src.agents.ticket_history import TicketHistory
+
+        history = TicketHistory(args.history)
+    long_content = None
+    if args.long_content:
+        from src.agents.long_content import LongContentPolicy
+
+        long_content = LongContentPolicy()
+    processor = TicketProcessor(verbose=False, metrics=metrics, near_duplicates=near_duplicates, workers=args.workers,
+                                history=history, long_content=long_content)
+
+    if args.output == "-":
+        output = sys.stdout
+    elif args.format == "binary":
+        output = open(args.output, "wb")
+    else:
+        output = open(args.output, "w", encoding="utf-8")
+    try:
+        if args.checkpoint:
+            from src.agents.bulk_jobs import run_bulk_job
+
+            stats = asyncio.run(run_bulk_job(
+                iter_tickets(args.input), args.checkpoint, output,
+                processor=processor,
+                batch_size=args.batch_size,
+                previous=args.previous,
+            ))
+        else:
+            stats = asyncio.run(stream_bulk_tickets(
+                iter_tickets(args.input), output,
+                processor=processor,
+                max_concurrency=args.max_concurrency,
+                preserve_order=not args.unordered,
+                batch_size=args.batch_size,
+                metrics=metrics,
+                output_format=args.format,
+            ))
+    finally:
+        processor.close()
+        if history is not None:
+            history.close()
+        if output is not sys.stdout:
+            output.close()
+    if args.metrics_file:
+        metrics.dump(args.metrics_file)
+    print(f"Processed {stats['processed']} tickets ({stats['errors']} errors)", file=sys.stderr)
+    if near_duplicates is not None:
+        incidents = near_duplicates.incidents()
+        print(f"{near_duplicates.duplicates} near-duplicates in {len(incidents)} clusters of 2+ tickets "
+              f"(largest: {incidents[0].size if incidents else 0})", file=sys.stderr)
+    if args.checkpoint:
+        print(f"Skipped {stats['resumed']} finished in the checkpoint, reused {stats['reused']} from --previous",
+              file=sys.stderr)
 
 if __name__ == "__main__":
     import asyncio
 
+    if len(sys.argv) > 1:
+        main()
+        sys.exit(0)
+
     tickets = [
         "I can't log in to my account!",
         "Payment issue with my subscription."
@@ -0,0 +1,222 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Upper bounds (seconds) of the stage latency histogram buckets
+DEFAULT_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class StageTimer:
+    """
+    Measures consecutive stages: each lap records the time since the previous lap.
+    """
+
+    __slots__ = ("_instrumentation", "_last")
+
+    def __init__(self, instrumentation: "Instrumentation"):
+        self._instrumentation = instrumentation
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str, count: int = 1):
+        """
+        Records the time since the previous lap (or since creation) under a stage name.
+
+        Args:
+            stage (str): The stage that just finished.
+            count (int): Number of tickets the stage covered (the time is split evenly).
+        """
+        now = time.perf_counter()
+        self._instrumentation.observe(stage, now - self._last, count)
+        self._last = now
+
+
+class Instrumentation:
+    """
+    Opt-in metrics for the ticket pipeline: per-stage latency histograms, counters
+    and gauges, exported in the Prometheus text format.
+
+    Components take an optional Instrumentation (metrics=None by default); when it is
+    not given they skip every measurement, so the disabled cost is a None check per stage.
+    Hooks receive every stage observation, e.g. to forward spans to a tracing system.
+
+    Example:
+        metrics = Instrumentation()
+        processor = TicketProcessor(metrics=metrics)
+        ...
+        metrics.dump("metrics.prom")      # or metrics.serve(port=9108)
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, prefix: str = "ticket"):
+        """
+        Args:
+            buckets (Sequence[float]): Histogram bucket upper bounds, in seconds.
+            prefix (str): Prefix of every exported metric name.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, List] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Tuple[Callable[[], float], str]] = {}
+        self._help: Dict[str, str] = {}
+        self._hooks: List[Callable[[str, float, int], None]] = []
+
+    def add_hook(self, hook: Callable[[str, float, int], None]):
+        """
+        Registers a callable invoked as hook(stage, seconds, count) for every stage observation.
+        """
+        self._hooks.append(hook)
+
+    def timer(self) -> StageTimer:
+        """
+        Returns a StageTimer that starts now.
+        """
+        return StageTimer(self)
+
+    def observe(self, stage: str, seconds: float, count: int = 1):
+        """
+        Records the latency of a stage.
+
+        Args:
+            stage (str): Stage name (e.g. "sentiment").
+            seconds (float): Total time spent.
+            count (int): Number of tickets covered; each is recorded with seconds / count.
+        """
+        if count <= 0:
+            return
+        each = seconds / count
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            histogram[0][bisect_left(self.buckets, each)] += count
+            histogram[1] += seconds
+            histogram[2] += count
+        for hook in self._hooks:
+            hook(stage, seconds, count)
+
+    def count(self, name: str, labels: Labels = (), amount: float = 1, help: str = ""):
+        """
+        Increments a counter.
+
+        Args:
+            name (str): Counter name (without the prefix).
+            labels (Labels): Label pairs, e.g. (("category", "access"),).
+            amount (float): Increment.
+            help (str): Description used in the export.
+        """
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0) + amount
+            if help:
+                self._help.setdefault(name, help)
+
+    def register_gauge(self, name: str, read: Callable[[], float], help: str = ""):
+        """
+        Registers a gauge whose value is read when metrics are exported (e.g. a queue size).
+        """
+        self._gauges[name] = (read, help)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        Returns the current metric values as plain data.
+        """
+        with self._lock:
+            stages = {stage: {"count": h[2], "sum": h[1], "buckets": list(h[0])} for stage, h in self._histograms.items()}
+            counters = {name: dict(series) for name, series in self._counters.items()}
+        gauges = {name: read() for name, (read, _) in self._gauges.items()}
+        return {"stages": stages, "counters": counters, "gauges": gauges}
+
+    def render_prometheus(self) -> str:
+        """
+        Renders every metric in the Prometheus text exposition format.
+        """
+        prefix = self.prefix
+        lines = []
+        snapshot = self.snapshot()
+
+        name = f"{prefix}_stage_seconds"
+        lines.append(f"# HELP {name} Latency of ticket processing stages.")
+        lines.append(f"# TYPE {name} histogram")
+        for stage, data in sorted(snapshot["stages"].items()):
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + (float("inf"),), data["buckets"]):
+                cumulative += bucket
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_bucket{{stage="{_escape(stage)}",le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{stage="{_escape(stage)}"}} {data["sum"]!r}')
+            lines.append(f'{name}_count{{stage="{_escape(stage)}"}} {data["count"]}')
+
+        for counter, series in sorted(snapshot["counters"].items()):
+            name = f"{prefix}_{counter}"
+            if counter in self._help:
+                lines.append(f"# HELP {name} {self._help[counter]}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in sorted(series.items()):
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for gauge, value in sorted(snapshot["gauges"].items()):
+            name = f"{prefix}_{gauge}"
+            help_text = self._gauges[gauge][1]
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str):
+        """
+        Writes the Prometheus text export to a file (e.g. for node_exporter's textfile collector).
+        """
+        with open(path, "w") as file:
+            file.write(self.render_prometheus())
+
+    def serve(self, port: int = 9108, host: str = "127.0.0.1"):
+        """
+        Serves GET /metrics from a background thread and returns the HTTP server.
+
+        Call shutdown() on the returned server to stop it.
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        instrumentation = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = instrumentation.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _format_value(value: Optional[float]) -> str:
+    if value is None:
+        return "NaN"
+    if isinstance(value, bool):
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+
+@dataclass
+class KeywordRules:
+    """
+    Declarative keyword rule table used by the TicketAnalysisAgent.
+
+    Every rule is a plain substring match against the lowercased ticket text,
+    exactly like the original ``word in ticket_content.lower()`` checks.
+
+    Attributes:
+        category_rules (List[Tuple[str, List[str]]]): Category value and its keywords,
+            in precedence order (the first category with a hit wins).
+        urgency_words (List[str]): Words reported as urgency indicators, in report order.
+        business_impact_rules (List[Tuple[str, List[str]]]): Impact level and its keywords,
+            in precedence order.
+        follow_up_words (List[str]): Words that mark a ticket as requiring follow-up.
+    """
+    category_rules: List[Tuple[str, List[str]]] = field(default_factory=lambda: [
+        ("access", ["access", "login", "403", "admin"]),
+        ("billing", ["billing", "invoice", "payment"]),
+        ("feature", ["feature request", "enhancement"]),
+    ])
+    urgency_words: List[str] = field(default_factory=lambda: [
+        "urgent", "asap", "immediately", "critical", "payroll", "important"
+    ])
+    business_impact_rules: List[Tuple[str, List[str]]] = field(default_factory=lambda: [
+        ("High", ["payroll"]),
+    ])
+    follow_up_words: List[str] = field(default_factory=lambda: [
+        "confirm", "verify", "clarify", "follow-up", "double-check"
+    ])
+
+    def extend(self, category_keywords: Optional[Dict[str, List[str]]] = None,
+               urgency_words: Optional[List[str]] = None,
+               business_impact_keywords: Optional[Dict[str, List[str]]] = None,
+               follow_up_words: Optional[List[str]] = None) -> "KeywordRules":
+        """
+        Returns a new rule table with extra (e.g. tenant-specific) keywords appended.
+
+        Existing precedence is preserved; unknown categories or impact levels are
+        appended after the built-in ones.
+
+        Args:
+            category_keywords (Optional[Dict[str, List[str]]]): Extra keywords per category value.
+            urgency_words (Optional[List[str]]): Extra urgency indicators.
+            business_impact_keywords (Optional[Dict[str, List[str]]]): Extra keywords per impact level.
+            follow_up_words (Optional[List[str]]): Extra follow-up words.
+
+        Returns:
+            KeywordRules: The extended rule table.
+        """
+        return KeywordRules(
+            category_rules=_merge_rules(self.category_rules, category_keywords or {}),
+            urgency_words=self.urgency_words + list(urgency_words or []),
+            business_impact_rules=_merge_rules(self.business_impact_rules, business_impact_keywords or {}),
+            follow_up_words=self.follow_up_words + list(follow_up_words or []),
+        )
+
+    def fingerprint(self) -> str:
+        """
+        Returns a stable hash of the rule table, used to invalidate cached analyses.
+        """
+        table = [self.category_rules, self.urgency_words, self.business_impact_rules, self.follow_up_words]
+        return hashlib.sha256(json.dumps(table, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def all_keywords(self) -> Set[str]:
+        """
+        Returns every lowercased, non-empty keyword referenced by the table.
+        """
+        words = set(self.urgency_words) | set(self.follow_up_words)
+        for _, keywords in self.category_rules + self.business_impact_rules:
+            words.update(keywords)
+        return {word.lower() for word in words if word}
+
+
+def _merge_rules(rules: List[Tuple[str, List[str]]], extra: Dict[str, List[str]]) -> List[Tuple[str, List[str]]]:
+    merged = [(name, list(keywords) + list(extra.get(name, []))) for name, keywords in rules]
+    known = {name for name, _ in rules}
+    merged.extend((name, list(keywords)) for name, keywords in extra.items() if name not in known)
+    return merged
+
+
+class KeywordMatcher:
+    """
+    Finds every keyword of a KeywordRules table in a single pass over the text.
+
+    The keywords are compiled once into a trie-shaped regular expression wrapped in
+    a lookahead, so each position of the text is tested against all keywords at once
+    and the cost per position does not grow with the number of keywords. At each
+    position the longest keyword wins; the shorter keywords it contains are recovered
+    from a precomputed containment table, which keeps the hit set exact even for
+    overlapping keywords.
+    """
+
+    def __init__(self, rules: KeywordRules):
+        """
+        Compiles the matcher for the given rule table.
+
+        Args:
+            rules (KeywordRules): The keyword rule table to compile.
+        """
+        self.rules = rules
+        keywords = sorted(rules.all_keywords())
+        self._contained: Dict[str, FrozenSet[str]] = {
+            keyword: frozenset(other for other in keywords if other in keyword) for keyword in keywords
+        }
+        self._pattern = re.compile("(?=(%s))" % _trie_pattern(keywords)) if keywords else None
+        # Chunked scans overlap by max_keyword_length - 1 characters so no keyword is split
+        self.max_keyword_length = max(map(len, keywords), default=1)
+
+    def scan(self, text: str) -> Set[str]:
+        """
+        Returns the set of keywords contained in the (already lowercased) text.
+
+        Args:
+            text (str): The lowercased ticket text.
+
+        Returns:
+            Set[str]: Every keyword that occurs as a substring of the text.
+        """
+        if self._pattern is None:
+            return set()
+        hits: Set[str] = set()
+        contained = self._contained
+        for longest in set(self._pattern.findall(text)):
+            hits |= contained[longest]
+        return hits
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Builds a regex alternation shaped like a trie, preferring the longest keyword.
+    """
+    trie: dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _node_pattern(trie)
+
+
+def _node_pattern(node: dict) -> str:
+    branches = [re.escape(char) + _node_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:%s)" % "|".join(branches)
+    if "" in node:
+        # A keyword ends here, but longer keywords are tried first (greedy).
+        return "(?:%s)?" % body
+    return body
@@ -0,0 +1,196 @@
+"""
+Bounded-cost analysis of very long tickets (pasted logs, long e-mail threads).
+
+Tickets longer than LongContentPolicy.max_chars are analyzed through a LongContent
+view instead of the full text:
+
+- only the first max_analyzed_chars are looked at;
+- the quoted thread ("On ... wrote:", "-----Original Message-----", Outlook
+  "From:/Sent:" headers) and the signature are cut off, and ">" quoted lines are
+  skipped;
+- keywords are scanned one chunk at a time, so only one lowercased chunk exists at once;
+- VADER scores a capped sample: the opening of the ticket plus evenly spaced lines;
+- key points are limited in number and length.
+
+What was cut is recorded in TicketAnalysis.truncation.
+"""
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Set
+
+# Start of a quoted reply thread; everything from here on is dropped
+_REPLY_HEADER = re.compile(
+    r"^[ \t]*-{2,}[ \t]*(?:original|forwarded) message[ \t]*-{2,}"
+    r"|^[ \t]*on\b[^\n]{0,200}\bwrote:[ \t]*$"
+    r"|^[ \t]*from:[^\n]*\n(?:[^\n]*\n){0,3}?[ \t]*(?:sent|date):",
+    re.IGNORECASE | re.MULTILINE,
+)
+# Signature delimiters ("-- " per RFC 3676, underscores, mobile footers)
+_SIGNATURE = re.compile(r"^(?:--[ \t]?|_{3,}[ \t]*)$|^sent from my [^\n]*$", re.IGNORECASE | re.MULTILINE)
+_QUOTED_LINE = re.compile(r"^[ \t]*>[^\n]*", re.MULTILINE)
+_LINE = re.compile(r"[^\n]*")
+_NON_SPACE = re.compile(r"\S")
+
+
+@dataclass(frozen=True)
+class LongContentPolicy:
+    """
+    Limits applied to tickets longer than max_chars.
+
+    Attributes:
+        max_chars (int): Tickets up to this length are analyzed in full.
+        chunk_chars (int): Characters lowercased and scanned for keywords at a time.
+        max_analyzed_chars (int): Characters from the start of the ticket analyzed at most.
+        sentiment_sample_chars (int): Maximum length of the text scored by VADER.
+        sentiment_sample_lines (int): Evenly spaced lines added to the sample after the opening.
+        max_key_points (int): Maximum number of key points.
+        max_key_point_chars (int): Key points longer than this are shortened.
+    """
+    max_chars: int = 16384
+    chunk_chars: int = 65536
+    max_analyzed_chars: int = 1 << 20
+    sentiment_sample_chars: int = 2000
+    sentiment_sample_lines: int = 8
+    max_key_points: int = 20
+    max_key_point_chars: int = 500
+
+
+class LongContent:
+    """
+    Read-only view of the body of a long ticket: its first max_analyzed_chars, with the
+    reply thread and signature cut off.
+
+    The text is never copied as a whole: the body is addressed by an end offset and
+    every step works on bounded slices of it.
+    """
+
+    __slots__ = ("text", "policy", "end", "thread_removed", "quoted_chars", "sample_chars", "key_points_limited",
+                 "key_points_shortened")
+
+    def __init__(self, text: str, policy: LongContentPolicy):
+        self.text = text
+        self.policy = policy
+        self.end = min(len(text), policy.max_analyzed_chars)
+        self.thread_removed = False
+        for pattern in (_REPLY_HEADER, _SIGNATURE):
+            match = pattern.search(text, 0, self.end)
+            # Only cut if something is left above the match
+            if match is not None and _NON_SPACE.search(text, 0, match.start()):
+                self.end = match.start()
+                self.thread_removed = True
+        self.quoted_chars = 0
+        self.sample_chars = 0
+        self.key_points_limited = False
+        self.key_points_shortened = 0
+
+    def chunks(self):
+        """
+        Yields (start, stop) offsets of the body in slices of about chunk_chars, split
+        after a newline when possible.
+
+        A slice that has to be cut mid-line overlaps the next one by `overlap` characters
+        (see scan), so no keyword is lost at the boundary.
+        """
+        text, end, size = self.text, self.end, self.policy.chunk_chars
+        start = 0
+        while start < end:
+            stop = min(start + size, end)
+            if stop < end:
+                newline = text.rfind("\n", start + size // 2, stop)
+                if newline != -1:
+                    stop = newline + 1
+            yield start, stop
+            start = stop
+
+    def scan(self, matcher) -> Set[str]:
+        """
+        Returns the keyword hits of the body, lowercasing and scanning one chunk at a time.
+
+        Quoted lines are removed from each chunk before scanning.
+        """
+        text, overlap = self.text, matcher.max_keyword_length - 1
+        hits: Set[str] = set()
+        for start, stop in self.chunks():
+            if text[stop - 1:stop] != "\n" and stop < self.end:
+                stop += overlap
+            chunk = text[start:stop]
+            unquoted = _QUOTED_LINE.sub("", chunk)
+            self.quoted_chars += len(chunk) - len(unquoted)
+            hits |= matcher.scan(unquoted.lower())
+        return hits
+
+    def sentiment_sample(self) -> str:
+        """
+        Returns at most sentiment_sample_chars of the body: its opening, then evenly spaced lines.
+        """
+        text, end, policy = self.text, self.end, self.policy
+        budget = policy.sentiment_sample_chars
+        head_end = min(end, budget // 2)
+        if head_end < end:
+            space = text.rfind(" ", 0, head_end)
+            head_end = space if space > budget // 4 else head_end
+        parts = [_QUOTED_LINE.sub("", text[:head_end])]
+        remaining = budget - len(parts[0])
+        lines = policy.sentiment_sample_lines
+        if head_end < end and lines and remaining > 0:
+            per_line = remaining // lines - 1  # room for the joining newline
+            step = (end - head_end) / lines
+            for number in range(lines):
+                position = head_end + int(step * (number + 0.5))
+                line_start = text.rfind("\n", head_end, position) + 1 or head_end
+                line_end = text.find("\n", position, end)
+                line = text[line_start:min(line_end if line_end != -1 else end, line_start + per_line)]
+                if line.strip() and not line.lstrip().startswith(">"):
+                    parts.append(line)
+        sample = "\n".join(parts)
+        self.sample_chars = len(sample)
+        return sample
+
+    def key_points(self) -> List[str]:
+        """
+        Returns the first max_key_points non-empty, unquoted lines of the body,
+        each shortened to max_key_point_chars.
+        """
+        text, end, policy = self.text, self.end, self.policy
+        points: List[str] = []
+        self.key_points_shortened = 0
+        for match in _LINE.finditer(text, 0, end):
+            start, stop = match.span()
+            if stop - start > policy.max_key_point_chars:
+                stop = start + policy.max_key_point_chars
+                point = text[start:stop].strip()
+                shortened = True
+            else:
+                point = text[start:stop].strip()
+                shortened = False
+            if not point or point.startswith(">"):
+                continue
+            if len(points) == policy.max_key_points:
+                self.key_points_limited = True
+                break
+            points.append(point + "…" if shortened else point)
+            self.key_points_shortened += shortened
+        return points
+
+    def truncation(self) -> dict:
+        """
+        Returns the record of what was left out, stored as TicketAnalysis.truncation.
+        """
+        return {
+            "original_chars": len(self.text),
+            "analyzed_chars": self.end - self.quoted_chars,
+            "thread_removed": self.thread_removed,
+            "quoted_chars_removed": self.quoted_chars,
+            "sentiment_sample_chars": self.sample_chars,
+            "key_points_limited": self.key_points_limited,
+            "key_points_shortened": self.key_points_shortened,
+        }
+
+
+def long_view(text: str, policy: Optional[LongContentPolicy]) -> Optional[LongContent]:
+    """
+    Returns a LongContent view if the policy applies to the text, else None.
+    """
+    if policy is None or len(text) <= policy.max_chars:
+        return None
+    return LongContent(text, policy)
@@ -0,0 +1,320 @@
+"""
+Near-duplicate ticket detection with MinHash signatures and an LSH band index.
+
+During an incident many tickets differ only in names, timestamps or error codes.
+NearDuplicateIndex groups such tickets into clusters of recent tickets: the first
+ticket of a cluster is analyzed, later ones reuse its sentiment score (their
+keyword rules still run), and cluster sizes are an incident signal. Clusters not seen for `window` seconds are evicted.
+"""
+import re
+import time
+import zlib
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+from src.agents.long_content import long_view
+from src.agents.ticket_analysis import TicketAnalysis
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the pure-Python path gives the same signatures
+    np = None
+
+# Hash family (a * x + b) mod a Mersenne prime; a * x stays below 2**63
+_PRIME = (1 << 31) - 1
+
+# Volatile tokens are masked before shingling, so tickets differing only in them match
+_VOLATILE = [
+    (re.compile(r"\S+@\S+"), " email "),
+    (re.compile(r"\b(?=[0-9a-f]*\d)[0-9a-f]{8,}\b"), " hexid "),
+    (re.compile(r"\d+"), "0"),
+]
+_TOKEN = re.compile(r"[a-z0-9]+")
+# Only the opening of very long tickets is shingled, so signatures cost the same for any length
+MAX_SHINGLE_CHARS = 16384
+
+
+def shingle_hashes(ticket_content: str, shingle_size: int = 2) -> List[int]:
+    """
+    Returns the distinct 32-bit hashes of the word shingles of a ticket.
+
+    The text is lowercased, e-mail addresses, long hex ids and digit runs are masked,
+    and every run of shingle_size consecutive words is hashed. Only the first
+    MAX_SHINGLE_CHARS characters are used.
+    """
+    text = ticket_content[:MAX_SHINGLE_CHARS].lower()
+    for pattern, placeholder in _VOLATILE:
+        text = pattern.sub(placeholder, text)
+    words = _TOKEN.findall(text)
+    if len(words) <= shingle_size:
+        return [zlib.crc32(" ".join(words).encode("utf-8"))]
+    return list({zlib.crc32(" ".join(words[i:i + shingle_size]).encode("utf-8"))
+                 for i in range(len(words) - shingle_size + 1)})
+
+
+def lsh_bands(threshold: float, num_perm: int) -> int:
+    """
+    Picks the number of LSH bands for a similarity threshold.
+
+    With b bands of r rows, pairs of similarity s become candidates with probability
+    1 - (1 - s**r)**b, which rises steeply around (1/b)**(1/r). The largest such point
+    not above the threshold is chosen, so true matches are rarely missed and
+    candidates are then verified against the threshold.
+    """
+    best_bands, best_knee = num_perm, 0.0
+    for bands in range(1, num_perm + 1):
+        if num_perm % bands:
+            continue
+        knee = (1 / bands) ** (bands / num_perm)
+        if best_knee < knee <= threshold:
+            best_bands, best_knee = bands, knee
+    return best_bands
+
+
+class TicketCluster:
+    """
+    A group of near-duplicate tickets seen within the index window.
+
+    Attributes:
+        cluster_id (int): Identifier, increasing in creation order.
+        size (int): Number of tickets assigned to the cluster.
+        first_seen (float): Clock time of the first ticket.
+        last_seen (float): Clock time of the latest ticket.
+        representative (str): Content of the first ticket.
+        analysis (Optional[TicketAnalysis]): Analysis of the first ticket, shared by the cluster.
+    """
+
+    __slots__ = ("cluster_id", "signature", "band_keys", "size", "first_seen", "last_seen",
+                 "representative", "analysis")
+
+    def __init__(self, cluster_id: int, signature, band_keys: List[bytes], now: float, representative: str):
+        self.cluster_id = cluster_id
+        self.signature = signature
+        self.band_keys = band_keys
+        self.size = 1
+        self.first_seen = now
+        self.last_seen = now
+        self.representative = representative
+        self.analysis: Optional[TicketAnalysis] = None
+
+    def __repr__(self) -> str:
+        return f"TicketCluster(cluster_id={self.cluster_id}, size={self.size}, representative={self.representative[:40]!r})"
+
+
+class NearDuplicateIndex:
+    """
+    In-memory MinHash + LSH index of recent ticket clusters.
+
+    Each ticket gets a MinHash signature of its word shingles. The signature is split
+    into bands; clusters sharing a band are candidates, and the candidate with the
+    highest estimated Jaccard similarity at or above the threshold is the match.
+
+    Example:
+        index = NearDuplicateIndex(threshold=0.6)
+        cluster, duplicate = index.add("Export job 4411 fails with error 500 for Alice")
+        cluster, duplicate = index.add("Export job 4502 fails with error 503 for Bob")  # duplicate is True
+    """
+
+    def __init__(self, threshold: float = 0.6, num_perm: int = 64, shingle_size: int = 2,
+                 window: float = 900.0, max_clusters: int = 100000, seed: int = 1, clock=time.monotonic):
+        """
+        Initializes the index.
+
+        Args:
+            threshold (float): Minimum estimated Jaccard similarity of shingles to join a cluster.
+            num_perm (int): MinHash signature length.
+            shingle_size (int): Words per shingle.
+            window (float): Seconds after its latest ticket that a cluster is evicted.
+            max_clusters (int): Maximum number of clusters kept (least recently seen evicted first).
+            seed (int): Seed of the hash family.
+            clock: Time source (time.monotonic by default).
+
+        Raises:
+            ValueError: If the threshold is not in (0, 1].
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.window = window
+        self.max_clusters = max_clusters
+        self.clock = clock
+        self.bands = lsh_bands(threshold, num_perm)
+        self.rows = num_perm // self.bands
+        self.tickets = 0
+        self.duplicates = 0
+        self.evictions = 0
+        self._next_id = 0
+        self._clusters: "OrderedDict[int, TicketCluster]" = OrderedDict()
+        self._buckets: Dict[bytes, Set[int]] = {}
+
+        # Deterministic hash parameters from a small LCG, so signatures are stable across runs
+        state = seed or 1
+        params = []
+        for _ in range(2 * num_perm):
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            params.append(state >> 33)
+        self._a = [param % (_PRIME - 1) + 1 for param in params[:num_perm]]
+        self._b = [param % _PRIME for param in params[num_perm:]]
+        if np is not None:
+            self._a_np = np.array(self._a, dtype=np.uint64)[:, None]
+            self._b_np = np.array(self._b, dtype=np.uint64)[:, None]
+
+    def signature(self, ticket_content: str):
+        """
+        Returns the MinHash signature of a ticket (a uint64 numpy array, or an array("Q")).
+        """
+        hashes = shingle_hashes(ticket_content, self.shingle_size)
+        if np is not None:
+            values = np.array(hashes, dtype=np.uint64) % _PRIME
+            return ((self._a_np * values + self._b_np) % _PRIME).min(axis=1)
+        values = [value % _PRIME for value in hashes]
+        return array("Q", (min((a * value + b) % _PRIME for value in values) for a, b in zip(self._a, self._b)))
+
+    def similarity(self, first, second) -> float:
+        """
+        Estimates the Jaccard similarity of two signatures.
+        """
+        if np is not None:
+            return int(np.count_nonzero(first == second)) / self.num_perm
+        return sum(x == y for x, y in zip(first, second)) / self.num_perm
+
+    def _band_keys(self, signature) -> List[bytes]:
+        rows = self.rows
+        return [band.to_bytes(2, "little") + signature[band * rows:(band + 1) * rows].tobytes()
+                for band in range(self.bands)]
+
+    def match(self, ticket_content: str, signature=None) -> Optional[TicketCluster]:
+        """
+        Returns the most similar live cluster at or above the threshold, without adding the ticket.
+        """
+        self._evict(self.clock())
+        signature = self.signature(ticket_content) if signature is None else signature
+        return self._best(signature, self._band_keys(signature))
+
+    def _best(self, signature, band_keys: List[bytes]) -> Optional[TicketCluster]:
+        candidates = set()
+        for key in band_keys:
+            candidates.update(self._buckets.get(key, ()))
+        best, best_similarity = None, self.threshold
+        for cluster_id in sorted(candidates):
+            cluster = self._clusters[cluster_id]
+            similarity = self.similarity(signature, cluster.signature)
+            if similarity > best_similarity or (best is None and similarity == best_similarity):
+                best, best_similarity = cluster, similarity
+        return best
+
+    def add(self, ticket_content: str) -> Tuple[TicketCluster, bool]:
+        """
+        Assigns a ticket to its cluster, creating a new cluster if nothing matches.
+
+        Returns:
+            Tuple[TicketCluster, bool]: The cluster, and whether the ticket joined an existing one.
+        """
+        now = self.clock()
+        self._evict(now)
+        self.tickets += 1
+        signature = self.signature(ticket_content)
+        band_keys = self._band_keys(signature)
+        cluster = self._best(signature, band_keys)
+        if cluster is not None:
+            cluster.size += 1
+            cluster.last_seen = now
+            self._clusters.move_to_end(cluster.cluster_id)
+            self.duplicates += 1
+            return cluster, True
+
+        cluster = TicketCluster(self._next_id, signature, band_keys, now, ticket_content)
+        self._next_id += 1
+        self._clusters[cluster.cluster_id] = cluster
+        for key in band_keys:
+            self._buckets.setdefault(key, set()).add(cluster.cluster_id)
+        self._evict(now)
+        return cluster, False
+
+    def _evict(self, now: float):
+        clusters = self._clusters
+        while clusters:
+            oldest = next(iter(clusters.values()))
+            if oldest.last_seen >= now - self.window and len(clusters) <= self.max_clusters:
+                break
+            clusters.popitem(last=False)
+            self.evictions += 1
+            for key in oldest.band_keys:
+                bucket = self._buckets[key]
+                bucket.discard(oldest.cluster_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def incidents(self, min_size: int = 2) -> List[TicketCluster]:
+        """
+        Returns the live clusters with at least min_size tickets, largest first.
+        """
+        self._evict(self.clock())
+        return sorted((cluster for cluster in self._clusters.values() if cluster.size >= min_size),
+                      key=lambda cluster: (-cluster.size, cluster.cluster_id))
+
+    def __len__(self) -> int:
+        return len(self._clusters)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the index counters and the size of the largest live cluster.
+        """
+        return {
+            "tickets": self.tickets,
+            "duplicates": self.duplicates,
+            "clusters": len(self._clusters),
+            "evictions": self.evictions,
+            "largest_cluster": max((cluster.size for cluster in self._clusters.values()), default=0),
+        }
+
+
+async def analyze_with_clusters(agent, index: NearDuplicateIndex,
+                                tickets: List[dict]) -> Tuple[List[TicketAnalysis], List[dict]]:
+    """
+    Analyzes tickets, reusing the analysis of each ticket's near-duplicate cluster.
+
+    Only the first ticket of a cluster is analyzed (in one analyze_batch call). The
+    others reuse its sentiment score, which is the expensive step; their keywords are
+    still scanned, so category, urgency, business impact, priority and key points are
+    their own.
+
+    Args:
+        agent: A TicketAnalysisAgent (or a wrapper forwarding its attributes).
+        index (NearDuplicateIndex): The index tickets are added to.
+        tickets (List[dict]): Tickets with "content" and "customer_info".
+
+    Returns:
+        Tuple[List[TicketAnalysis], List[dict]]: One analysis and one
+        {"cluster_id", "cluster_size", "duplicate"} incident record per ticket.
+    """
+    assignments, sizes = [], []
+    for ticket in tickets:
+        assignments.append(index.add(ticket["content"]))
+        sizes.append(assignments[-1][0].size)
+    first: Dict[int, int] = {}
+    for position, (cluster, _) in enumerate(assignments):
+        if cluster.analysis is None and cluster.cluster_id not in first:
+            first[cluster.cluster_id] = position
+    if first:
+        analyses = await agent.analyze_batch(
+            [(tickets[position]["content"], tickets[position]["customer_info"]) for position in first.values()]
+        )
+        for position, analysis in zip(first.values(), analyses):
+            assignments[position][0].analysis = analysis
+
+    fresh = set(first.values())
+    results, incidents = [], []
+    for position, (ticket, (cluster, duplicate), size) in enumerate(zip(tickets, assignments, sizes)):
+        if position in fresh:
+            results.append(cluster.analysis)
+        else:
+            # Only the sentiment score is reused: the keyword rules run on the ticket itself,
+            # so a duplicate that adds an urgency phrase is still escalated
+            view = long_view(ticket["content"], getattr(agent, "long_content", None))
+            hits = agent._scan(ticket["content"], view)
+            results.append(agent._build_analysis(ticket["content"], hits, cluster.analysis.sentiment, None, view))
+        incidents.append({"cluster_id": cluster.cluster_id, "cluster_size": size, "duplicate": duplicate})
+    return results, incidents
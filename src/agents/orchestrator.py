@@ -1,14 +1,28 @@
 import json
 from datetime import datetime  # 
-from nltk.sentiment import SentimentIntensityAnalyzer
+from src.agents.ticket_analysis import TicketAnalysisAgent, score_sentiment_batch
+
+# The orchestrated output only reads the sentiment score, so nothing else is analyzed
+ORCHESTRATOR_FIELDS = ("sentiment",)
 
 class Orchestrator:
-    def __init__(self):
-        self.sia = SentimentIntensityAnalyzer()
+    def __init__(self, sentiment_backend="nltk"):
+        self.analysis_agent = TicketAnalysisAgent(sentiment_backend=sentiment_backend)
+        self.sia = self.analysis_agent.sentiment_analyzer
 
     async def process_ticket(self, ticket, user_info, response_templates):
-        sentiment = self.sia.polarity_scores(ticket)
-        priority_level = "High" if sentiment["compound"] < -0.2 else "Low"
+        analysis = await self.analysis_agent.analyze_ticket(ticket, user_info, fields=ORCHESTRATOR_FIELDS)
+        return self._build_response(ticket, analysis.sentiment)
+
+    async def process_batch(self, tickets, user_info, response_templates):
+        # Same output as process_ticket for each ticket, with sentiment scored as a batch
+        tickets = list(tickets)
+        compounds = score_sentiment_batch(self.sia, tickets)
+        return [self._build_response(ticket, compound) for ticket, compound in zip(tickets, compounds)]
+
+    @staticmethod
+    def _build_response(ticket, compound):
+        priority_level = "High" if compound < -0.2 else "Low"
         
         response = {
             "ticket": ticket,
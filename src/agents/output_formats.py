@@ -0,0 +1,392 @@
+"""
+Output formats for processed ticket records.
+
+A record is {"ticket_id", "ticket_analysis", "response"} (plus any extra keys), or
+{"ticket_id", "error"} for a rejected ticket. Three formats are available:
+
+- "json":   a pretty-printed JSON array (the layout of data/processed_tickets.json).
+- "jsonl":  compact JSON Lines; values are converted by a per-type table instead of a
+            JSONEncoder.default() hook.
+- "binary": length-prefixed rows with a fixed numeric header (category, priority, flags,
+            sentiment, confidence) followed by schema-ordered strings, and a footer of
+            category / priority / sentiment columns and row offsets. BinaryRecordReader
+            memory-maps the file and scans those columns without decoding any row.
+"""
+import json
+import mmap
+import os
+import struct
+from array import array
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from src.agents.ticket_analysis import Priority, TicketAnalysis, TicketCategory
+
+CATEGORIES: List[TicketCategory] = list(TicketCategory)
+_CATEGORY_CODES = {category: code for code, category in enumerate(CATEGORIES)}
+ERROR_CODE = 255  # category code of an error row
+
+# Per-type converters to plain JSON values, looked up once per value
+_CONVERTERS = {
+    datetime: datetime.isoformat,
+    TicketAnalysis: TicketAnalysis.to_dict,
+    TicketCategory: lambda category: category.value,
+    Priority: int,
+}
+
+
+def _fallback(value):
+    converter = _CONVERTERS.get(type(value))
+    if converter is None:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return converter(value)
+
+
+_compact = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=_fallback).encode
+_pretty = json.JSONEncoder(indent=4, default=_fallback).encode
+
+
+def to_plain(record: dict) -> dict:
+    """
+    Converts the top-level values of a record (TicketAnalysis, datetime, enums) into JSON types.
+    """
+    converters = _CONVERTERS
+    return {key: converters[type(value)](value) if type(value) in converters else value
+            for key, value in record.items()}
+
+
+class JsonlRecordWriter:
+    """
+    Writes records as compact JSON Lines to a text file.
+    """
+
+    def __init__(self, output):
+        self.output = output
+
+    def write(self, record: dict):
+        self.output.write(_compact(to_plain(record)))
+        self.output.write("\n")
+
+    def finish(self):
+        self.output.flush()
+
+
+class JsonRecordWriter:
+    """
+    Writes records as one pretty-printed JSON array (buffered until finish).
+    """
+
+    def __init__(self, output):
+        self.output = output
+        self.records: List[dict] = []
+
+    def write(self, record: dict):
+        self.records.append(to_plain(record))
+
+    def finish(self):
+        self.output.write(_pretty(self.records))
+        self.output.flush()
+
+
+# --- Binary row format ---
+
+MAGIC = b"TKTROWS2"
+FOOTER_MAGIC = b"TKTEND01"
+_ROW_LENGTH = struct.Struct("<I")
+# category, priority, flags, sentiment, confidence_score, then the number of key_points,
+# required_expertise, urgency_indicators and suggested_actions
+_ROW_HEADER = struct.Struct("<BBBddIIII")
+# Row header per file version: version 1 files stored the list counts as u16
+_ROW_HEADERS = {b"TKTROWS1": struct.Struct("<BBBddHHHH"), MAGIC: _ROW_HEADER}
+_FOOTER = struct.Struct("<QQQQQ8s")  # rows, category / priority / sentiment / offsets column positions, magic
+_FIXED_STRINGS = 5  # ticket_id, business_impact, suggested_response_type, response_text, extra
+
+_FOLLOW_UP = 1
+_REQUIRES_APPROVAL = 2
+_HAS_RESPONSE = 4
+
+_RECORD_KEYS = ("ticket_id", "ticket_analysis", "response")
+_RESPONSE_KEYS = ("response_text", "confidence_score", "requires_approval", "suggested_actions")
+
+
+class BinaryRecordWriter:
+    """
+    Writes records in the binary row format to a binary file.
+
+    Row layout: u32 length, the fixed header (u8 category, u8 priority, u8 flags,
+    f64 sentiment, f64 confidence_score, u32 list lengths), a u32 array of string lengths
+    in code points, then all strings as one UTF-8 blob in schema order: ticket_id (JSON),
+    business_impact, suggested_response_type, response_text, a JSON object of any other
+    keys, key_points, required_expertise, urgency_indicators and suggested_actions.
+    Decoding a row is then one unpack and one decode. finish() appends the column footer.
+    """
+
+    def __init__(self, output):
+        self.output = output
+        self.position = len(MAGIC)
+        self.categories = bytearray()
+        self.priorities = bytearray()
+        self.sentiments = array("d")
+        self.offsets = array("Q")
+        output.write(MAGIC)
+
+    def write(self, record: dict):
+        extra = {key: value for key, value in record.items() if key not in _RECORD_KEYS}
+        analysis = record.get("ticket_analysis")
+        response = record.get("response") or {}
+        if analysis is None:
+            category, priority, flags, sentiment = ERROR_CODE, 0, 0, 0.0
+            fields = ("", "", [], [], [])
+        else:
+            if isinstance(analysis, dict):
+                analysis = TicketAnalysis.from_dict(analysis)
+            category = _CATEGORY_CODES[analysis.category]
+            priority = int(analysis.priority)
+            sentiment = analysis.sentiment
+            flags = _FOLLOW_UP if analysis.follow_up_required else 0
+            fields = (analysis.business_impact, analysis.suggested_response_type, analysis.key_points,
+                      analysis.required_expertise, analysis.urgency_indicators)
+            if analysis.truncation is not None:
+                extra["ticket_analysis"] = {"truncation": analysis.truncation}
+        if "response" in record:
+            flags |= _HAS_RESPONSE
+            if response.get("requires_approval"):
+                flags |= _REQUIRES_APPROVAL
+            extra_response = {key: value for key, value in response.items() if key not in _RESPONSE_KEYS}
+            if extra_response:
+                extra["response"] = extra_response
+
+        actions = response.get("suggested_actions", [])
+        strings = [_compact(record.get("ticket_id")), fields[0], fields[1], response.get("response_text", ""),
+                   _compact(extra) if extra else "", *fields[2], *fields[3], *fields[4], *actions]
+        body = b"".join((
+            _ROW_HEADER.pack(category, priority, flags, sentiment, response.get("confidence_score", 0.0),
+                             len(fields[2]), len(fields[3]), len(fields[4]), len(actions)),
+            array("I", map(len, strings)).tobytes(),
+            "".join(strings).encode("utf-8"),
+        ))
+
+        self.output.write(_ROW_LENGTH.pack(len(body)))
+        self.output.write(body)
+        self.offsets.append(self.position)
+        self.categories.append(category)
+        self.priorities.append(priority)
+        self.sentiments.append(sentiment)
+        self.position += _ROW_LENGTH.size + len(body)
+
+    def finish(self):
+        category_at = self.position
+        priority_at = category_at + len(self.categories)
+        sentiment_at = priority_at + len(self.priorities)
+        offsets_at = sentiment_at + self.sentiments.itemsize * len(self.sentiments)
+        self.output.write(bytes(self.categories))
+        self.output.write(bytes(self.priorities))
+        self.output.write(self.sentiments.tobytes())
+        self.output.write(self.offsets.tobytes())
+        self.output.write(_FOOTER.pack(len(self.offsets), category_at, priority_at, sentiment_at, offsets_at,
+                                       FOOTER_MAGIC))
+        self.output.flush()
+
+
+class BinaryRecordReader:
+    """
+    Memory-mapped reader of the binary row format.
+
+    Columns (category, priority, sentiment) are read straight from the footer; rows are
+    only decoded when accessed. Files without a footer (an interrupted write) are indexed
+    by walking the row length prefixes instead, and an empty file (a write interrupted
+    before anything was flushed) has no rows. Version 1 files are still readable.
+
+    Example:
+        with BinaryRecordReader("results.bin") as reader:
+            reader.count_by("priority")
+            urgent = [reader[i] for i in reader.where(priority=Priority.URGENT)]
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        if os.fstat(self._file.fileno()).st_size == 0:
+            # mmap cannot map an empty file
+            self._map, self._header = b"", _ROW_HEADER
+            self._offsets, self._categories, self._priorities, self._sentiments = array("Q"), b"", b"", array("d")
+            return
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._header = _ROW_HEADERS.get(self._map[:len(MAGIC)])
+        if self._header is None:
+            self.close()
+            raise ValueError(f"{path} is not a binary ticket record file")
+        footer_at = len(self._map) - _FOOTER.size
+        footer = _FOOTER.unpack_from(self._map, footer_at) if footer_at >= len(MAGIC) else None
+        if footer is not None and footer[5] == FOOTER_MAGIC:
+            rows, category_at, priority_at, sentiment_at, offsets_at, _ = footer
+            view = memoryview(self._map)
+            self._categories = view[category_at:category_at + rows]
+            self._priorities = view[priority_at:priority_at + rows]
+            self._sentiments = view[sentiment_at:offsets_at].cast("d")
+            self._offsets = view[offsets_at:offsets_at + 8 * rows].cast("Q")
+        else:
+            self._scan_rows()
+
+    def _scan_rows(self):
+        offsets = array("Q")
+        categories, priorities, sentiments = bytearray(), bytearray(), array("d")
+        pos, end = len(MAGIC), len(self._map)
+        while pos + _ROW_LENGTH.size + self._header.size <= end:
+            (length,) = _ROW_LENGTH.unpack_from(self._map, pos)
+            if pos + _ROW_LENGTH.size + length > end:
+                break  # torn last row
+            category, priority, _, sentiment = self._header.unpack_from(self._map, pos + _ROW_LENGTH.size)[:4]
+            offsets.append(pos)
+            categories.append(category)
+            priorities.append(priority)
+            sentiments.append(sentiment)
+            pos += _ROW_LENGTH.size + length
+        self._offsets, self._categories = offsets, memoryview(categories)
+        self._priorities, self._sentiments = memoryview(priorities), sentiments
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for name in ("_categories", "_priorities", "_sentiments", "_offsets"):
+            value = getattr(self, name, None)
+            if isinstance(value, memoryview):
+                value.release()
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def column(self, name: str) -> list:
+        """
+        Returns a whole column without decoding rows: "category" (TicketCategory, None for
+        error rows), "priority" (Priority, None for error rows) or "sentiment" (float).
+        """
+        if name == "category":
+            return [CATEGORIES[code] if code != ERROR_CODE else None for code in self._categories]
+        if name == "priority":
+            return [Priority(code) if code else None for code in self._priorities]
+        if name == "sentiment":
+            return list(self._sentiments)
+        raise ValueError(f"Unknown column {name!r}; expected 'category', 'priority' or 'sentiment'")
+
+    def count_by(self, name: str) -> Dict:
+        """
+        Counts rows per category or per priority (error rows are not counted).
+        """
+        if name == "category":
+            data, labels = bytes(self._categories), dict(enumerate(CATEGORIES))
+        elif name == "priority":
+            data, labels = bytes(self._priorities), {int(priority): priority for priority in Priority}
+        else:
+            raise ValueError(f"Cannot count by {name!r}; expected 'category' or 'priority'")
+        counts = {label: data.count(bytes([code])) for code, label in labels.items()}
+        return {label: count for label, count in counts.items() if count}
+
+    def where(self, category: Optional[TicketCategory] = None, priority: Optional[Priority] = None) -> List[int]:
+        """
+        Returns the indices of rows with the given category and/or priority.
+        """
+        category_code = _CATEGORY_CODES[category] if category is not None else None
+        categories, priorities = self._categories, self._priorities
+        return [index for index in range(len(self))
+                if (category_code is None or categories[index] == category_code)
+                and (priority is None or priorities[index] == int(priority))]
+
+    def __getitem__(self, index: int) -> dict:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("BinaryRecordReader index out of range")
+        return self._decode(self._offsets[index])
+
+    def __iter__(self) -> Iterator[dict]:
+        return (self._decode(offset) for offset in self._offsets)
+
+    def _decode(self, offset: int) -> dict:
+        buffer = self._map
+        start = offset + _ROW_LENGTH.size
+        (length,) = _ROW_LENGTH.unpack_from(buffer, offset)
+        category, priority, flags, sentiment, confidence, *counts = self._header.unpack_from(buffer, start)
+        start += self._header.size
+        lengths_end = start + 4 * (_FIXED_STRINGS + sum(counts))
+        lengths = array("I", buffer[start:lengths_end])
+        text = buffer[lengths_end:offset + _ROW_LENGTH.size + length].decode("utf-8")
+        strings, position = [], 0
+        for size in lengths:
+            strings.append(text[position:position + size])
+            position += size
+
+        ticket_id_text, business_impact, response_type, response_text, extra_text = strings[:_FIXED_STRINGS]
+        ticket_id = json.loads(ticket_id_text)
+        extra = json.loads(extra_text) if extra_text else {}
+        lists, position = [], _FIXED_STRINGS
+        for count in counts:
+            lists.append(strings[position:position + count])
+            position += count
+        key_points, expertise, urgency, actions = lists
+
+        record = {"ticket_id": ticket_id}
+        if category != ERROR_CODE:
+            record["ticket_analysis"] = TicketAnalysis(
+                category=CATEGORIES[category],
+                priority=Priority(priority),
+                key_points=key_points,
+                required_expertise=expertise,
+                sentiment=sentiment,
+                urgency_indicators=urgency,
+                business_impact=business_impact,
+                suggested_response_type=response_type,
+                follow_up_required=bool(flags & _FOLLOW_UP),
+                truncation=extra.pop("ticket_analysis", {}).get("truncation"),
+            )
+        if flags & _HAS_RESPONSE:
+            response = {
+                "response_text": response_text,
+                "confidence_score": confidence,
+                "requires_approval": bool(flags & _REQUIRES_APPROVAL),
+                "suggested_actions": actions,
+            }
+            response.update(extra.pop("response", {}))
+            record["response"] = response
+        record.update(extra)
+        return record
+
+
+OUTPUT_FORMATS = {"json": JsonRecordWriter, "jsonl": JsonlRecordWriter, "binary": BinaryRecordWriter}
+
+
+def make_writer(output, output_format: str = "jsonl"):
+    """
+    Returns a record writer for an open file ("binary" needs a file opened in binary mode).
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    try:
+        return OUTPUT_FORMATS[output_format](output)
+    except KeyError:
+        raise ValueError(f"Unknown output format {output_format!r}; expected one of {sorted(OUTPUT_FORMATS)}") from None
+
+
+def read_records(path: str) -> Iterator[dict]:
+    """
+    Reads records from a file in any output format, with analyses as TicketAnalysis objects.
+    """
+    with open(path, "rb") as file:
+        is_binary = file.read(len(MAGIC)) in _ROW_HEADERS
+    if is_binary:
+        with BinaryRecordReader(path) as reader:
+            yield from reader
+        return
+
+    from src.agents.bulk_orchestration import iter_tickets
+
+    for record in iter_tickets(path):
+        if isinstance(record.get("ticket_analysis"), dict):
+            record = dict(record, ticket_analysis=TicketAnalysis.from_dict(record["ticket_analysis"]))
+        yield record
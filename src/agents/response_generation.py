@@ -1,4 +1,11 @@
-from typing import Dict, Any
+from typing import Dict, Any, Union
+from src.agents.template_registry import DEFAULT_TEMPLATE, TemplateRegistry, compile_template
+
+def eta_for_priority(priority: int) -> str:
+    """
+    Returns the resolution ETA promised to the customer for a priority level.
+    """
+    return "1 hour" if priority == 4 else "24 hours"
 
 class ResponseAgent:
     """
@@ -6,13 +13,15 @@ class ResponseAgent:
     It formats responses using predefined templates and determines if escalation is required.
     """
 
-    async def generate_response(self, ticket_analysis, response_templates: Dict[str, str], context: Dict[str, Any]):
+    async def generate_response(self, ticket_analysis, response_templates: Union[Dict[str, str], TemplateRegistry],
+                                context: Dict[str, Any]):
         """
         Generates a response based on the ticket analysis, using predefined templates.
 
         Args:
             ticket_analysis: The result of the ticket analysis, containing category, priority, etc.
-            response_templates (Dict[str, str]): A dictionary containing predefined response templates.
+            response_templates (Union[Dict[str, str], TemplateRegistry]): A dictionary containing predefined
+                response templates, or a TemplateRegistry holding them pre-compiled.
             context (Dict[str, Any]): Additional customer information (e.g., customer name).
 
         Returns:
@@ -30,14 +39,18 @@ class ResponseAgent:
             result = await response_agent.generate_response(ticket_analysis, response_templates, context)
         """
         category = ticket_analysis.category.value
-        template = response_templates.get(category, "Hello {name}, we are working on your request.")
-
-        response_text = template.format(
-            name=context.get("customer_name", "Customer"),
-            feature="dashboard" if category == "access" else "service",
-            priority_level=ticket_analysis.priority.name,
-            eta="1 hour" if ticket_analysis.priority == 4 else "24 hours",
-        )
+        values = {
+            "name": context.get("customer_name", "Customer"),
+            "feature": "dashboard" if category == "access" else "service",
+            "priority_level": ticket_analysis.priority.name,
+            "eta": eta_for_priority(ticket_analysis.priority),
+        }
+
+        if isinstance(response_templates, TemplateRegistry):
+            response_text = response_templates.render(category, values)
+        else:
+            template = response_templates.get(category, DEFAULT_TEMPLATE)
+            response_text = compile_template(template).render(values)
 
         return {
             "response_text": response_text,
@@ -0,0 +1,260 @@
+import asyncio
+import re
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+from src.agents.response_generation import eta_for_priority
+from src.agents.ticket_analysis import Priority
+
+# Share of workers each priority may occupy by default, so a flood of low-priority
+# tickets always leaves capacity free for urgent ones
+DEFAULT_LIMIT_SHARES = {Priority.URGENT: 1.0, Priority.HIGH: 1.0, Priority.MEDIUM: 0.75, Priority.LOW: 0.5}
+
+_ETA_UNITS = {"minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_eta(eta: str) -> float:
+    """
+    Converts an ETA such as "1 hour" or "24 hours" into seconds.
+
+    Raises:
+        ValueError: If the ETA is not "<number> minute(s)/hour(s)/day(s)".
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*(minute|hour|day)s?\s*", eta)
+    if match is None:
+        raise ValueError(f"Unrecognized ETA: {eta!r}")
+    return float(match.group(1)) * _ETA_UNITS[match.group(2)]
+
+
+def sla_seconds_for(priority: Priority) -> float:
+    """
+    Returns the SLA of a priority level: the ETA the ResponseAgent promises for it.
+    """
+    return parse_eta(eta_for_priority(priority))
+
+
+class _Job:
+    __slots__ = ("ticket", "priority", "submitted", "deadline", "future")
+
+    def __init__(self, ticket, priority, submitted, deadline, future):
+        self.ticket = ticket
+        self.priority = priority
+        self.submitted = submitted
+        self.deadline = deadline
+        self.future = future
+
+
+class PriorityScheduler:
+    """
+    Priority-aware scheduler in front of a TicketProcessor.
+
+    Each submitted ticket is pre-classified with TicketAnalysisAgent.estimate_priority
+    (a keyword scan, no sentiment scoring) and queued by priority. Workers always take
+    the ticket with the highest effective priority, where:
+
+    - a waiting ticket gains one priority level per aging_interval seconds, so LOW
+      tickets are never starved;
+    - a ticket whose SLA deadline is within sla_margin of its SLA ranks above everything
+      (deadlines come from the ETA the ResponseAgent promises: 1 hour for URGENT, 24 hours otherwise);
+    - each priority may occupy at most limits[priority] workers at a time.
+
+    Queue-wait time is tracked per priority (see stats()).
+
+    Example:
+        async with PriorityScheduler(TicketProcessor(verbose=False)) as scheduler:
+            results = await scheduler.run(tickets)
+    """
+
+    def __init__(self, processor=None, max_concurrency: int = 8, limits: Optional[Dict[Priority, int]] = None,
+                 aging_interval: float = 60.0, sla_margin: float = 0.1,
+                 sla_seconds: Optional[Dict[Priority, float]] = None,
+                 clock: Callable[[], float] = time.monotonic, history: int = 10000):
+        """
+        Initializes the scheduler (call start() or use it as an async context manager).
+
+        Args:
+            processor (TicketProcessor): Processor running the tickets (defaults to a quiet TicketProcessor).
+            max_concurrency (int): Number of worker tasks.
+            limits (Optional[Dict[Priority, int]]): Maximum workers per priority
+                (defaults to DEFAULT_LIMIT_SHARES of max_concurrency).
+            aging_interval (float): Seconds of waiting that raise a ticket by one priority level.
+            sla_margin (float): Fraction of the SLA left at which a ticket jumps ahead of all others.
+            sla_seconds (Optional[Dict[Priority, float]]): SLA per priority (defaults to the promised ETAs).
+            clock (Callable[[], float]): Monotonic clock, in seconds.
+            history (int): Number of recent queue waits kept per priority for the percentiles.
+        """
+        if processor is None:
+            from src.processor import TicketProcessor
+
+            processor = TicketProcessor(verbose=False)
+        self.processor = processor
+        self.max_concurrency = max_concurrency
+        self.limits = {priority: max(1, round(max_concurrency * share)) for priority, share in DEFAULT_LIMIT_SHARES.items()}
+        self.limits.update(limits or {})
+        self.aging_interval = aging_interval
+        self.sla_margin = sla_margin
+        self.sla_seconds = {priority: sla_seconds_for(priority) for priority in Priority}
+        self.sla_seconds.update(sla_seconds or {})
+        self.clock = clock
+
+        self._queues: Dict[Priority, deque] = {priority: deque() for priority in Priority}
+        self._running = {priority: 0 for priority in Priority}
+        self._counters = {priority: {"submitted": 0, "completed": 0, "failed": 0, "sla_missed": 0}
+                          for priority in Priority}
+        self._waits = {priority: deque(maxlen=history) for priority in Priority}
+        self._condition = asyncio.Condition()
+        self._workers: List[asyncio.Task] = []
+        self._closing = False
+
+        metrics = getattr(processor, "metrics", None)
+        self._metrics = metrics
+        if metrics is not None:
+            for priority in Priority:
+                metrics.register_gauge(f"scheduler_queued_{priority.name.lower()}",
+                                       lambda queue=self._queues[priority]: len(queue),
+                                       f"{priority.name} tickets waiting in the scheduler.")
+
+    async def start(self):
+        """
+        Starts the worker tasks.
+        """
+        if not self._workers:
+            self._closing = False
+            self._workers = [asyncio.create_task(self._work()) for _ in range(self.max_concurrency)]
+
+    async def close(self):
+        """
+        Waits for every queued ticket to finish, then stops the workers.
+        """
+        async with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        await asyncio.gather(*self._workers)
+        self._workers = []
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def estimate_priority(self, ticket: dict) -> Priority:
+        """
+        Pre-classifies a ticket (keyword scan only).
+        """
+        return self.processor.analysis_agent.estimate_priority(ticket["content"])
+
+    async def submit(self, ticket: dict) -> asyncio.Future:
+        """
+        Queues a ticket for processing.
+
+        Args:
+            ticket (dict): A ticket in the format accepted by TicketProcessor.process_ticket.
+
+        Returns:
+            asyncio.Future: Resolves to the process_ticket result, with an added "scheduling"
+                entry (estimated_priority, queue_wait_seconds, sla_seconds, sla_met).
+        """
+        priority = self.estimate_priority(ticket)
+        now = self.clock()
+        job = _Job(ticket, priority, now, now + self.sla_seconds[priority],
+                   asyncio.get_running_loop().create_future())
+        async with self._condition:
+            self._queues[priority].append(job)
+            self._counters[priority]["submitted"] += 1
+            self._condition.notify()
+        return job.future
+
+    async def run(self, tickets) -> List[dict]:
+        """
+        Submits all tickets and returns their results in input order.
+        """
+        futures = [await self.submit(ticket) for ticket in tickets]
+        return list(await asyncio.gather(*futures))
+
+    def _pick(self) -> Optional[_Job]:
+        # Choose the queue head with the highest effective priority among priorities
+        # that still have a free worker slot (queues are FIFO, so heads waited longest)
+        now = self.clock()
+        best, best_rank = None, None
+        for priority, queue in self._queues.items():
+            if not queue or self._running[priority] >= self.limits[priority]:
+                continue
+            job = queue[0]
+            rank = int(priority) + int((now - job.submitted) / self.aging_interval)
+            if job.deadline - now <= self.sla_margin * self.sla_seconds[priority]:
+                rank = int(Priority.URGENT) + 1 + rank
+            key = (rank, -job.deadline)
+            if best_rank is None or key > best_rank:
+                best, best_rank = job, key
+        if best is not None:
+            self._queues[best.priority].popleft()
+            self._running[best.priority] += 1
+        return best
+
+    async def _work(self):
+        while True:
+            async with self._condition:
+                job = self._pick()
+                while job is None:
+                    if self._closing and not any(self._queues.values()):
+                        return
+                    await self._condition.wait()
+                    job = self._pick()
+
+            started = self.clock()
+            wait = started - job.submitted
+            self._waits[job.priority].append(wait)
+            if self._metrics is not None:
+                self._metrics.observe(f"queue_wait_{job.priority.name.lower()}", wait)
+            counters = self._counters[job.priority]
+            try:
+                result = await self.processor.process_ticket(job.ticket)
+            except Exception as error:
+                counters["failed"] += 1
+                if not job.future.done():
+                    job.future.set_exception(error)
+            else:
+                finished = self.clock()
+                sla_met = finished <= job.deadline
+                counters["completed"] += 1
+                if not sla_met:
+                    counters["sla_missed"] += 1
+                result["scheduling"] = {
+                    "estimated_priority": job.priority.name,
+                    "queue_wait_seconds": wait,
+                    "sla_seconds": self.sla_seconds[job.priority],
+                    "sla_met": sla_met,
+                }
+                if not job.future.done():
+                    job.future.set_result(result)
+            finally:
+                async with self._condition:
+                    self._running[job.priority] -= 1
+                    self._condition.notify_all()
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        Returns per-priority counters and queue-wait percentiles (in milliseconds).
+        """
+        report = {}
+        for priority in Priority:
+            waits = sorted(self._waits[priority])
+            report[priority.name] = dict(
+                self._counters[priority],
+                queued=len(self._queues[priority]),
+                running=self._running[priority],
+                wait_p50_ms=_percentile(waits, 0.50) * 1000,
+                wait_p95_ms=_percentile(waits, 0.95) * 1000,
+                wait_p99_ms=_percentile(waits, 0.99) * 1000,
+            )
+        return report
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    # Nearest-rank percentile of already sorted values
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
@@ -0,0 +1,172 @@
+"""
+Multi-process sharded analysis for CPU-bound workloads.
+
+analyze_ticket is CPU-bound, so asyncio alone keeps one core busy. ShardedAnalyzer
+splits batches into chunks and analyzes them in a process pool, merging the results
+back in input order. It has the TicketAnalysisAgent interface, so TicketProcessor
+(workers=N) and process_bulk_tickets(workers=N) use it transparently.
+
+Where fork is available the parent loads the VADER lexicon and compiles the keyword
+rules once, then forks the workers, which inherit both copy-on-write (objects are
+frozen with gc.freeze() around the fork, so the workers' garbage collector does not
+touch, and thereby copy, the inherited pages).
+Elsewhere each worker builds its own agent from the pickled rules; spawned workers
+re-import the __main__ module, so scripts must guard their entry point with
+`if __name__ == "__main__":`.
+"""
+import asyncio
+import gc
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from src.agents.ticket_analysis import TicketAnalysis, TicketAnalysisAgent, score_sentiment_batch
+
+# Agents prepared in the parent before forking, by token; a worker picks its own in _init_worker
+_PREPARED: Dict[int, TicketAnalysisAgent] = {}
+_tokens = itertools.count()
+_worker_agent: Optional[TicketAnalysisAgent] = None
+
+
+def _init_worker(token: int, rules, sentiment_backend: str, long_content):
+    global _worker_agent
+    _worker_agent = _PREPARED.get(token)
+    if _worker_agent is None:
+        # Spawned (not forked) worker: nothing was inherited
+        _worker_agent = TicketAnalysisAgent(rules=rules, sentiment_backend=sentiment_backend,
+                                            long_content=long_content)
+
+
+def _analyze_chunk(contents: List[str]) -> List[TicketAnalysis]:
+    return _worker_agent._analyze_chunk(contents)
+
+
+def _score_chunk(texts: List[str]) -> List[float]:
+    return score_sentiment_batch(_worker_agent.sentiment_analyzer, texts)
+
+
+def _chunks(items: Sequence, size: int) -> List[Sequence]:
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+class ShardedAnalyzer:
+    """
+    Runs a TicketAnalysisAgent's batch analysis in a pool of worker processes.
+
+    Batches are split into chunks of chunk_size tickets, one task per chunk, so IPC
+    happens once per chunk rather than once per ticket. Results are returned in input
+    order. Other attributes (rules, matcher, estimate_priority, analyze_lazy, ...) come
+    from the local agent.
+
+    Example:
+        with ShardedAnalyzer(workers=4) as analyzer:
+            analyses = await analyzer.analyze_batch((ticket, None) for ticket in texts)
+    """
+
+    def __init__(self, agent: Optional[TicketAnalysisAgent] = None, workers: Optional[int] = None,
+                 chunk_size: int = 128, start_method: Optional[str] = None):
+        """
+        Initializes the analyzer and starts the worker pool.
+
+        Args:
+            agent (Optional[TicketAnalysisAgent]): The agent whose rules, sentiment backend and
+                long-content policy the workers use (a default agent if None).
+            workers (Optional[int]): Number of worker processes (defaults to os.cpu_count()).
+            chunk_size (int): Tickets sent to a worker per task.
+            start_method (Optional[str]): "fork" (default where available) or "spawn".
+        """
+        self.agent = agent or TicketAnalysisAgent()
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        if start_method is None:
+            start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        self.start_method = start_method
+
+        self._token = next(_tokens)
+        if start_method == "fork":
+            # Load the lexicon now so every worker inherits it instead of parsing it again
+            self.agent.sentiment_analyzer.polarity_scores("warm up")
+            _PREPARED[self._token] = self.agent
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(self._token, self.agent.rules, self.agent.sentiment_analyzer.backend, self.agent.long_content),
+        )
+        if start_method == "fork":
+            # Fork every worker now, with the inherited objects frozen
+            gc.freeze()
+            try:
+                for future in [self._pool.submit(_score_chunk, []) for _ in range(self.workers)]:
+                    future.result()
+            finally:
+                gc.unfreeze()
+
+    async def _map(self, function, items: Sequence, chunk_size: Optional[int] = None) -> list:
+        loop = asyncio.get_running_loop()
+        size = chunk_size or self.chunk_size
+        if len(items) < size * self.workers:
+            # Small batches are still spread over every worker
+            size = max(1, -(-len(items) // self.workers))
+        chunks = _chunks(items, size)
+        results = await asyncio.gather(*(loop.run_in_executor(self._pool, function, chunk) for chunk in chunks))
+        return [item for chunk in results for item in chunk]
+
+    async def analyze_batch(self, tickets: Iterable[Tuple[str, Optional[dict]]],
+                            batch_size: Optional[int] = None) -> List[TicketAnalysis]:
+        """
+        Analyzes tickets across the worker pool; same results as TicketAnalysisAgent.analyze_batch.
+
+        Args:
+            tickets (Iterable[Tuple[str, Optional[dict]]]): (ticket_content, customer_info) pairs.
+            batch_size (Optional[int]): Tickets per worker task (defaults to chunk_size).
+
+        Returns:
+            List[TicketAnalysis]: The analysis of each ticket, in input order.
+        """
+        contents = [content for content, _customer_info in tickets]
+        if not contents:
+            return []
+        return await self._map(_analyze_chunk, contents, batch_size)
+
+    async def analyze_ticket(self, ticket_content: str, customer_info: Optional[dict] = None,
+                             fields: Optional[Iterable[str]] = None) -> TicketAnalysis:
+        """
+        Analyzes one ticket in a worker process, keeping the event loop free.
+
+        With a field mask the local agent's lazy analysis is returned (see analyze_lazy).
+        """
+        if fields is not None:
+            return self.agent.analyze_lazy(ticket_content, fields)
+        loop = asyncio.get_running_loop()
+        (analysis,) = await loop.run_in_executor(self._pool, _analyze_chunk, [ticket_content])
+        return analysis
+
+    async def score_sentiment(self, texts: Sequence[str], chunk_size: Optional[int] = None) -> List[float]:
+        """
+        Scores VADER compound sentiment across the worker pool, in input order.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        return await self._map(_score_chunk, texts, chunk_size)
+
+    def close(self):
+        """
+        Shuts the worker pool down.
+        """
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        _PREPARED.pop(self._token, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getattr__(self, name):
+        # Everything else (rules, matcher, long_content, lazy analysis, ...) comes from the local agent
+        if name == "agent":
+            raise AttributeError(name)
+        return getattr(self.agent, name)
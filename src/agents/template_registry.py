@@ -0,0 +1,230 @@
+import hashlib
+import json
+import os
+import time
+from functools import lru_cache
+from string import Formatter
+from typing import Dict, Optional, Tuple
+
+# Placeholders the ResponseAgent fills in
+TEMPLATE_FIELDS = frozenset({"name", "feature", "priority_level", "eta"})
+
+DEFAULT_TEMPLATE = "Hello {name}, we are working on your request."
+
+
+class TemplateError(ValueError):
+    """
+    Raised when a response template cannot be parsed or uses unknown placeholders.
+    """
+
+
+class CompiledTemplate:
+    """
+    A response template pre-parsed into literal text and placeholder parts.
+
+    Rendering joins the parts without re-parsing the format string and produces
+    exactly what ``template.format(**values)`` would.
+    """
+
+    def __init__(self, template: str, allowed_fields=TEMPLATE_FIELDS):
+        """
+        Parses and validates a template.
+
+        Args:
+            template (str): A ``str.format``-style template.
+            allowed_fields (frozenset): Placeholder names the template may use.
+
+        Raises:
+            TemplateError: If the template is malformed or uses an unknown placeholder.
+        """
+        self.template = template
+        self._parts = []
+        try:
+            parsed = list(Formatter().parse(template))
+        except ValueError as error:
+            raise TemplateError(f"Malformed template {template!r}: {error}") from None
+        for literal, field_name, format_spec, conversion in parsed:
+            if literal:
+                self._parts.append((literal, None, None, None))
+            if field_name is None:
+                continue
+            if field_name not in allowed_fields:
+                raise TemplateError(f"Unknown placeholder {{{field_name}}} in template {template!r}")
+            if format_spec and ("{" in format_spec):
+                raise TemplateError(f"Nested placeholders are not supported in template {template!r}")
+            self._parts.append((None, field_name, format_spec, conversion))
+        # Validate format specs and conversions once with placeholder values
+        try:
+            self.render({field: "" for field in allowed_fields})
+        except (ValueError, TypeError) as error:
+            raise TemplateError(f"Malformed template {template!r}: {error}") from None
+
+    def render(self, values: Dict[str, str]) -> str:
+        """
+        Renders the template with the given placeholder values.
+        """
+        out = []
+        for literal, field_name, format_spec, conversion in self._parts:
+            if field_name is None:
+                out.append(literal)
+                continue
+            value = values[field_name]
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "a":
+                value = ascii(value)
+            elif conversion == "s":
+                value = str(value)
+            elif conversion is not None:
+                raise ValueError(f"Unknown conversion specifier {conversion}")
+            out.append(format(value, format_spec) if format_spec else str(value))
+        return "".join(out)
+
+
+@lru_cache(maxsize=1024)
+def compile_template(template: str) -> CompiledTemplate:
+    """
+    Returns the compiled form of a template string, parsing each distinct string once.
+    """
+    return CompiledTemplate(template)
+
+
+class TemplateRegistry:
+    """
+    Loads response templates from a JSON file once and keeps them compiled.
+
+    The file is re-read only when its modification time or size changes, and
+    re-parsed only when its content hash changes; if the file is missing or unreadable
+    at a check, the last loaded templates stay in use. Rendered responses are memoized
+    per (category, placeholder values), since most responses are identical; responses
+    with non-string values (e.g. a list as the customer name) are rendered without the memo.
+    """
+
+    def __init__(self, path: str = "data/response_templates.json", check_interval: float = 1.0,
+                 max_cached_responses: int = 10000):
+        """
+        Initializes the registry and loads the templates.
+
+        Args:
+            path (str): Path to the JSON file mapping category to template.
+            check_interval (float): Minimum seconds between checks of the file for changes.
+            max_cached_responses (int): Maximum number of memoized rendered responses.
+
+        Raises:
+            TemplateError: If the file contains a malformed template.
+        """
+        self.path = path
+        self.check_interval = check_interval
+        self.max_cached_responses = max_cached_responses
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self._templates: Dict[str, CompiledTemplate] = {}
+        self._default = CompiledTemplate(DEFAULT_TEMPLATE)
+        self._responses: Dict[Tuple, str] = {}
+        self._stat: Optional[Tuple[int, int]] = None
+        self._digest: Optional[str] = None
+        self._next_check = 0.0
+        self.reload()
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Reloads the templates if the file changed since the last load.
+
+        Args:
+            force (bool): Re-read the file even if its mtime and size are unchanged.
+
+        Returns:
+            bool: True if the templates were re-parsed.
+
+        Raises:
+            TemplateError: If the file contains a malformed template; the previous
+                templates stay active in that case.
+        """
+        stat = os.stat(self.path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if not force and signature == self._stat:
+            return False
+        with open(self.path, "rb") as file:
+            raw = file.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        self._stat = signature
+        if digest == self._digest:
+            return False
+
+        try:
+            data = json.loads(raw)
+        except ValueError as error:
+            raise TemplateError(f"Cannot parse {self.path}: {error}") from None
+        if not isinstance(data, dict):
+            raise TemplateError(f"{self.path} must contain a JSON object of category -> template")
+        templates = {}
+        for category, template in data.items():
+            if not isinstance(template, str):
+                raise TemplateError(f"Template for {category!r} in {self.path} is not a string")
+            templates[category] = compile_template(template)
+
+        self._templates = templates
+        self._responses = {}
+        self._digest = digest
+        self.reloads += 1
+        return True
+
+    @property
+    def version(self) -> Optional[str]:
+        """
+        SHA-256 digest of the currently loaded templates file.
+        """
+        return self._digest
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.check_interval
+            try:
+                self.reload()
+            except OSError:
+                # Deleted or being replaced: keep serving the last loaded templates
+                pass
+
+    def get(self, category: str) -> CompiledTemplate:
+        """
+        Returns the compiled template for a category (or the generic default).
+        """
+        self._maybe_reload()
+        return self._templates.get(category, self._default)
+
+    def render(self, category: str, values: Dict[str, str]) -> str:
+        """
+        Renders the category's template, reusing a memoized result when possible.
+
+        Args:
+            category (str): The ticket category value (e.g. "access").
+            values (Dict[str, str]): Placeholder values (name, feature, priority_level, eta).
+
+        Returns:
+            str: The rendered response text.
+        """
+        template = self.get(category)
+        if not all(type(value) is str for value in values.values()):
+            # Customer-supplied values may be unhashable; render them as str.format would
+            self.misses += 1
+            return template.render(values)
+        key = (category,) + tuple(values.items())
+        text = self._responses.get(key)
+        if text is not None:
+            self.hits += 1
+            return text
+        self.misses += 1
+        text = template.render(values)
+        if len(self._responses) >= self.max_cached_responses:
+            self._responses.clear()
+        self._responses[key] = text
+        return text
+
+    def as_dict(self) -> Dict[str, str]:
+        """
+        Returns the raw templates, in the format accepted by ResponseAgent.generate_response.
+        """
+        self._maybe_reload()
+        return {category: compiled.template for category, compiled in self._templates.items()}
@@ -1,11 +1,13 @@
 from enum import Enum, IntEnum
 from dataclasses import dataclass
-from typing import List, Optional
-from nltk.sentiment import SentimentIntensityAnalyzer
-import nltk
+from typing import Iterable, List, Optional, Sequence, Tuple
+import asyncio
+from src.agents.keyword_rules import KeywordRules, KeywordMatcher
+from src.agents.long_content import LongContentPolicy, long_view
+from src.agents.vader_lexicon import LazySentimentAnalyzer
 
-# Download the sentiment analysis tool (only needed once)
-nltk.download('vader_lexicon')
+# Bump whenever the analysis logic below changes, so cached analyses are invalidated
+ANALYSIS_VERSION = 2
 
 class TicketCategory(Enum):
     """
@@ -25,11 +27,14 @@ class Priority(IntEnum):
     HIGH = 3
     URGENT = 4
 
-@dataclass
+@dataclass(slots=True)
 class TicketAnalysis:
     """
     Data structure representing the analysis result of a support ticket.
 
+    Instances use __slots__ (no per-instance __dict__). For large result sets see
+    TicketAnalysisColumns, which stores many analyses column by column.
+
     Attributes:
         category (TicketCategory): The identified category of the ticket.
         priority (Priority): The assigned priority level.
@@ -40,6 +45,8 @@ class TicketAnalysis:
         business_impact (str): Level of business impact (Low, Medium, High).
         suggested_response_type (str): The type of response suggested (e.g., immediate).
         follow_up_required (bool): Whether a follow-up action is needed.
+        truncation (Optional[dict]): For tickets analyzed in long-content mode, what was left
+            out (see src/agents/long_content.py); None when the whole ticket was analyzed.
     """
     category: TicketCategory
     priority: Priority
@@ -50,6 +57,66 @@ class TicketAnalysis:
     business_impact: str
     suggested_response_type: str
     follow_up_required: bool
+    truncation: Optional[dict] = None
+
+    def to_dict(self) -> dict:
+        """
+        Converts the analysis into plain JSON types (the layout of data/processed_tickets.json).
+        """
+        data = {
+            "category": self.category.value,
+            "priority": int(self.priority),
+            "key_points": list(self.key_points),
+            "required_expertise": list(self.required_expertise),
+            "sentiment": self.sentiment,
+            "urgency_indicators": list(self.urgency_indicators),
+            "business_impact": self.business_impact,
+            "suggested_response_type": self.suggested_response_type,
+            "follow_up_required": self.follow_up_required,
+        }
+        if self.truncation is not None:
+            data["truncation"] = dict(self.truncation)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TicketAnalysis":
+        """
+        Rebuilds an analysis from the output of to_dict.
+        """
+        return cls(
+            category=TicketCategory(data["category"]),
+            priority=Priority(data["priority"]),
+            key_points=list(data["key_points"]),
+            required_expertise=list(data["required_expertise"]),
+            sentiment=data["sentiment"],
+            urgency_indicators=list(data["urgency_indicators"]),
+            business_impact=data["business_impact"],
+            suggested_response_type=data["suggested_response_type"],
+            follow_up_required=data["follow_up_required"],
+            truncation=data.get("truncation"),
+        )
+
+def score_sentiment_batch(analyzer, texts: Sequence[str]) -> List[float]:
+    """
+    Scores the VADER compound sentiment of a batch of texts.
+
+    Identical texts within the batch are scored only once. Analyzers with a
+    compound_batch method (the "numpy" backend) score the distinct texts in one call.
+
+    Args:
+        analyzer: The sentiment analyzer (with polarity_scores) used to score the texts.
+        texts (Sequence[str]): The texts to score.
+
+    Returns:
+        List[float]: The compound score of each text, in input order.
+    """
+    distinct = list(dict.fromkeys(texts))
+    compound_batch = getattr(analyzer, "compound_batch", None)
+    if compound_batch is not None:
+        scores = dict(zip(distinct, compound_batch(distinct)))
+    else:
+        scores = {text: analyzer.polarity_scores(text)["compound"] for text in distinct}
+    return [scores[text] for text in texts]
 
 class TicketAnalysisAgent:
     """
@@ -58,13 +125,49 @@ class TicketAnalysisAgent:
     and determines if follow-ups are required.
     """
 
-    def __init__(self):
+    def __init__(self, rules: Optional[KeywordRules] = None, batch_size: int = 256,
+                 sentiment_backend: str = "nltk", metrics=None,
+                 long_content: Optional[LongContentPolicy] = None):
         """
-        Initializes the Ticket Analysis Agent with an NLTK Sentiment Analyzer.
+        Initializes the Ticket Analysis Agent with a lazily loaded NLTK Sentiment Analyzer
+        and compiles the keyword rule table into a single-pass matcher.
+
+        Args:
+            rules (Optional[KeywordRules]): Keyword rule table to use (defaults to the built-in rules).
+            batch_size (int): Number of tickets analyzed per chunk by analyze_batch.
+            sentiment_backend (str): "nltk" (default) or "numpy" for the vectorized VADER scorer.
+            metrics (Optional[Instrumentation]): Records per-step latencies and per category/priority
+                counts when given (disabled by default). Analyses with a field mask (analyze_lazy,
+                analyze_ticket(..., fields=...)) are neither timed nor counted; see lazy_stats().
+            long_content (Optional[LongContentPolicy]): Limits for tickets longer than its max_chars
+                (e.g. LongContentPolicy()), which keep their latency and memory bounded; None (the
+                default) analyzes every ticket in full.
         """
-        self.sentiment_analyzer = SentimentIntensityAnalyzer()
+        self.sentiment_analyzer = LazySentimentAnalyzer(sentiment_backend)
+        self.rules = rules or KeywordRules()
+        self.matcher = KeywordMatcher(self.rules)
+        self.batch_size = batch_size
+        self.metrics = metrics
+        self.long_content = long_content
 
-    async def analyze_ticket(self, ticket_content: str, customer_info: Optional[dict] = None) -> TicketAnalysis:
+        # Rule lookups resolved once, so per-ticket work is set membership only
+        self._category_keywords = [
+            (TicketCategory(value), frozenset(word.lower() for word in keywords))
+            for value, keywords in self.rules.category_rules
+        ]
+        self._urgency_words = [(word, word.lower()) for word in self.rules.urgency_words]
+        self._impact_keywords = [
+            (impact, frozenset(word.lower() for word in keywords))
+            for impact, keywords in self.rules.business_impact_rules
+        ]
+        self._follow_up_words = frozenset(word.lower() for word in self.rules.follow_up_words)
+
+        # Counters of lazy analyses (see lazy_stats)
+        self.lazy_analyses = 0
+        self.lazy_sentiment_calls = 0
+
+    async def analyze_ticket(self, ticket_content: str, customer_info: Optional[dict] = None,
+                             fields: Optional[Iterable[str]] = None) -> TicketAnalysis:
         """
         Analyzes a support ticket to classify its category, determine priority,
         detect sentiment, urgency, and necessary expertise.
@@ -72,70 +175,223 @@ class TicketAnalysisAgent:
         Args:
             ticket_content (str): The text of the support ticket.
             customer_info (Optional[dict]): Additional customer information (role, name).
+            fields (Optional[Iterable[str]]): Only compute these TicketAnalysis fields (and what they
+                depend on); a LazyTicketAnalysis is returned instead (see analyze_lazy).
 
         Returns:
             TicketAnalysis: The structured analysis of the ticket.
 
         Example:
             analysis = await agent.analyze_ticket("I can't log in to my account. Please fix ASAP!", {"role": "Admin"})
+            priority = (await agent.analyze_ticket(text, fields=("priority",))).priority
         """
+        if fields is not None:
+            return self.analyze_lazy(ticket_content, fields)
 
-        # **Step 1: Identify Ticket Category**
-        if any(word in ticket_content.lower() for word in ["access", "login", "403", "admin"]):
-            category = TicketCategory.ACCESS
-        elif any(word in ticket_content.lower() for word in ["billing", "invoice", "payment"]):
-            category = TicketCategory.BILLING
-        elif any(word in ticket_content.lower() for word in ["feature request", "enhancement"]):
-            category = TicketCategory.FEATURE
-        else:
-            category = TicketCategory.TECHNICAL
+        timer = self.metrics.timer() if self.metrics is not None else None
+        view = long_view(ticket_content, self.long_content)
+
+        # One pass over the lowercased text finds every rule keyword
+        hits = self._scan(ticket_content, view)
+        if timer is not None:
+            timer.lap("keyword_scan")
 
         # **Step 2: Detect Sentiment Score**
-        sentiment_score = self.sentiment_analyzer.polarity_scores(ticket_content)["compound"]
+        sentiment_text = ticket_content if view is None else view.sentiment_sample()
+        sentiment_score = self.sentiment_analyzer.polarity_scores(sentiment_text)["compound"]
+        if timer is not None:
+            timer.lap("sentiment")
+        return self._build_analysis(ticket_content, hits, sentiment_score, timer, view)
+
+    def estimate_priority(self, ticket_content: str) -> Priority:
+        """
+        Estimates the priority of a ticket from its keywords alone, without scoring sentiment.
+
+        This is cheap enough to order work before the full analysis runs. The estimate equals
+        the analyzed priority, except that very negative sentiment can still raise LOW to MEDIUM.
+
+        Args:
+            ticket_content (str): The text of the support ticket.
+
+        Returns:
+            Priority: The estimated priority.
+        """
+        hits = self._scan(ticket_content, long_view(ticket_content, self.long_content))
+        return self._assign_priority(self._detect_category(hits), self._detect_urgency(hits),
+                                     self._detect_impact(hits), 0.0)
+
+    def analyze_lazy(self, ticket_content: str, fields: Optional[Iterable[str]] = None) -> "LazyTicketAnalysis":
+        """
+        Returns an analysis whose fields are computed on first access.
+
+        Each field computes only what it depends on: the keyword scan runs once when a keyword
+        based field is first read, and VADER sentiment is only scored when the sentiment field
+        is read or the priority rules fall through to the sentiment check. Values that are read
+        are identical to analyze_ticket.
+
+        Args:
+            ticket_content (str): The text of the support ticket.
+            fields (Optional[Iterable[str]]): Fields to compute right away; to_dict() reports only
+                these (all fields if None, computed on access).
+
+        Returns:
+            LazyTicketAnalysis: The lazily evaluated analysis.
+        """
+        return LazyTicketAnalysis(self, ticket_content, fields)
+
+    def lazy_stats(self) -> dict:
+        """
+        Returns how often lazy analyses needed VADER.
+
+        Returns:
+            dict: {"analyses", "vader_calls", "vader_skipped", "skip_rate"}.
+        """
+        skipped = self.lazy_analyses - self.lazy_sentiment_calls
+        return {
+            "analyses": self.lazy_analyses,
+            "vader_calls": self.lazy_sentiment_calls,
+            "vader_skipped": skipped,
+            "skip_rate": skipped / self.lazy_analyses if self.lazy_analyses else 0.0,
+        }
+
+    async def analyze_batch(self, tickets: Iterable[Tuple[str, Optional[dict]]],
+                            batch_size: Optional[int] = None) -> List[TicketAnalysis]:
+        """
+        Analyzes many support tickets, amortizing the per-ticket overhead.
+
+        Tickets are processed in chunks: each chunk is lowercased and scanned once per
+        text and its sentiment is scored as a batch. The results are identical to
+        calling analyze_ticket on each ticket.
+
+        Args:
+            tickets (Iterable[Tuple[str, Optional[dict]]]): (ticket_content, customer_info) pairs.
+            batch_size (Optional[int]): Chunk size (defaults to the agent's batch_size).
+
+        Returns:
+            List[TicketAnalysis]: The analysis of each ticket, in input order.
+
+        Example:
+            analyses = await agent.analyze_batch([("I can't log in!", {"role": "Admin"}), ("Invoice wrong", None)])
+        """
+        size = max(1, batch_size or self.batch_size)
+        results: List[TicketAnalysis] = []
+        chunk: List[str] = []
+        for ticket_content, _customer_info in tickets:
+            chunk.append(ticket_content)
+            if len(chunk) >= size:
+                results.extend(self._analyze_chunk(chunk))
+                chunk = []
+                # Let other tasks run between chunks
+                await asyncio.sleep(0)
+        if chunk:
+            results.extend(self._analyze_chunk(chunk))
+        return results
+
+    async def analyze_batch_columnar(self, tickets: Iterable[Tuple[str, Optional[dict]]],
+                                     batch_size: Optional[int] = None):
+        """
+        Analyzes many support tickets into a compact TicketAnalysisColumns store.
+
+        Only one chunk of TicketAnalysis objects exists at a time, so memory grows with the
+        column arrays rather than with one object per ticket.
+
+        Args:
+            tickets (Iterable[Tuple[str, Optional[dict]]]): (ticket_content, customer_info) pairs.
+            batch_size (Optional[int]): Chunk size (defaults to the agent's batch_size).
+
+        Returns:
+            TicketAnalysisColumns: The analyses, in input order.
+        """
+        from src.agents.analysis_columns import TicketAnalysisColumns
+
+        size = max(1, batch_size or self.batch_size)
+        columns = TicketAnalysisColumns(urgency_vocabulary=self.rules.urgency_words)
+        chunk: List[str] = []
+        for ticket_content, _customer_info in tickets:
+            chunk.append(ticket_content)
+            if len(chunk) >= size:
+                columns.extend(self._analyze_chunk(chunk))
+                chunk = []
+                await asyncio.sleep(0)
+        if chunk:
+            columns.extend(self._analyze_chunk(chunk))
+        return columns
+
+    def _analyze_chunk(self, contents: List[str]) -> List[TicketAnalysis]:
+        timer = self.metrics.timer() if self.metrics is not None else None
+        policy = self.long_content
+        views = [long_view(content, policy) for content in contents]
+        scan = self._scan
+        all_hits = [scan(content, view) for content, view in zip(contents, views)]
+        if timer is not None:
+            timer.lap("keyword_scan", len(contents))
+        sentiments = score_sentiment_batch(
+            self.sentiment_analyzer,
+            [content if view is None else view.sentiment_sample() for content, view in zip(contents, views)],
+        )
+        if timer is not None:
+            timer.lap("sentiment", len(contents))
+        build = self._build_analysis
+        return [build(content, hits, sentiment, timer, view)
+                for content, hits, sentiment, view in zip(contents, all_hits, sentiments, views)]
+
+    def _scan(self, ticket_content: str, view=None) -> set:
+        # Long tickets are scanned chunk by chunk through their LongContent view
+        if view is not None:
+            return view.scan(self.matcher)
+        return self.matcher.scan(ticket_content.lower())
+
+    def _build_analysis(self, ticket_content: str, hits: set, sentiment_score: float,
+                        timer=None, view=None) -> TicketAnalysis:
+        """
+        Applies the rule table to the keyword hits and sentiment of a ticket
+        (every step except sentiment scoring, which the caller does).
+
+        When a StageTimer is given, each step's latency is recorded as it completes.
+        With a LongContent view, key points come from the view and its truncation
+        record is attached.
+        """
+        # **Step 1: Identify Ticket Category**
+        category = self._detect_category(hits)
+        if timer is not None:
+            timer.lap("category")
 
         # **Step 3: Detect Urgency Indicators**
-        urgency_words = ["urgent", "asap", "immediately", "critical", "payroll", "important"]
-        urgency_indicators = [word for word in urgency_words if word in ticket_content.lower()]
+        urgency_indicators = self._detect_urgency(hits)
+        if timer is not None:
+            timer.lap("urgency")
 
         # **Step 4: Determine Business Impact**
-        business_impact = "Low"
-        if "payroll" in ticket_content.lower():
-            business_impact = "High"
+        business_impact = self._detect_impact(hits)
+        if timer is not None:
+            timer.lap("impact")
 
         # **Step 5: Assign Priority**
-        if "urgent" in urgency_indicators or business_impact == "High":
-            priority = Priority.URGENT
-        elif "important" in urgency_indicators:
-            priority = Priority.HIGH
-        elif category == TicketCategory.BILLING:
-            priority = Priority.MEDIUM
-        elif business_impact == "Medium":
-            priority = Priority.MEDIUM
-        elif sentiment_score < -0.5:  # ✅ Increase priority if sentiment is very negative
-            priority = Priority.MEDIUM
-        else:
-            priority = Priority.LOW  # Default case
+        priority = self._assign_priority(category, urgency_indicators, business_impact, sentiment_score)
+        if timer is not None:
+            timer.lap("priority")
 
         # **Step 6: Identify Required Expertise**
-        required_expertise = ["Support Specialist"]
-        if category == TicketCategory.ACCESS:
-            required_expertise.append("Security Expert")
-        elif category == TicketCategory.BILLING:
-            required_expertise.append("Billing Specialist")
+        required_expertise = self._required_expertise(category)
+        if timer is not None:
+            timer.lap("expertise")
 
         # **Step 7: Extract Key Points**
-        key_points = [sentence.strip() for sentence in ticket_content.split("\n") if sentence.strip()]
+        key_points = self._key_points(ticket_content) if view is None else view.key_points()
+        if timer is not None:
+            timer.lap("key_points")
 
         # **Step 8: Determine Suggested Response Type**
-        suggested_response_type = "standard"
-        if priority == Priority.URGENT:
-            suggested_response_type = "immediate"
+        suggested_response_type = self._response_type(priority)
+        if timer is not None:
+            timer.lap("response_type")
 
         # **Step 9: Determine if Follow-up is Required**
-        follow_up_required = False
-        follow_up_words = ["confirm", "verify", "clarify", "follow-up", "double-check"]
-        if any(word in ticket_content.lower() for word in follow_up_words):
-            follow_up_required = True
+        follow_up_required = self._follow_up(hits)
+        if timer is not None:
+            timer.lap("follow_up")
+            self.metrics.count("analyzed_total", (("category", category.value), ("priority", priority.name)),
+                               help="Tickets analyzed, by category and priority.")
 
         return TicketAnalysis(
             category=category,
@@ -146,5 +402,191 @@ class TicketAnalysisAgent:
             urgency_indicators=urgency_indicators,
             business_impact=business_impact,
             suggested_response_type=suggested_response_type,
-            follow_up_required=follow_up_required
+            follow_up_required=follow_up_required,
+            truncation=None if view is None else view.truncation(),
         )
+
+    # Individual analysis steps, shared by eager (_build_analysis) and lazy (LazyTicketAnalysis) evaluation
+
+    def _detect_category(self, hits: set) -> TicketCategory:
+        for candidate, keywords in self._category_keywords:
+            if not keywords.isdisjoint(hits):
+                return candidate
+        return TicketCategory.TECHNICAL
+
+    def _detect_urgency(self, hits: set) -> List[str]:
+        return [word for word, lowered in self._urgency_words if lowered in hits]
+
+    def _detect_impact(self, hits: set) -> str:
+        for impact, keywords in self._impact_keywords:
+            if not keywords.isdisjoint(hits):
+                return impact
+        return "Low"
+
+    @staticmethod
+    def _assign_priority(category: TicketCategory, urgency_indicators: List[str], business_impact: str,
+                         sentiment_score) -> Priority:
+        # sentiment_score may be a zero-argument callable; it is only called when the
+        # keyword rules leave the priority undecided
+        if "urgent" in urgency_indicators or business_impact == "High":
+            return Priority.URGENT
+        elif "important" in urgency_indicators:
+            return Priority.HIGH
+        elif category == TicketCategory.BILLING:
+            return Priority.MEDIUM
+        elif business_impact == "Medium":
+            return Priority.MEDIUM
+        if callable(sentiment_score):
+            sentiment_score = sentiment_score()
+        if sentiment_score < -0.5:  # ✅ Increase priority if sentiment is very negative
+            return Priority.MEDIUM
+        return Priority.LOW  # Default case
+
+    @staticmethod
+    def _required_expertise(category: TicketCategory) -> List[str]:
+        required_expertise = ["Support Specialist"]
+        if category == TicketCategory.ACCESS:
+            required_expertise.append("Security Expert")
+        elif category == TicketCategory.BILLING:
+            required_expertise.append("Billing Specialist")
+        return required_expertise
+
+    @staticmethod
+    def _key_points(ticket_content: str) -> List[str]:
+        return [sentence.strip() for sentence in ticket_content.split("\n") if sentence.strip()]
+
+    @staticmethod
+    def _response_type(priority: Priority) -> str:
+        return "immediate" if priority == Priority.URGENT else "standard"
+
+    def _follow_up(self, hits: set) -> bool:
+        return not self._follow_up_words.isdisjoint(hits)
+
+ANALYSIS_FIELDS = ("category", "priority", "key_points", "required_expertise", "sentiment",
+                   "urgency_indicators", "business_impact", "suggested_response_type", "follow_up_required")
+
+_MISSING = object()
+
+class LazyTicketAnalysis:
+    """
+    TicketAnalysis whose fields are computed on first access, with dependency tracking.
+
+    Dependencies: category, urgency indicators, business impact and follow-up read the
+    keyword hits (one scan, shared); priority reads category, urgency and impact, and
+    sentiment only when no keyword rule decides it; required expertise reads category;
+    the response type reads priority; key points read the text. Long tickets are read
+    through a LongContent view, as in analyze_ticket. Created by TicketAnalysisAgent.analyze_lazy.
+    """
+
+    __slots__ = ("_agent", "_content", "_fields", "_hits", "_values", "_view")
+
+    def __init__(self, agent: TicketAnalysisAgent, ticket_content: str, fields: Optional[Iterable[str]] = None):
+        self._agent = agent
+        self._content = ticket_content
+        self._view = long_view(ticket_content, agent.long_content)
+        self._hits = None
+        self._values = {}
+        self._fields = tuple(fields) if fields is not None else ANALYSIS_FIELDS
+        unknown = set(self._fields) - set(ANALYSIS_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown TicketAnalysis fields: {sorted(unknown)}")
+        agent.lazy_analyses += 1
+        if fields is not None:
+            for field in self._fields:
+                self._get(field)
+
+    def _get(self, field: str):
+        value = self._values.get(field, _MISSING)
+        if value is _MISSING:
+            value = self._values[field] = getattr(self, "_compute_" + field)()
+        return value
+
+    def _keyword_hits(self) -> set:
+        if self._hits is None:
+            self._hits = self._agent._scan(self._content, self._view)
+        return self._hits
+
+    def _compute_category(self):
+        return self._agent._detect_category(self._keyword_hits())
+
+    def _compute_urgency_indicators(self):
+        return self._agent._detect_urgency(self._keyword_hits())
+
+    def _compute_business_impact(self):
+        return self._agent._detect_impact(self._keyword_hits())
+
+    def _compute_follow_up_required(self):
+        return self._agent._follow_up(self._keyword_hits())
+
+    def _compute_sentiment(self):
+        self._agent.lazy_sentiment_calls += 1
+        text = self._content if self._view is None else self._view.sentiment_sample()
+        return self._agent.sentiment_analyzer.polarity_scores(text)["compound"]
+
+    def _compute_priority(self):
+        return self._agent._assign_priority(self.category, self.urgency_indicators, self.business_impact,
+                                            lambda: self.sentiment)
+
+    def _compute_required_expertise(self):
+        return self._agent._required_expertise(self.category)
+
+    def _compute_key_points(self):
+        if self._view is not None:
+            return self._view.key_points()
+        return self._agent._key_points(self._content)
+
+    def _compute_suggested_response_type(self):
+        return self._agent._response_type(self.priority)
+
+    category = property(lambda self: self._get("category"))
+    priority = property(lambda self: self._get("priority"))
+    key_points = property(lambda self: self._get("key_points"))
+    required_expertise = property(lambda self: self._get("required_expertise"))
+    sentiment = property(lambda self: self._get("sentiment"))
+    urgency_indicators = property(lambda self: self._get("urgency_indicators"))
+    business_impact = property(lambda self: self._get("business_impact"))
+    suggested_response_type = property(lambda self: self._get("suggested_response_type"))
+    follow_up_required = property(lambda self: self._get("follow_up_required"))
+
+    @property
+    def evaluated(self) -> Tuple[str, ...]:
+        """
+        The fields computed so far, in TicketAnalysis order.
+        """
+        return tuple(field for field in ANALYSIS_FIELDS if field in self._values)
+
+    def to_analysis(self) -> TicketAnalysis:
+        """
+        Computes every field and returns a regular TicketAnalysis.
+        """
+        analysis = TicketAnalysis(**{field: self._get(field) for field in ANALYSIS_FIELDS})
+        if self._view is not None:
+            analysis.truncation = self._view.truncation()
+        return analysis
+
+    def to_dict(self) -> dict:
+        """
+        Converts the requested fields into the plain JSON layout of TicketAnalysis.to_dict.
+        """
+        data = {}
+        for field in self._fields:
+            value = self._get(field)
+            if field == "category":
+                value = value.value
+            elif field == "priority":
+                value = int(value)
+            elif isinstance(value, list):
+                value = list(value)
+            data[field] = value
+        return data
+
+    def __eq__(self, other):
+        if isinstance(other, LazyTicketAnalysis):
+            other = other.to_analysis()
+        if isinstance(other, TicketAnalysis):
+            return self.to_analysis() == other
+        return NotImplemented
+
+    def __repr__(self):
+        values = ", ".join(f"{field}={self._values[field]!r}" for field in self.evaluated)
+        return f"LazyTicketAnalysis({values})"
@@ -0,0 +1,345 @@
+"""
+Indexed ticket history for dashboard queries, stored in SQLite.
+
+Processed tickets (analysis, response, customer role, processing time) are appended to
+a `tickets` table in batches, one transaction per batch. Queries such as "URGENT access
+tickets in the last hour with sentiment < -0.5" go through composite indexes instead of
+scanning every result:
+
+- tickets_category (category, priority, processed_at)
+- tickets_priority (priority, processed_at)
+- tickets_role (role, processed_at)
+- tickets_processed_at (processed_at)
+
+Each batch also updates `ticket_minutes`, per-minute counts by category and priority,
+with an upsert. Dashboards read their totals and time series from that table, which is
+small, so they never rescan raw rows.
+
+The database runs in WAL mode, so readers (another TicketHistory on the same file, the
+sqlite3 shell) see committed batches while ingestion continues. synchronous=NORMAL
+is used: a crash of the process loses nothing committed, and a power loss can lose at
+most the last batches.
+"""
+import json
+import sqlite3
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Union
+from src.agents.ticket_analysis import Priority, TicketAnalysis, TicketCategory
+
+# Tickets scoring below this are counted as negative in the per-minute aggregates
+NEGATIVE_SENTIMENT = -0.5
+
+TimeLike = Union[datetime, timedelta, float, int, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    id INTEGER PRIMARY KEY,
+    ticket_id,
+    processed_at REAL NOT NULL,
+    category TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    sentiment REAL NOT NULL,
+    role TEXT,
+    follow_up INTEGER NOT NULL,
+    analysis TEXT NOT NULL,
+    response TEXT
+);
+CREATE INDEX IF NOT EXISTS tickets_category ON tickets (category, priority, processed_at);
+CREATE INDEX IF NOT EXISTS tickets_priority ON tickets (priority, processed_at);
+CREATE INDEX IF NOT EXISTS tickets_role ON tickets (role, processed_at);
+CREATE INDEX IF NOT EXISTS tickets_processed_at ON tickets (processed_at);
+CREATE TABLE IF NOT EXISTS ticket_minutes (
+    minute INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    tickets INTEGER NOT NULL,
+    sentiment_sum REAL NOT NULL,
+    negative INTEGER NOT NULL,
+    follow_ups INTEGER NOT NULL,
+    PRIMARY KEY (minute, category, priority)
+) WITHOUT ROWID;
+"""
+
+_INSERT = ("INSERT INTO tickets (ticket_id, processed_at, category, priority, sentiment, role, follow_up, analysis, "
+           "response) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+_UPSERT_MINUTE = """
+INSERT INTO ticket_minutes (minute, category, priority, tickets, sentiment_sum, negative, follow_ups)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (minute, category, priority) DO UPDATE SET
+    tickets = tickets + excluded.tickets,
+    sentiment_sum = sentiment_sum + excluded.sentiment_sum,
+    negative = negative + excluded.negative,
+    follow_ups = follow_ups + excluded.follow_ups
+"""
+_compact = json.JSONEncoder(separators=(",", ":"), default=str).encode
+
+
+def _utc(timestamp: float) -> datetime:
+    # Naive UTC, like the datetime.utcnow() stamps of the bulk output
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+class TicketHistory:
+    """
+    Append-only history of processed tickets in an SQLite database (WAL mode).
+
+    Records are buffered and written batch_size at a time, each batch in one transaction
+    that also updates the per-minute aggregates. Call flush() (or close()) to write the
+    rest of the buffer.
+
+    Example:
+        with TicketHistory("history.db") as history:
+            history.add_many(records)
+            history.flush()
+            angry = history.query(category="access", priority=Priority.URGENT,
+                                  since=timedelta(hours=1), sentiment_below=-0.5)
+    """
+
+    def __init__(self, path: str = ":memory:", batch_size: int = 1000, clock=time.time):
+        """
+        Opens (or creates) the history database.
+
+        Args:
+            path (str): SQLite file (an in-memory database by default).
+            batch_size (int): Records buffered before they are written in one transaction.
+            clock: Time source in epoch seconds (time.time by default); stamps records
+                without a processed_at and resolves relative (timedelta) query bounds.
+        """
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.clock = clock
+        self.inserted = 0
+        self.skipped = 0
+        self.batches = 0
+        self._pending: List[tuple] = []
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def _timestamp(self, value: Optional[TimeLike]) -> float:
+        """
+        Converts a time to epoch seconds: datetimes (naive ones are UTC), ISO strings,
+        epoch seconds, or a timedelta counted back from now.
+        """
+        if value is None:
+            return self.clock()
+        if isinstance(value, timedelta):
+            return self.clock() - value.total_seconds()
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            return value.timestamp()
+        return float(value)
+
+    def add(self, record: dict):
+        """
+        Buffers one record, writing the buffer once batch_size records are pending.
+
+        Args:
+            record (dict): A pipeline result: "ticket_analysis" (TicketAnalysis or its
+                to_dict), "response", and optionally "ticket_id", "customer_info" (for the
+                role) and "processed_at". Error records (no analysis) are skipped.
+        """
+        analysis = record.get("ticket_analysis")
+        if analysis is None:
+            self.skipped += 1
+            return
+        data = analysis.to_dict() if hasattr(analysis, "to_dict") else analysis
+        customer_info = record.get("customer_info") or {}
+        response = record.get("response")
+        self._pending.append((
+            record.get("ticket_id"),
+            self._timestamp(record.get("processed_at")),
+            data["category"],
+            int(data["priority"]),
+            float(data["sentiment"]),
+            customer_info.get("role"),
+            int(bool(data["follow_up_required"])),
+            _compact(data),
+            None if response is None else _compact(response),
+        ))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def add_many(self, records: Iterable[dict]):
+        """
+        Buffers records (e.g. TicketProcessor results or read_records(path)), writing full batches.
+        """
+        for record in records:
+            self.add(record)
+
+    def flush(self):
+        """
+        Writes the buffered records and their per-minute aggregates in one transaction.
+        """
+        rows, self._pending = self._pending, []
+        if not rows:
+            return
+        minutes: Dict[tuple, list] = defaultdict(lambda: [0, 0.0, 0, 0])
+        for row in rows:
+            totals = minutes[(int(row[1] // 60), row[2], row[3])]
+            totals[0] += 1
+            totals[1] += row[4]
+            totals[2] += row[4] < NEGATIVE_SENTIMENT
+            totals[3] += row[6]
+        with self._db:
+            self._db.executemany(_INSERT, rows)
+            self._db.executemany(_UPSERT_MINUTE, [key + tuple(totals) for key, totals in minutes.items()])
+        self.inserted += len(rows)
+        self.batches += 1
+
+    @staticmethod
+    def _value(value) -> Union[str, int]:
+        # Categories are stored by value, priorities as integers
+        if isinstance(value, TicketCategory):
+            return value.value
+        if isinstance(value, Priority):
+            return int(value)
+        return value
+
+    def _where(self, category=None, priority=None, role=None, since=None, until=None,
+               sentiment_below=None, minutes: bool = False):
+        # minutes: filter the ticket_minutes aggregates, whose time column is whole minutes
+        time_column = "minute" if minutes else "processed_at"
+        clauses, params = [], []
+        for column, value in (("category", category), ("priority", priority), ("role", role)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(self._value(value))
+        for operator, bound in ((">=", since), ("<", until)):
+            if bound is not None:
+                timestamp = self._timestamp(bound)
+                clauses.append(f"{time_column} {operator} ?")
+                params.append(int(timestamp // 60) if minutes else timestamp)
+        if sentiment_below is not None:
+            clauses.append("sentiment < ?")
+            params.append(sentiment_below)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(self, category=None, priority=None, role=None, since: Optional[TimeLike] = None,
+              until: Optional[TimeLike] = None, sentiment_below: Optional[float] = None,
+              limit: Optional[int] = 100) -> List[dict]:
+        """
+        Returns the matching records, most recent first.
+
+        Args:
+            category (TicketCategory or str): Only tickets of this category.
+            priority (Priority or int): Only tickets of this priority.
+            role (str): Only tickets from customers with this role.
+            since: Only tickets processed at or after this time (a timedelta means "that long ago").
+            until: Only tickets processed before this time.
+            sentiment_below (float): Only tickets whose sentiment is below this score.
+            limit (Optional[int]): Maximum number of records (all if None).
+
+        Returns:
+            List[dict]: Records with "ticket_id", "processed_at" (naive UTC datetime), "role",
+                "ticket_analysis" (TicketAnalysis) and "response".
+        """
+        where, params = self._where(category, priority, role, since, until, sentiment_below)
+        sql = f"SELECT ticket_id, processed_at, role, analysis, response FROM tickets{where} ORDER BY processed_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [
+            {
+                "ticket_id": ticket_id,
+                "processed_at": _utc(processed_at),
+                "role": role,
+                "ticket_analysis": TicketAnalysis.from_dict(json.loads(analysis)),
+                "response": None if response is None else json.loads(response),
+            }
+            for ticket_id, processed_at, role, analysis, response in self._db.execute(sql, params)
+        ]
+
+    def count(self, category=None, priority=None, role=None, since: Optional[TimeLike] = None,
+              until: Optional[TimeLike] = None, sentiment_below: Optional[float] = None) -> int:
+        """
+        Returns the number of matching records (same filters as query), read from the indexes.
+        """
+        where, params = self._where(category, priority, role, since, until, sentiment_below)
+        return self._db.execute(f"SELECT COUNT(*) FROM tickets{where}", params).fetchone()[0]
+
+    def minute_stats(self, since: Optional[TimeLike] = None, until: Optional[TimeLike] = None,
+                     category=None, priority=None) -> List[dict]:
+        """
+        Returns per-minute totals from the aggregates, oldest first.
+
+        Bounds are rounded down to whole minutes.
+
+        Returns:
+            List[dict]: One {"minute", "tickets", "avg_sentiment", "negative", "follow_ups"}
+                per minute with tickets; "minute" is a naive UTC datetime.
+        """
+        where, params = self._where(category, priority, since=since, until=until, minutes=True)
+        rows = self._db.execute(
+            "SELECT minute, SUM(tickets), SUM(sentiment_sum), SUM(negative), SUM(follow_ups) "
+            f"FROM ticket_minutes{where} GROUP BY minute ORDER BY minute", params
+        )
+        return [
+            {
+                "minute": _utc(minute * 60),
+                "tickets": tickets,
+                "avg_sentiment": round(sentiment_sum / tickets, 4),
+                "negative": negative,
+                "follow_ups": follow_ups,
+            }
+            for minute, tickets, sentiment_sum, negative, follow_ups in rows
+        ]
+
+    def count_by(self, field: str, since: Optional[TimeLike] = None, until: Optional[TimeLike] = None) -> dict:
+        """
+        Returns ticket counts per category or priority from the aggregates (bounds in whole minutes).
+
+        Args:
+            field (str): "category" or "priority".
+        """
+        if field not in ("category", "priority"):
+            raise ValueError(f"count_by field must be 'category' or 'priority', not {field!r}")
+        where, params = self._where(since=since, until=until, minutes=True)
+        convert = TicketCategory if field == "category" else Priority
+        rows = self._db.execute(f"SELECT {field}, SUM(tickets) FROM ticket_minutes{where} GROUP BY {field}", params)
+        return {convert(value): count for value, count in rows}
+
+    def prune(self, before: TimeLike) -> int:
+        """
+        Deletes records processed before a time, keeping their per-minute aggregates.
+
+        Returns:
+            int: The number of records deleted.
+        """
+        self.flush()
+        with self._db:
+            cursor = self._db.execute("DELETE FROM tickets WHERE processed_at < ?", (self._timestamp(before),))
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the ingestion counters.
+        """
+        return {
+            "inserted": self.inserted,
+            "pending": len(self._pending),
+            "skipped": self.skipped,
+            "batches": self.batches,
+        }
+
+    def close(self):
+        """
+        Writes the buffered records and closes the database.
+        """
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,220 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+# nltk resource path of the VADER lexicon text file
+LEXICON_RESOURCE = "sentiment/vader_lexicon.zip/vader_lexicon/vader_lexicon.txt"
+
+# Bump when the layout of the pickled cache changes
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / "data" / f"vader_lexicon.v{CACHE_FORMAT_VERSION}.pickle"
+
+_lock = threading.Lock()
+_lexicon: Optional[Dict[str, float]] = None
+_lexicon_version: Optional[str] = None
+_analyzers: Dict[str, object] = {}
+
+# Sentiment scorer backends selectable by the agents
+SENTIMENT_BACKENDS = ("nltk", "numpy")
+
+
+def cache_path() -> Path:
+    """
+    Returns the location of the pre-parsed lexicon cache ($VADER_LEXICON_CACHE overrides the default).
+    """
+    return Path(os.environ.get("VADER_LEXICON_CACHE", DEFAULT_CACHE_PATH))
+
+
+def parse_lexicon(text: str) -> Dict[str, float]:
+    """
+    Parses the VADER lexicon text the same way nltk's SentimentIntensityAnalyzer.make_lex_dict does.
+    """
+    lexicon = {}
+    for line in text.split("\n"):
+        (word, measure) = line.strip().split("\t")[0:2]
+        lexicon[word] = float(measure)
+    return lexicon
+
+
+def _read_source() -> Optional[str]:
+    import nltk
+
+    try:
+        return nltk.data.load(LEXICON_RESOURCE)
+    except LookupError:
+        return None
+
+
+def _load_cache(path: Path) -> Optional[dict]:
+    try:
+        with open(path, "rb") as file:
+            payload = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("format") != CACHE_FORMAT_VERSION:
+        return None
+    return payload
+
+
+def build_cache(path: Optional[Path] = None, download: bool = False) -> Path:
+    """
+    Parses the nltk VADER lexicon once and writes the pre-parsed cache.
+
+    Args:
+        path (Optional[Path]): Where to write the cache (defaults to cache_path()).
+        download (bool): Download the lexicon with nltk if it is not installed locally.
+
+    Returns:
+        Path: The path of the written cache.
+
+    Raises:
+        LookupError: If the lexicon is not installed (and download is False or fails).
+    """
+    path = Path(path or cache_path())
+    text = _read_source()
+    if text is None and download:
+        import nltk
+
+        nltk.download("vader_lexicon", quiet=True)
+        text = _read_source()
+    if text is None:
+        raise LookupError(
+            "VADER lexicon not found. Install it with nltk.download('vader_lexicon') on a connected host "
+            "and run `python -m src.agents.vader_lexicon` to build the offline cache."
+        )
+    _write_cache(path, text)
+    return path
+
+
+def _write_cache(path: Path, text: str) -> dict:
+    payload = {
+        "format": CACHE_FORMAT_VERSION,
+        "sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        "lexicon": parse_lexicon(text),
+    }
+    # Write atomically so concurrent workers never read a partial cache
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            pickle.dump(payload, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+    return payload
+
+
+def get_lexicon() -> Dict[str, float]:
+    """
+    Returns the VADER lexicon, shared by every analyzer in the process.
+
+    The first call loads the pre-parsed cache if present; otherwise it parses the
+    locally installed nltk lexicon and writes the cache for the next process.
+    Nothing is ever downloaded. After upgrading the lexicon, rebuild the cache
+    with `python -m src.agents.vader_lexicon`.
+
+    Raises:
+        LookupError: If neither the cache nor the nltk lexicon is available.
+    """
+    global _lexicon, _lexicon_version
+    if _lexicon is not None:
+        return _lexicon
+    with _lock:
+        if _lexicon is None:
+            path = cache_path()
+            payload = _load_cache(path)
+            if payload is None:
+                text = _read_source()
+                if text is None:
+                    raise LookupError(
+                        f"No VADER lexicon cache at {path} and no local nltk vader_lexicon. "
+                        "Run `python -m src.agents.vader_lexicon --download` on a connected host."
+                    )
+                try:
+                    payload = _write_cache(path, text)
+                except OSError:
+                    # Read-only deployment: keep the parsed lexicon in memory only
+                    payload = {"sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+                               "lexicon": parse_lexicon(text)}
+            _lexicon_version = payload["sha256"]
+            _lexicon = payload["lexicon"]
+    return _lexicon
+
+
+def lexicon_version() -> str:
+    """
+    Returns the SHA-256 of the lexicon text the shared lexicon was parsed from.
+    """
+    get_lexicon()
+    return _lexicon_version
+
+
+def get_analyzer(backend: str = "nltk"):
+    """
+    Returns the process-wide sentiment analyzer of a backend, built on the shared lexicon.
+
+    Args:
+        backend (str): "nltk" for nltk's SentimentIntensityAnalyzer, or "numpy" for the
+            batch-vectorized VectorizedSentimentAnalyzer (requires numpy).
+    """
+    analyzer = _analyzers.get(backend)
+    if analyzer is None:
+        lexicon = get_lexicon()
+        if backend == "nltk":
+            from nltk.sentiment.vader import SentimentIntensityAnalyzer, VaderConstants
+
+            # Skip SentimentIntensityAnalyzer.__init__, which would re-read and re-parse the lexicon file
+            analyzer = SentimentIntensityAnalyzer.__new__(SentimentIntensityAnalyzer)
+            analyzer.lexicon_file = None
+            analyzer.lexicon = lexicon
+            analyzer.constants = VaderConstants()
+        elif backend == "numpy":
+            from src.agents.vader_numpy import VectorizedSentimentAnalyzer
+
+            analyzer = VectorizedSentimentAnalyzer(lexicon)
+        else:
+            raise ValueError(f"Unknown sentiment backend {backend!r}; expected one of {SENTIMENT_BACKENDS}")
+        _analyzers[backend] = analyzer
+    return analyzer
+
+
+class LazySentimentAnalyzer:
+    """
+    Drop-in stand-in for nltk's SentimentIntensityAnalyzer that loads nothing until first use.
+
+    nltk and the lexicon are loaded on the first attribute access (e.g. polarity_scores),
+    and every instance shares the same process-wide analyzer of its backend.
+    """
+
+    def __init__(self, backend: str = "nltk"):
+        """
+        Args:
+            backend (str): Sentiment backend, "nltk" or "numpy" (see get_analyzer).
+        """
+        if backend not in SENTIMENT_BACKENDS:
+            raise ValueError(f"Unknown sentiment backend {backend!r}; expected one of {SENTIMENT_BACKENDS}")
+        self.backend = backend
+
+    def __getattr__(self, name):
+        if name == "backend":
+            raise AttributeError(name)
+        value = getattr(get_analyzer(self.backend), name)
+        # Bind on the instance so later lookups skip __getattr__
+        setattr(self, name, value)
+        return value
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the pre-parsed VADER lexicon cache.")
+    parser.add_argument("--output", help="cache path (default: $VADER_LEXICON_CACHE or data/)")
+    parser.add_argument("--download", action="store_true", help="download the lexicon with nltk if missing")
+    args = parser.parse_args()
+    print(f"Wrote {build_cache(args.output, download=args.download)}")
@@ -0,0 +1,299 @@
+import math
+import string
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.agents.vader_lexicon import get_lexicon
+
+_PUNCTUATION = frozenset(string.punctuation)
+
+# Idiom words too common to trigger the idiom check on their own
+_IDIOM_STOPWORDS = frozenset({"the", "to", "of", "just", "cut", "hand"})
+
+
+def _has_punctuation(word: str) -> bool:
+    return any(char in _PUNCTUATION for char in word)
+
+
+class VectorizedSentimentAnalyzer:
+    """
+    VADER-compatible sentiment scorer that scores whole batches with NumPy.
+
+    Tokenization is done per text in Python, equivalent to nltk's SentiText (without
+    building its punctuation product dictionary). Every later step (lexicon lookup,
+    capitalization, booster and negation windows, "least", "but" and the final
+    normalization) runs as array operations over all tokens of the batch. The rare
+    idiom checks fall back to nltk's exact rule for the affected tokens only.
+
+    polarity_scores returns the same dictionary as nltk's SentimentIntensityAnalyzer.
+    """
+
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None):
+        """
+        Converts the lexicon and VADER constants into token-id feature arrays.
+
+        Args:
+            lexicon (Optional[Dict[str, float]]): VADER lexicon (defaults to the shared cached lexicon).
+        """
+        from nltk.sentiment.vader import VaderConstants
+
+        self.constants = VaderConstants()
+        lexicon = get_lexicon() if lexicon is None else lexicon
+        boosters = self.constants.BOOSTER_DICT
+        negate = self.constants.NEGATE
+        self._punc_list = frozenset(self.constants.PUNC_LIST)
+
+        # Lowercased vocabulary -> id; id 0 stands for every unknown word
+        words = [""] + sorted(set(lexicon) | set(boosters) | set(negate) | {"least", "at", "very", "but", "kind", "of"})
+        self._ids = {word: index for index, word in enumerate(words)}
+        self._in_lexicon = np.array([word in lexicon for word in words], dtype=bool)
+        self._valence = np.array([lexicon.get(word, 0.0) for word in words], dtype=np.float64)
+        self._is_booster = np.array([word in boosters for word in words], dtype=bool)
+        self._booster = np.array([boosters.get(word, 0.0) for word in words], dtype=np.float64)
+        self._negation = np.array([word in negate or "n't" in word for word in words], dtype=bool)
+        self._least_id = self._ids["least"]
+        self._at_id = self._ids["at"]
+        self._very_id = self._ids["very"]
+        self._but_id = self._ids["but"]
+        self._kind_id = self._ids["kind"]
+        self._of_id = self._ids["of"]
+
+        idiom_keys = list(self.constants.SPECIAL_CASE_IDIOMS) + [key for key in boosters if " " in key]
+        anchors = set()
+        for key in idiom_keys:
+            key_words = set(key.split())
+            anchors |= (key_words - _IDIOM_STOPWORDS) or key_words
+        self._idiom_anchors = frozenset(anchors)
+
+    def _tokenize(self, text: str) -> List[str]:
+        # Same tokens as nltk's SentiText._words_and_emoticons
+        tokens = []
+        for token in text.split():
+            if len(token) <= 1:
+                continue
+            if token[-1] in _PUNCTUATION:
+                end = len(token)
+                while end and token[end - 1] in _PUNCTUATION:
+                    end -= 1
+                word = token[:end]
+                if token[end:] in self._punc_list and len(word) > 1 and not _has_punctuation(word):
+                    token = word
+            elif token[0] in _PUNCTUATION:
+                start = 0
+                while start < len(token) and token[start] in _PUNCTUATION:
+                    start += 1
+                word = token[start:]
+                if token[:start] in self._punc_list and len(word) > 1 and not _has_punctuation(word):
+                    token = word
+            tokens.append(token)
+        return tokens
+
+    def polarity_scores(self, text: str) -> Dict[str, float]:
+        """
+        Returns nltk-compatible {"neg", "neu", "pos", "compound"} scores for one text.
+        """
+        return self.polarity_scores_batch([text])[0]
+
+    def compound_batch(self, texts: Sequence[str]) -> List[float]:
+        """
+        Returns the compound score of each text.
+        """
+        return [scores["compound"] for scores in self.polarity_scores_batch(texts)]
+
+    def polarity_scores_batch(self, texts: Sequence[str]) -> List[Dict[str, float]]:
+        """
+        Scores a batch of texts.
+
+        Args:
+            texts (Sequence[str]): The texts to score.
+
+        Returns:
+            List[Dict[str, float]]: nltk-compatible scores for each text, in input order.
+        """
+        constants = self.constants
+        n_texts = len(texts)
+        token_lists = [self._tokenize(text) for text in texts]
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=n_texts)
+        flat = [token for tokens in token_lists for token in tokens]
+        n = len(flat)
+        if n == 0:
+            return [{"neg": 0.0, "neu": 0.0, "pos": 0.0, "compound": 0.0} for _ in texts]
+
+        # Per distinct token: vocabulary id and case-sensitive features
+        local: Dict[str, int] = {}
+        local_vocab = []
+        local_ids = np.empty(n, dtype=np.int64)
+        for index, token in enumerate(flat):
+            code = local.get(token)
+            if code is None:
+                code = local[token] = len(local)
+                local_vocab.append(token)
+            local_ids[index] = code
+        lowered = [token.lower() for token in local_vocab]
+        ids = self._ids
+        vocab_ids = np.array([ids.get(word, 0) for word in lowered], dtype=np.int64)
+        local_upper = np.array([token.isupper() for token in local_vocab], dtype=bool)
+        local_never = np.array([token == "never" for token in local_vocab], dtype=bool)
+        local_so_this = np.array([token in ("so", "this") for token in local_vocab], dtype=bool)
+        local_negation = self._negation[vocab_ids] | np.array(["n't" in word for word in lowered], dtype=bool)
+        local_anchor = np.array([word in self._idiom_anchors for word in lowered], dtype=bool)
+
+        word_id = vocab_ids[local_ids]
+        in_lexicon = self._in_lexicon[word_id]
+        is_booster = self._is_booster[word_id]
+        booster = self._booster[word_id]
+        upper = local_upper[local_ids]
+        never = local_never[local_ids]
+        so_this = local_so_this[local_ids]
+        negation = local_negation[local_ids]
+
+        # Position of each token within its text
+        text_of = np.repeat(np.arange(n_texts), lengths)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        pos = np.arange(n) - starts[text_of]
+        upper_count = np.bincount(text_of, weights=upper, minlength=n_texts)
+        lower_count = lengths - upper_count
+        cap_diff = ((lower_count > 0) & (lower_count < lengths))[text_of]
+        cap_emphasis = upper & cap_diff
+
+        def back(array, k):
+            # Value of the token k positions earlier (only meaningful where pos >= k)
+            shifted = np.empty_like(array)
+            shifted[k:] = array[:-k]
+            shifted[:k] = array[:k]
+            return shifted
+
+        # Lexicon valence with ALL-CAPS emphasis
+        valence = self._valence[word_id].copy()
+        valence += np.where(cap_emphasis, np.where(valence > 0, constants.C_INCR, -constants.C_INCR), 0.0)
+
+        idiom_positions = None
+        for start_i in range(3):
+            k = start_i + 1
+            active = (pos > start_i) & ~back(in_lexicon, k)
+            prev_booster = back(is_booster, k)
+            scalar = back(booster, k) * np.where(valence < 0, -1.0, 1.0)
+            scalar += np.where(back(cap_emphasis, k), np.where(valence > 0, constants.C_INCR, -constants.C_INCR), 0.0)
+            scalar = np.where(prev_booster, scalar, 0.0)
+            if start_i == 1:
+                scalar *= 0.95
+            elif start_i == 2:
+                scalar *= 0.9
+            valence = np.where(active, valence + scalar, valence)
+
+            if start_i == 0:
+                factor = np.where(back(negation, 1), constants.N_SCALAR, 1.0)
+            elif start_i == 1:
+                never_so = back(never, 2) & back(so_this, 1)
+                factor = np.where(never_so, 1.5, np.where(back(negation, 2), constants.N_SCALAR, 1.0))
+            else:
+                emphasis = (back(never, 3) & back(so_this, 2)) | back(so_this, 1)
+                factor = np.where(emphasis, 1.25, np.where(back(negation, 3), constants.N_SCALAR, 1.0))
+                # Idioms can only match where an idiom word is within the window i-3 .. i+2
+                anchor = local_anchor[local_ids]
+                near = anchor | back(anchor, 1) | back(anchor, 2) | back(anchor, 3)
+                ahead = np.zeros(n, dtype=bool)
+                ahead[:-1] |= anchor[1:]
+                ahead[:-2] |= anchor[2:]
+                idiom_positions = np.flatnonzero(active & in_lexicon & (near | ahead))
+            valence = np.where(active, valence * factor, valence)
+
+            if start_i == 2 and idiom_positions.size:
+                for index in idiom_positions.tolist():
+                    text_index = int(text_of[index])
+                    valence[index] = self._idioms_check(valence[index], token_lists[text_index], int(pos[index]))
+
+        # "least" negation
+        prev_least = (pos > 0) & ~back(in_lexicon, 1) & (back(word_id, 1) == self._least_id)
+        before_least = back(word_id, 2)
+        least_negates = prev_least & ((pos == 1) | ((before_least != self._at_id) & (before_least != self._very_id)))
+        valence = np.where(least_negates, valence * constants.N_SCALAR, valence)
+
+        # Boosters and "kind of" carry no valence themselves
+        next_is_of = np.zeros(n, dtype=bool)
+        next_is_of[:-1] = word_id[1:] == self._of_id
+        next_is_of &= (pos < lengths[text_of] - 1)
+        skip = is_booster | ((word_id == self._kind_id) & next_is_of)
+        valence = np.where(in_lexicon & ~skip, valence, 0.0)
+
+        # nltk scores a repeated token at the position of its first occurrence
+        _, first, inverse = np.unique(text_of * len(local_vocab) + local_ids, return_index=True, return_inverse=True)
+        sentiments = valence[first][inverse.reshape(-1)]
+
+        # "but": halve sentiments before the first "but", boost those after it
+        is_but = word_id == self._but_id
+        but_pos = np.full(n_texts, -1, dtype=np.int64)
+        but_indexes = np.flatnonzero(is_but)
+        if but_indexes.size:
+            but_texts = text_of[but_indexes]
+            first_but = np.unique(but_texts, return_index=True)[1]
+            but_pos[but_texts[first_but]] = pos[but_indexes[first_but]]
+            token_but = but_pos[text_of]
+            has_but = token_but >= 0
+            sentiments = np.where(has_but & (pos < token_but), sentiments * 0.5, sentiments)
+            sentiments = np.where(has_but & (pos > token_but), sentiments * 1.5, sentiments)
+
+        sums = np.bincount(text_of, weights=sentiments, minlength=n_texts)
+        pos_sums = np.bincount(text_of, weights=np.where(sentiments > 0, sentiments + 1, 0.0), minlength=n_texts)
+        neg_sums = np.bincount(text_of, weights=np.where(sentiments < 0, sentiments - 1, 0.0), minlength=n_texts)
+        neu_counts = np.bincount(text_of, weights=sentiments == 0, minlength=n_texts)
+
+        results = []
+        for text, length, sum_s, pos_sum, neg_sum, neu_count in zip(
+                texts, lengths.tolist(), sums.tolist(), pos_sums.tolist(), neg_sums.tolist(), neu_counts.tolist()):
+            if not length:
+                results.append({"neg": 0.0, "neu": 0.0, "pos": 0.0, "compound": 0.0})
+                continue
+            amplifier = _punctuation_amplifier(text)
+            if sum_s > 0:
+                sum_s += amplifier
+            elif sum_s < 0:
+                sum_s -= amplifier
+            compound = sum_s / math.sqrt((sum_s * sum_s) + 15)
+            if pos_sum > math.fabs(neg_sum):
+                pos_sum += amplifier
+            elif pos_sum < math.fabs(neg_sum):
+                neg_sum -= amplifier
+            total = pos_sum + math.fabs(neg_sum) + neu_count
+            results.append({
+                "neg": round(math.fabs(neg_sum / total), 3),
+                "neu": round(math.fabs(neu_count / total), 3),
+                "pos": round(math.fabs(pos_sum / total), 3),
+                "compound": round(compound, 4),
+            })
+        return results
+
+    def _idioms_check(self, valence: float, words: List[str], i: int) -> float:
+        # nltk's SentimentIntensityAnalyzer._idioms_check, applied to one token
+        idioms = self.constants.SPECIAL_CASE_IDIOMS
+        onezero = f"{words[i - 1]} {words[i]}"
+        twoonezero = f"{words[i - 2]} {words[i - 1]} {words[i]}"
+        twoone = f"{words[i - 2]} {words[i - 1]}"
+        threetwoone = f"{words[i - 3]} {words[i - 2]} {words[i - 1]}"
+        threetwo = f"{words[i - 3]} {words[i - 2]}"
+        for sequence in (onezero, twoonezero, twoone, threetwoone, threetwo):
+            if sequence in idioms:
+                valence = idioms[sequence]
+                break
+        if len(words) - 1 > i:
+            zeroone = f"{words[i]} {words[i + 1]}"
+            if zeroone in idioms:
+                valence = idioms[zeroone]
+        if len(words) - 1 > i + 1:
+            zeroonetwo = f"{words[i]} {words[i + 1]} {words[i + 2]}"
+            if zeroonetwo in idioms:
+                valence = idioms[zeroonetwo]
+        if threetwo in self.constants.BOOSTER_DICT or twoone in self.constants.BOOSTER_DICT:
+            valence = valence + self.constants.B_DECR
+        return valence
+
+
+def _punctuation_amplifier(text: str) -> float:
+    # Emphasis from exclamation points (up to 4) and question marks (2 or more)
+    ep_amplifier = min(text.count("!"), 4) * 0.292
+    qm_count = text.count("?")
+    qm_amplifier = 0
+    if qm_count > 1:
+        qm_amplifier = qm_count * 0.18 if qm_count <= 3 else 0.96
+    return ep_amplifier + qm_amplifier
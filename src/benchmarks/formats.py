@@ -0,0 +1,89 @@
+"""
+Output format benchmark: encode/decode speed and size of the json, jsonl and binary formats.
+
+Synthetic tickets are processed once; the resulting records are then written and read
+back in every format, and the binary file's priority column is counted without decoding
+rows. The previous JSONL encoding (json.dumps with CustomJSONEncoder) is the baseline.
+
+Usage:
+    python -m src.benchmarks.formats [--tickets 20000] [--seed 0]
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+from src.agents.bulk_orchestration import CustomJSONEncoder
+from src.agents.output_formats import BinaryRecordReader, make_writer, read_records
+from src.benchmarks.synthetic import generate_tickets
+from src.processor import TicketProcessor
+
+
+async def make_records(count: int, seed: int) -> List[dict]:
+    tickets = generate_tickets(count, seed=seed)
+    results = await TicketProcessor(verbose=False).process_tickets(tickets)
+    return [{"ticket_id": index, "ticket_analysis": result["ticket_analysis"], "response": result["response"]}
+            for index, result in enumerate(results)]
+
+
+def _timed(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def run_suite(records: List[dict]) -> Dict[str, dict]:
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        def baseline():
+            with open(os.path.join(tmp, "baseline.jsonl"), "w") as output:
+                for record in records:
+                    record = dict(record, ticket_analysis=record["ticket_analysis"].to_dict())
+                    output.write(json.dumps(record, cls=CustomJSONEncoder))
+                    output.write("\n")
+
+        seconds = _timed(baseline)
+        report["jsonl_baseline"] = {
+            "write_records_per_sec": round(len(records) / seconds),
+            "bytes": os.path.getsize(os.path.join(tmp, "baseline.jsonl")),
+        }
+
+        for output_format in ("json", "jsonl", "binary"):
+            path = os.path.join(tmp, f"records.{output_format}")
+
+            def write():
+                with open(path, "wb" if output_format == "binary" else "w") as output:
+                    writer = make_writer(output, output_format)
+                    for record in records:
+                        writer.write(record)
+                    writer.finish()
+
+            write_seconds = _timed(write)
+            read_seconds = _timed(lambda: sum(1 for _ in read_records(path)))
+            report[output_format] = {
+                "write_records_per_sec": round(len(records) / write_seconds),
+                "read_records_per_sec": round(len(records) / read_seconds),
+                "bytes": os.path.getsize(path),
+            }
+
+        path = os.path.join(tmp, "records.binary")
+        with BinaryRecordReader(path) as reader:
+            seconds = _timed(lambda: reader.count_by("priority"))
+        report["binary"]["priority_scan_records_per_sec"] = round(len(records) / max(seconds, 1e-9))
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=20000, help="number of synthetic tickets")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic data seed")
+    args = parser.parse_args(argv)
+    records = asyncio.run(make_records(args.tickets, args.seed))
+    print(json.dumps(run_suite(records), indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Ticket history benchmark: ingest throughput and dashboard query latency of TicketHistory.
+
+A pool of synthetic tickets is processed once; its results are then inserted again and
+again, spread evenly over --days ending "now", until the history holds --rows records.
+Ingest throughput includes JSON encoding, index maintenance and the per-minute aggregate
+upserts. Each query is then timed --repeats times (p50/p95 in milliseconds), including
+the same per-category totals computed from raw rows rather than the aggregates.
+
+Usage:
+    python -m src.benchmarks.history [--rows 10000000] [--days 30] [--batch-size 5000] [--db history.db]
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import timedelta
+from typing import Dict, List
+
+from src.agents.ticket_analysis import Priority, TicketCategory
+from src.agents.ticket_history import TicketHistory
+from src.benchmarks.pipeline import percentile
+from src.benchmarks.synthetic import generate_tickets
+from src.processor import TicketProcessor
+
+END = 1_700_000_000.0
+
+
+async def make_pool(count: int, seed: int) -> List[dict]:
+    tickets = generate_tickets(count, seed=seed)
+    results = await TicketProcessor(verbose=False).process_tickets(tickets)
+    return [dict(result, customer_info=ticket["customer_info"]) for ticket, result in zip(tickets, results)]
+
+
+def ingest(history: TicketHistory, pool: List[dict], rows: int, days: float) -> Dict[str, float]:
+    step = days * 86400 / rows
+    start_time = END - days * 86400
+    start = time.perf_counter()
+    history.add_many(
+        dict(pool[index % len(pool)], ticket_id=index, processed_at=start_time + step * (index + 1))
+        for index in range(rows)
+    )
+    history.flush()
+    elapsed = time.perf_counter() - start
+    return {"rows": rows, "seconds": round(elapsed, 1), "rows_per_sec": round(rows / elapsed)}
+
+
+def time_queries(history: TicketHistory, repeats: int) -> Dict[str, dict]:
+    hour, day = timedelta(hours=1), timedelta(days=1)
+    queries = {
+        "urgent_access_last_hour_negative": lambda: history.query(
+            category=TicketCategory.ACCESS, priority=Priority.URGENT, since=hour, sentiment_below=-0.5),
+        "count_urgent_last_hour": lambda: history.count(priority=Priority.URGENT, since=hour),
+        "latest_100_for_role": lambda: history.query(role="Finance Director", limit=100),
+        "minute_series_last_day": lambda: history.minute_stats(since=day),
+        "count_by_category_last_day": lambda: history.count_by("category", since=day),
+        "count_by_category_last_day_raw_rows": lambda: history._db.execute(
+            "SELECT category, COUNT(*) FROM tickets WHERE processed_at >= ? GROUP BY category",
+            (END - 86400,)).fetchall(),
+    }
+    report = {}
+    for name, query in queries.items():
+        timings, size = [], 0
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = query()
+            timings.append((time.perf_counter() - start) * 1000)
+            size = result if isinstance(result, int) else len(result)
+        timings.sort()
+        report[name] = {"p50_ms": round(percentile(timings, 0.5), 3), "p95_ms": round(percentile(timings, 0.95), 3),
+                        "result_size": size}
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000, help="records to ingest")
+    parser.add_argument("--days", type=float, default=30, help="time span the records are spread over")
+    parser.add_argument("--batch-size", type=int, default=5000, help="records per insert transaction")
+    parser.add_argument("--pool", type=int, default=2000, help="distinct synthetic tickets processed")
+    parser.add_argument("--repeats", type=int, default=20, help="runs per query")
+    parser.add_argument("--db", help="database file to create (a temporary file by default)")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic data seed")
+    args = parser.parse_args(argv)
+
+    pool = asyncio.run(make_pool(args.pool, args.seed))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.db or os.path.join(tmp, "history.db")
+        with TicketHistory(path, batch_size=args.batch_size, clock=lambda: END) as history:
+            report = {"ingest": ingest(history, pool, args.rows, args.days)}
+            report["ingest"]["db_mib"] = round(os.path.getsize(path) / 2 ** 20)
+            report["queries"] = time_queries(history, args.repeats)
+    print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Local load generator for the HTTP ingestion service (src/service.py).
+
+Opens keep-alive connections and sends POST /tickets requests with synthetic
+tickets, reporting throughput, latency percentiles and 503 rejections. Without
+--port it starts the service in-process once per --windows-ms value, so the
+latency/throughput tradeoff of the batching window is measured end to end with
+no external services.
+
+Usage:
+    python -m src.benchmarks.loadgen [--requests 2000] [--connections 32] [--windows-ms 0 2 5 10]
+    python -m src.benchmarks.loadgen --port 8080   # against a running python -m src.service
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List, Tuple
+
+from src.benchmarks.pipeline import percentile
+from src.benchmarks.synthetic import generate_tickets
+
+
+async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str,
+                   body: bytes) -> Tuple[int, bytes]:
+    writer.write(
+        f"POST /tickets HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+    status = int(head.split(" ", 2)[1])
+    length = 0
+    for line in head.split("\r\n")[1:]:
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def run_load(host: str, port: int, requests: int, connections: int, seed: int = 0) -> Dict[str, float]:
+    """
+    Sends requests POST /tickets calls over the given number of keep-alive connections.
+
+    Returns:
+        Dict[str, float]: Throughput, latency percentiles (ms) and status counts.
+    """
+    bodies = [json.dumps(ticket).encode("utf-8") for ticket in generate_tickets(requests, seed=seed)]
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    next_index = 0
+
+    async def client():
+        nonlocal next_index
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while next_index < len(bodies):
+                body = bodies[next_index]
+                next_index += 1
+                began = time.perf_counter()
+                status, _ = await _request(reader, writer, host, body)
+                latencies.append(time.perf_counter() - began)
+                statuses[status] = statuses.get(status, 0) + 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "requests_per_sec": round(len(ordered) / elapsed, 1),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+async def sweep_windows(windows_ms: List[float], requests: int, connections: int, max_batch_size: int,
+                        max_queue: int) -> Dict[str, dict]:
+    """
+    Starts the service in-process for each batching window and measures it.
+    """
+    from src.service import TicketService
+
+    results = {}
+    for window in windows_ms:
+        service = TicketService(port=0, max_batch_size=max_batch_size, max_wait=window / 1000, max_queue=max_queue)
+        await service.start()
+        try:
+            await run_load(service.host, service.port, min(requests, 50), connections)  # warm up
+            report = await run_load(service.host, service.port, requests, connections)
+            report["mean_batch_size"] = round(service.batcher.tickets / max(1, service.batcher.batches), 2)
+            results[f"{window}ms"] = report
+        finally:
+            await service.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="service host")
+    parser.add_argument("--port", type=int, help="port of a running service (default: start one per window)")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per run")
+    parser.add_argument("--connections", type=int, default=32, help="concurrent keep-alive connections")
+    parser.add_argument("--windows-ms", type=float, nargs="+", default=[0, 2, 5, 10], help="batching windows")
+    parser.add_argument("--max-batch-size", type=int, default=64, help="tickets per micro-batch")
+    parser.add_argument("--max-queue", type=int, default=1024, help="service queue bound")
+    args = parser.parse_args(argv)
+
+    if args.port:
+        report = asyncio.run(run_load(args.host, args.port, args.requests, args.connections))
+    else:
+        report = asyncio.run(sweep_windows(args.windows_ms, args.requests, args.connections,
+                                           args.max_batch_size, args.max_queue))
+    print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Long-ticket benchmark: latency and peak memory of analyze_ticket by ticket size.
+
+Each ticket is a short e-mail with a pasted log of the given size, a signature and a
+quoted reply thread. It is analyzed with long_content=LongContentPolicy() and, up to
+--full-max-bytes, with the default long_content=None (the whole text). Peak memory is
+measured with tracemalloc and excludes the ticket text itself.
+
+Usage:
+    python -m src.benchmarks.long_content [--sizes 20000 200000 1000000 5000000]
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from typing import Dict
+
+from src.agents.long_content import LongContentPolicy
+from src.agents.ticket_analysis import TicketAnalysisAgent
+
+OPENING = ("Hi team,\nOur nightly export is failing again and the dashboard shows error 500.\n"
+           "Please confirm once fixed. Log below:\n")
+CLOSING = ("\n-- \nAlice Smith | Acme Corp\n\nOn Mon, May 6, 2024 at 9:12 AM Support <support@example.com> wrote:\n"
+           + "> Thanks for reaching out, we are looking into it.\n" * 50)
+
+
+def make_ticket(size: int) -> str:
+    line = "2024-05-06T02:{minute:02d}:00 ERROR export-worker-{worker} batch {batch} failed: timeout\n"
+    lines, length, batch = [], 0, 0
+    while length < size:
+        text = line.format(minute=batch % 60, worker=batch % 8, batch=batch)
+        lines.append(text)
+        length += len(text)
+        batch += 1
+    return OPENING + "".join(lines) + CLOSING
+
+
+def measure(agent: TicketAnalysisAgent, ticket: str) -> Dict[str, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    asyncio.run(agent.analyze_ticket(ticket))
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"latency_ms": round(elapsed * 1000, 1), "peak_kib": peak // 1024}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20000, 200000, 1000000, 5000000],
+                        help="log sizes in characters")
+    parser.add_argument("--full-max-bytes", type=int, default=1000000,
+                        help="largest size also analyzed without the long-content mode")
+    args = parser.parse_args(argv)
+
+    bounded, full = TicketAnalysisAgent(long_content=LongContentPolicy()), TicketAnalysisAgent()
+    for agent in (bounded, full):
+        asyncio.run(agent.analyze_ticket("warm up the lexicon"))
+    report = {}
+    for size in args.sizes:
+        ticket = make_ticket(size)
+        report[str(size)] = {"long_content": measure(bounded, ticket)}
+        if size <= args.full_max_bytes:
+            report[str(size)]["full_text"] = measure(full, ticket)
+    print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Near-duplicate index benchmark on synthetic incident storms.
+
+For each similarity threshold, a storm of tickets (see generate_incident_storm) is
+added to a fresh NearDuplicateIndex and the cluster assignments are scored against
+the known incidents:
+
+- precision: share of joins involving an incident ticket (as the joining ticket or
+  the cluster's first) where both tickets are about the same incident. Unrelated
+  tickets joining each other are not scored: the generator builds them from a
+  small pool of sentences, so many of them are genuine near-duplicates;
+- recall: share of incident tickets (other than each incident's first) that
+  joined a cluster started by a ticket about the same incident.
+
+Throughput is measured as index.add() calls per second, with p99 latency.
+
+Usage:
+    python -m src.benchmarks.near_duplicates [--tickets 20000] [--thresholds 0.4 0.5 0.6 0.7 0.8]
+"""
+import argparse
+import json
+import time
+from typing import Dict, List
+
+from src.agents.near_duplicates import NearDuplicateIndex
+from src.benchmarks.pipeline import percentile
+from src.benchmarks.synthetic import generate_incident_storm
+
+
+def evaluate(tickets: List[dict], threshold: float, num_perm: int) -> Dict[str, float]:
+    """
+    Adds the tickets to a fresh index and reports precision, recall and add() latency.
+    """
+    index = NearDuplicateIndex(threshold=threshold, num_perm=num_perm)
+    founders: Dict[int, object] = {}
+    latencies = []
+    joined = correct = 0
+    seen_incidents = set()
+    expected = 0
+    for ticket in tickets:
+        start = time.perf_counter()
+        cluster, duplicate = index.add(ticket["content"])
+        latencies.append(time.perf_counter() - start)
+        incident = ticket["incident"]
+        if incident is not None:
+            expected += incident in seen_incidents
+            seen_incidents.add(incident)
+        if not duplicate:
+            founders[cluster.cluster_id] = incident
+            continue
+        founder = founders[cluster.cluster_id]
+        if incident is None and founder is None:
+            continue
+        joined += 1
+        correct += founder == incident
+    latencies.sort()
+    return {
+        "bands": index.bands,
+        "precision": round(correct / joined, 4) if joined else 1.0,
+        "recall": round(correct / expected, 4) if expected else 1.0,
+        "clusters": len(index),
+        "largest_cluster": index.stats()["largest_cluster"],
+        "adds_per_sec": round(len(tickets) / sum(latencies)),
+        "add_p99_us": round(percentile(latencies, 0.99) * 1e6, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=20000, help="tickets in the storm")
+    parser.add_argument("--incidents", type=int, default=5, help="simultaneous incidents")
+    parser.add_argument("--incident-rate", type=float, default=0.8, help="share of tickets about an incident")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.4, 0.5, 0.6, 0.7, 0.8])
+    parser.add_argument("--num-perm", type=int, default=64, help="MinHash signature length")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic data seed")
+    args = parser.parse_args(argv)
+    tickets = generate_incident_storm(args.tickets, args.incidents, args.incident_rate, seed=args.seed)
+    report = {str(threshold): evaluate(tickets, threshold, args.num_perm) for threshold in args.thresholds}
+    print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
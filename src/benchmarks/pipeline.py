@@ -0,0 +1,181 @@
+"""
+Throughput and latency benchmark suite for the ticket pipeline.
+
+Runs each stage over seeded synthetic tickets at several scales and reports
+tickets/sec, p50/p95/p99 latency and peak RSS. Results can be written as JSON and
+compared with an earlier run to catch regressions. Everything runs offline on the
+cached VADER lexicon.
+
+Usage:
+    python -m src.benchmarks.pipeline [--scales 100 1000] [--output run.json]
+                                      [--compare baseline.json --threshold 0.15]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import resource
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from src.agents.bulk_orchestration import process_bulk_tickets
+from src.agents.orchestrator import Orchestrator
+from src.agents.response_generation import ResponseAgent
+from src.agents.template_registry import TemplateRegistry
+from src.agents.ticket_analysis import TicketAnalysisAgent
+from src.benchmarks.synthetic import generate_tickets
+from src.processor import TicketProcessor
+
+# Metrics where a larger value is better; every other numeric metric is better when smaller
+HIGHER_IS_BETTER = {"tickets_per_sec"}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Returns the nearest-rank percentile of already sorted values.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def peak_rss_mb() -> float:
+    """
+    Returns the peak resident set size of this process so far, in MiB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(latencies: List[float], total_seconds: float, count: int) -> Dict[str, float]:
+    """
+    Builds the report entry of one stage and scale.
+    """
+    ordered = sorted(latencies)
+    return {
+        "tickets": count,
+        "tickets_per_sec": round(count / total_seconds, 1) if total_seconds else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 4),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 4),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 4),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+async def time_each(items: List, call: Callable[[object], Awaitable]) -> Dict[str, float]:
+    """
+    Awaits call(item) for every item, timing each call.
+    """
+    latencies = []
+    start = time.perf_counter()
+    for item in items:
+        began = time.perf_counter()
+        await call(item)
+        latencies.append(time.perf_counter() - began)
+    return summarize(latencies, time.perf_counter() - start, len(items))
+
+
+async def run_suite(scales: List[int], seed: int, duplicate_rate: float) -> Dict[str, Dict[str, dict]]:
+    """
+    Runs every benchmarked stage at every scale.
+
+    Returns:
+        Dict[str, Dict[str, dict]]: stage -> scale -> metrics.
+    """
+    analysis_agent = TicketAnalysisAgent()
+    response_agent = ResponseAgent()
+    templates = TemplateRegistry("data/response_templates.json")
+    processor = TicketProcessor(verbose=False)
+    orchestrator = Orchestrator()
+    with open("data/response_templates.json", "r") as file:
+        raw_templates = json.load(file)
+
+    # Warm up lazy loading (lexicon, compiled rules) outside the measurements
+    await processor.process_ticket({"content": "warm up", "customer_info": {}})
+    await orchestrator.process_ticket("warm up", {}, raw_templates)
+
+    results: Dict[str, Dict[str, dict]] = {}
+    for scale in scales:
+        tickets = generate_tickets(scale, seed=seed, duplicate_rate=duplicate_rate)
+        contents = [ticket["content"] for ticket in tickets]
+        analyses = [await analysis_agent.analyze_ticket(content) for content in contents]
+        key = str(scale)
+
+        results.setdefault("analyze_ticket", {})[key] = await time_each(
+            tickets, lambda ticket: analysis_agent.analyze_ticket(ticket["content"], ticket["customer_info"]))
+        results.setdefault("generate_response", {})[key] = await time_each(
+            list(zip(analyses, tickets)),
+            lambda pair: response_agent.generate_response(pair[0], templates, pair[1]["customer_info"]))
+        results.setdefault("TicketProcessor.process_ticket", {})[key] = await time_each(
+            tickets, processor.process_ticket)
+        results.setdefault("Orchestrator.process_ticket", {})[key] = await time_each(
+            contents, lambda content: orchestrator.process_ticket(content, {}, raw_templates))
+
+        start = time.perf_counter()
+        await process_bulk_tickets(contents, {"role": "Admin"}, raw_templates)
+        elapsed = time.perf_counter() - start
+        results.setdefault("process_bulk_tickets", {})[key] = summarize([elapsed], elapsed, scale)
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """
+    Lists metrics that regressed by more than threshold (a fraction) against the baseline.
+    """
+    regressions = []
+    for stage, scales in current["results"].items():
+        for scale, metrics in scales.items():
+            before = baseline.get("results", {}).get(stage, {}).get(scale)
+            if not before:
+                continue
+            for metric in ("tickets_per_sec", "p50_ms", "p95_ms", "p99_ms"):
+                old, new = before.get(metric), metrics.get(metric)
+                if not old or new is None:
+                    continue
+                change = (old - new) / old if metric in HIGHER_IS_BETTER else (new - old) / old
+                if change > threshold:
+                    regressions.append(f"{stage} @ {scale}: {metric} {old} -> {new} ({change:+.0%} worse)")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[100, 1000], help="tickets per run")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic ticket seed")
+    parser.add_argument("--duplicate-rate", type=float, default=0.2, help="share of duplicate tickets")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed regression (fraction)")
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "duplicate_rate": args.duplicate_rate,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": asyncio.run(run_suite(args.scales, args.seed, args.duplicate_rate)),
+    }
+    text = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text)
+    print(text)
+
+    if args.compare:
+        with open(args.compare, "r") as file:
+            baseline = json.load(file)
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Queue-wait benchmark of the PriorityScheduler under a flood of LOW tickets.
+
+A burst of LOW tickets with a few URGENT ones mixed in is processed twice: first in
+plain FIFO order, then through the PriorityScheduler. URGENT queue-wait should grow
+with the flood size under FIFO and stay flat with the scheduler.
+
+Usage:
+    python -m src.benchmarks.scheduler [--floods 1000 5000] [--urgent-every 100]
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+from src.agents.scheduler import PriorityScheduler
+from src.benchmarks.pipeline import percentile
+from src.processor import TicketProcessor
+
+LOW_TICKET = "The reports page loads slowly since yesterday. Thanks for looking into it."
+URGENT_TICKET = "Payroll export is down and this is urgent!"
+
+
+def flood(size: int, urgent_every: int) -> List[dict]:
+    """
+    Builds a burst of LOW tickets with an URGENT ticket every urgent_every tickets.
+    """
+    return [
+        {"content": URGENT_TICKET if index % urgent_every == urgent_every - 1 else f"{LOW_TICKET} #{index}",
+         "customer_info": {"customer_name": "Bench", "role": "User"}}
+        for index in range(size)
+    ]
+
+
+def _report(waits: Dict[str, List[float]]) -> Dict[str, dict]:
+    report = {}
+    for name, values in waits.items():
+        ordered = sorted(values)
+        report[name] = {
+            "tickets": len(ordered),
+            "wait_p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+            "wait_p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+        }
+    return report
+
+
+async def run_fifo(processor: TicketProcessor, tickets: List[dict], concurrency: int) -> Dict[str, dict]:
+    """
+    Processes the tickets in arrival order with a plain queue and reports queue-wait per priority.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    submitted = time.monotonic()
+    for ticket in tickets:
+        queue.put_nowait(ticket)
+    waits: Dict[str, List[float]] = {}
+
+    async def work():
+        while not queue.empty():
+            ticket = queue.get_nowait()
+            wait = time.monotonic() - submitted
+            result = await processor.process_ticket(ticket)
+            waits.setdefault(result["ticket_analysis"].priority.name, []).append(wait)
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(work() for _ in range(concurrency)))
+    return _report(waits)
+
+
+async def run_scheduled(processor: TicketProcessor, tickets: List[dict], concurrency: int) -> Dict[str, dict]:
+    """
+    Processes the tickets through the PriorityScheduler and reports queue-wait per priority.
+    """
+    async with PriorityScheduler(processor, max_concurrency=concurrency) as scheduler:
+        results = await scheduler.run(tickets)
+    waits: Dict[str, List[float]] = {}
+    for result in results:
+        scheduling = result["scheduling"]
+        waits.setdefault(scheduling["estimated_priority"], []).append(scheduling["queue_wait_seconds"])
+    return _report(waits)
+
+
+async def run_suite(floods: List[int], urgent_every: int, concurrency: int) -> Dict[str, dict]:
+    processor = TicketProcessor(verbose=False)
+    await processor.process_ticket(flood(1, 1)[0])  # warm up lazy loading
+    results = {}
+    for size in floods:
+        tickets = flood(size, urgent_every)
+        results[str(size)] = {
+            "fifo": await run_fifo(processor, tickets, concurrency),
+            "scheduled": await run_scheduled(processor, tickets, concurrency),
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--floods", type=int, nargs="+", default=[1000, 5000], help="tickets per burst")
+    parser.add_argument("--urgent-every", type=int, default=100, help="one URGENT ticket per this many")
+    parser.add_argument("--concurrency", type=int, default=8, help="worker tasks")
+    args = parser.parse_args(argv)
+    print(json.dumps(asyncio.run(run_suite(args.floods, args.urgent_every, args.concurrency)), indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Sentiment throughput benchmark: nltk's SentimentIntensityAnalyzer vs the NumPy backend.
+
+Scores the same synthetic ticket texts with both backends at several batch sizes
+and reports texts/sec. Runs offline on the cached VADER lexicon.
+
+Usage:
+    python -m src.benchmarks.sentiment [--sizes 1 100 10000] [--seed 0]
+"""
+import argparse
+import json
+import random
+import time
+
+from src.agents.vader_lexicon import get_analyzer
+
+PHRASES = [
+    "I can't log in to my account", "the invoice is wrong again", "this is absolutely terrible",
+    "please fix this ASAP", "thanks for the quick help", "the dashboard is not loading",
+    "payroll is blocked and we are very worried", "it works but it is really slow",
+    "Great product, but the export feature is missing", "I am NOT happy with the support",
+]
+
+
+def make_texts(count, rng):
+    return [". ".join(rng.choice(PHRASES) for _ in range(rng.randint(1, 5))) + rng.choice([".", "!", "!!", "?"])
+            for _ in range(count)]
+
+
+def throughput(score, texts, min_seconds=1.0):
+    """
+    Repeats score(texts) for at least min_seconds and returns texts/sec.
+    """
+    score(texts)  # warm-up
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        score(texts)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return runs * len(texts) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10000], help="batch sizes")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic texts")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    nltk_analyzer = get_analyzer("nltk")
+    numpy_analyzer = get_analyzer("numpy")
+    results = []
+    for size in args.sizes:
+        texts = make_texts(size, rng)
+        nltk_rate = throughput(lambda batch: [nltk_analyzer.polarity_scores(text) for text in batch], texts)
+        numpy_rate = throughput(numpy_analyzer.polarity_scores_batch, texts)
+        results.append({
+            "batch_size": size,
+            "nltk_texts_per_sec": round(nltk_rate),
+            "numpy_texts_per_sec": round(numpy_rate),
+            "speedup": round(numpy_rate / nltk_rate, 2),
+        })
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Sharded analysis benchmark: batch throughput by number of worker processes.
+
+Synthetic tickets are analyzed once in-process with TicketAnalysisAgent.analyze_batch
+(the baseline) and then with ShardedAnalyzer for each worker count, giving the scaling
+curve. Worker start-up is timed separately and excluded from throughput. The speed-up
+is bounded by the number of cores (reported as cpu_count).
+
+Usage:
+    python -m src.benchmarks.sharded [--tickets 20000] [--workers 1 2 4 8] [--chunk-size 128]
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+from src.agents.sharded import ShardedAnalyzer
+from src.agents.ticket_analysis import TicketAnalysisAgent
+from src.benchmarks.synthetic import generate_tickets
+
+
+async def measure_local(agent: TicketAnalysisAgent, contents: List[str]) -> float:
+    start = time.perf_counter()
+    await agent.analyze_batch((content, None) for content in contents)
+    return time.perf_counter() - start
+
+
+async def measure_sharded(agent: TicketAnalysisAgent, contents: List[str], workers: int,
+                          chunk_size: int, start_method: Optional[str]) -> Dict[str, float]:
+    start = time.perf_counter()
+    analyzer = ShardedAnalyzer(agent, workers=workers, chunk_size=chunk_size, start_method=start_method)
+    startup = time.perf_counter() - start
+    try:
+        start = time.perf_counter()
+        await analyzer.analyze_batch((content, None) for content in contents)
+        elapsed = time.perf_counter() - start
+    finally:
+        analyzer.close()
+    return {"startup_ms": round(startup * 1000, 1), "seconds": elapsed}
+
+
+async def run_suite(contents: List[str], worker_counts: List[int], chunk_size: int, start_method: Optional[str]) -> dict:
+    agent = TicketAnalysisAgent()
+    await agent.analyze_ticket("warm up the lexicon")
+    local = await measure_local(agent, contents)
+    report = {
+        "cpu_count": os.cpu_count(),
+        "tickets": len(contents),
+        "local": {"tickets_per_sec": round(len(contents) / local)},
+    }
+    for workers in worker_counts:
+        result = await measure_sharded(agent, contents, workers, chunk_size, start_method)
+        report[f"workers_{workers}"] = {
+            "startup_ms": result["startup_ms"],
+            "tickets_per_sec": round(len(contents) / result["seconds"]),
+            "speedup": round(local / result["seconds"], 2),
+        }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=20000, help="number of synthetic tickets")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="worker counts to measure")
+    parser.add_argument("--chunk-size", type=int, default=128, help="tickets per worker task")
+    parser.add_argument("--start-method", choices=["fork", "spawn"], help="process start method")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic data seed")
+    args = parser.parse_args(argv)
+    contents = [ticket["content"] for ticket in generate_tickets(args.tickets, seed=args.seed)]
+    report = asyncio.run(run_suite(contents, args.workers, args.chunk_size, args.start_method))
+    print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Cold-start benchmark: import of the agents plus the first ticket analysis.
+
+Each measurement runs in a fresh interpreter. "before" replays the original startup
+path (nltk.download at import, one SentimentIntensityAnalyzer parsing the lexicon
+file per agent); "after" imports the agents and analyzes one ticket through the
+lazy, cached lexicon.
+
+Usage:
+    python -m src.benchmarks.startup [--repeat 5]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+TICKET = "I can't access my dashboard. I keep getting a 403 error. This is urgent!"
+
+BEFORE = f"""
+import time
+start = time.perf_counter()
+import nltk
+nltk.download('vader_lexicon', quiet=True)
+from nltk.sentiment import SentimentIntensityAnalyzer
+imported = time.perf_counter()
+agent_sia = SentimentIntensityAnalyzer()
+orchestrator_sia = SentimentIntensityAnalyzer()
+agent_sia.polarity_scores({TICKET!r})
+print(imported - start, time.perf_counter() - start)
+"""
+
+AFTER = f"""
+import asyncio, time
+start = time.perf_counter()
+from src.agents.ticket_analysis import TicketAnalysisAgent
+from src.agents.orchestrator import Orchestrator
+imported = time.perf_counter()
+agent = TicketAnalysisAgent()
+orchestrator = Orchestrator()
+asyncio.run(agent.analyze_ticket({TICKET!r}, {{}}))
+print(imported - start, time.perf_counter() - start)
+"""
+
+
+def measure(code, repeat):
+    """
+    Runs the snippet in fresh interpreters and returns the median (import, first analysis) seconds.
+    """
+    imports, totals = [], []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        imported, total = map(float, output.split())
+        imports.append(imported)
+        totals.append(total)
+    return {"import_s": statistics.median(imports), "import_plus_first_analysis_s": statistics.median(totals)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per variant")
+    args = parser.parse_args()
+
+    # Warm the lexicon cache so "after" measures the steady-state cold start of a worker
+    subprocess.run([sys.executable, "-m", "src.agents.vader_lexicon"], capture_output=True, check=True)
+
+    results = {"before": measure(BEFORE, args.repeat), "after": measure(AFTER, args.repeat)}
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
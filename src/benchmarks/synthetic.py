@@ -0,0 +1,137 @@
+"""
+Seeded synthetic ticket generator for benchmarks.
+
+Produces tickets in the data/sample_tickets.json format with a realistic category
+mix, a spread of text lengths, occasional urgency/follow-up words and a configurable
+share of exact duplicates (auto-generated alerts, retries, copy-pasted reports).
+"""
+import random
+from typing import Dict, List
+
+# Category mix observed in a typical support queue (weights sum to 1)
+CATEGORY_MIX = {"technical": 0.45, "access": 0.25, "billing": 0.2, "feature": 0.1}
+
+OPENERS = {
+    "technical": ["The website keeps crashing when I open reports.", "The export job fails with error 500.",
+                  "Our integration stopped syncing overnight.", "The mobile app freezes on startup."],
+    "access": ["I can't login to my account.", "I keep getting a 403 error on the dashboard.",
+               "Our admin lost access to the billing page.", "Password reset emails never arrive, no access."],
+    "billing": ["My last invoice is wrong.", "The payment failed but I was charged.",
+                "Can you explain the billing cycle?", "We were billed twice this month, billing error."],
+    "feature": ["Feature request: please add dark mode.", "We would love an enhancement to the export.",
+                "Feature request: bulk edit for tickets.", "An enhancement for SSO would help us."],
+}
+
+FILLER = [
+    "This started yesterday afternoon.", "We tried clearing the cache already.", "Several users are affected.",
+    "It is really frustrating.", "Thanks for your help.", "Nothing changed on our side.",
+    "The issue happens on every browser.", "We are on the enterprise plan.", "This is quite annoying.",
+    "Everything worked fine last week.", "I attached the logs to this ticket.", "Our team is blocked.",
+]
+
+URGENCY = ["This is urgent!", "Please fix ASAP.", "It is critical for us.", "Important: payroll runs today.",
+           "We need this immediately."]
+FOLLOW_UP = ["Please confirm once fixed.", "Can you verify the account settings?", "Could you clarify the next steps?"]
+
+NAMES = ["Alice", "Bob", "Carla", "Dev", "Emma", "Farid", "Grace", "Hiro", "Ines", "John"]
+ROLES = ["User", "Admin", "Billing Admin", "Finance Director", "IT Manager"]
+
+
+def generate_tickets(count: int, seed: int = 0, duplicate_rate: float = 0.2,
+                     urgency_rate: float = 0.15, follow_up_rate: float = 0.1,
+                     max_sentences: int = 12) -> List[Dict]:
+    """
+    Generates a reproducible list of synthetic tickets.
+
+    Args:
+        count (int): Number of tickets.
+        seed (int): Random seed; the same seed always yields the same tickets.
+        duplicate_rate (float): Probability that a ticket repeats an earlier ticket's content.
+        urgency_rate (float): Probability that a ticket contains an urgency phrase.
+        follow_up_rate (float): Probability that a ticket asks for a follow-up.
+        max_sentences (int): Upper bound of filler sentences (lengths are skewed short).
+
+    Returns:
+        List[Dict]: Tickets with "ticket_id", "content" and "customer_info".
+    """
+    rng = random.Random(seed)
+    categories = list(CATEGORY_MIX)
+    weights = list(CATEGORY_MIX.values())
+    tickets: List[Dict] = []
+    for index in range(count):
+        customer_info = {"customer_name": rng.choice(NAMES), "role": rng.choice(ROLES)}
+        if tickets and rng.random() < duplicate_rate:
+            content = rng.choice(tickets)["content"]
+        else:
+            content = _ticket_text(rng, rng.choices(categories, weights)[0], urgency_rate, follow_up_rate,
+                                   max_sentences)
+        tickets.append({"ticket_id": f"SYN-{seed}-{index}", "content": content, "customer_info": customer_info})
+    return tickets
+
+
+def _ticket_text(rng: random.Random, category: str, urgency_rate: float, follow_up_rate: float,
+                 max_sentences: int) -> str:
+    # Geometric-like length distribution: most tickets are short, a few are long
+    sentences = [rng.choice(OPENERS[category])]
+    length = min(int(rng.expovariate(1 / 2.5)), max_sentences)
+    sentences.extend(rng.choice(FILLER) for _ in range(length))
+    if rng.random() < urgency_rate:
+        sentences.insert(rng.randint(1, len(sentences)), rng.choice(URGENCY))
+    if rng.random() < follow_up_rate:
+        sentences.append(rng.choice(FOLLOW_UP))
+    separator = "\n" if rng.random() < 0.3 else " "
+    return separator.join(sentences)
+
+
+
+SERVICES = ["payments-api", "sso-gateway", "report-export", "mobile-sync", "billing-worker", "search-index",
+            "webhook-relay", "file-upload"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Tyrell"]
+
+
+def generate_incident_storm(count: int, incidents: int = 5, incident_rate: float = 0.8,
+                            seed: int = 0) -> List[Dict]:
+    """
+    Generates a reproducible burst of tickets during several simultaneous incidents.
+
+    Tickets about the same incident share their wording but differ in the reporter's
+    name, company, timestamps, error codes and ticket references, and some add a
+    filler sentence. The rest are ordinary tickets (see generate_tickets).
+
+    Args:
+        count (int): Number of tickets.
+        incidents (int): Number of distinct incidents.
+        incident_rate (float): Share of tickets that report one of the incidents.
+        seed (int): Random seed.
+
+    Returns:
+        List[Dict]: Tickets with "ticket_id", "content", "customer_info" and "incident"
+        (the incident number, or None for an unrelated ticket).
+    """
+    rng = random.Random(seed)
+    templates = []
+    for _ in range(incidents):
+        category = rng.choice(list(OPENERS))
+        templates.append((rng.choice(OPENERS[category]), rng.choice(SERVICES), rng.sample(FILLER, 2)))
+    tickets: List[Dict] = []
+    for index in range(count):
+        customer_info = {"customer_name": rng.choice(NAMES), "role": rng.choice(ROLES)}
+        incident = rng.randrange(incidents) if rng.random() < incident_rate else None
+        if incident is None:
+            content = _ticket_text(rng, rng.choice(list(OPENERS)), 0.15, 0.1, 12)
+        else:
+            opener, service, fillers = templates[incident]
+            sentences = [
+                f"Hi, this is {customer_info['customer_name']} from {rng.choice(COMPANIES)}.",
+                opener,
+                f"Since {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d} UTC {service} returns error "
+                f"{rng.choice([500, 502, 503, 504])} (request id {rng.getrandbits(48):012x}).",
+                *fillers,
+                f"Reference: ticket #{rng.randint(10000, 99999)}.",
+            ]
+            if rng.random() < 0.3:
+                sentences.insert(rng.randint(2, len(sentences)), rng.choice(FILLER))
+            content = " ".join(sentences)
+        tickets.append({"ticket_id": f"STORM-{seed}-{index}", "content": content,
+                        "customer_info": customer_info, "incident": incident})
+    return tickets
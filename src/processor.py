@@ -1,7 +1,8 @@
 import asyncio
-import json
 from src.agents.ticket_analysis import TicketAnalysisAgent
 from src.agents.response_generation import ResponseAgent
+from src.agents.template_registry import TemplateRegistry
+from src.agents.analysis_cache import CachingAnalysisAgent
 
 class TicketProcessor:
     """
@@ -11,39 +12,197 @@ class TicketProcessor:
     to generate an appropriate response based on the analysis.
     """
 
-    def __init__(self):
+    def __init__(self, templates_path="data/response_templates.json", verbose=True, analysis_cache=None, metrics=None,
+                 near_duplicates=None, workers=None, history=None, long_content=None):
         """
-        Initializes the TicketProcessor with instances of TicketAnalysisAgent and ResponseAgent.
+        Initializes the TicketProcessor with instances of TicketAnalysisAgent and ResponseAgent,
+        and loads the response templates once into a TemplateRegistry.
+
+        Args:
+            templates_path (str): Path to the response templates JSON file.
+            verbose (bool): Whether to print each analysis and response.
+            analysis_cache (AnalysisCache): Optional cache of analyses for repeated tickets.
+            metrics (Instrumentation): Optional metrics sink for per-stage latencies, counters and
+                cache gauges (disabled by default). Analyses requested with a field mask through
+                analysis_agent are not timed or counted.
+            near_duplicates (NearDuplicateIndex): Optional index grouping near-identical tickets;
+                tickets matching a recent cluster reuse its sentiment score and results gain
+                an "incident" entry with the cluster id and size.
+            workers (int): Analyze batches in this many worker processes (see ShardedAnalyzer);
+                per-step analysis metrics are then not recorded. Call close() when done.
+            history (TicketHistory): Optional store every processed ticket is appended to
+                (with its ticket_id and customer role) for dashboard queries.
+            long_content (LongContentPolicy): Optional limits for very long tickets (see
+                TicketAnalysisAgent); by default every ticket is analyzed in full.
         """
-        self.analysis_agent = TicketAnalysisAgent()
+        if workers and workers > 1:
+            from src.agents.sharded import ShardedAnalyzer
+
+            self.analysis_agent = ShardedAnalyzer(TicketAnalysisAgent(long_content=long_content), workers=workers)
+        else:
+            self.analysis_agent = TicketAnalysisAgent(metrics=metrics, long_content=long_content)
+        self.sharded = workers is not None and workers > 1
+        if analysis_cache is not None:
+            self.analysis_agent = CachingAnalysisAgent(self.analysis_agent, analysis_cache)
         self.response_agent = ResponseAgent()
+        self.templates = TemplateRegistry(templates_path)
+        self.verbose = verbose
+        self.metrics = metrics
+        self.near_duplicates = near_duplicates
+        self.history = history
+        if metrics is not None:
+            self._register_gauges(metrics, analysis_cache)
 
-    async def process_ticket(self, ticket):
+    async def process_ticket(self, ticket, index_duplicates=True):
         """
         Processes a single support ticket by analyzing its content and generating a response.
 
         Steps:
             1. Analyze the ticket using the TicketAnalysisAgent.
-            2. Load response templates from the JSON file.
+            2. Get the response templates from the TemplateRegistry.
             3. Generate a response using the ResponseAgent.
-            4. Print the analysis results and the generated response.
+            4. Print the analysis results and the generated response (if verbose).
 
         Args:
             ticket (dict): A dictionary containing:
                 - "content": The text of the support ticket.
                 - "customer_info": A dictionary with customer information (e.g., customer_name, role).
+            index_duplicates (bool): Add the ticket to the near-duplicate index (False when retrying
+                a ticket that was already added, so it is not counted twice).
+
+        Returns:
+            dict: {"ticket_analysis": TicketAnalysis, "response": dict}, plus "incident" with near_duplicates.
         """
-        # Step 1: Analyze the ticket
-        analysis = await self.analysis_agent.analyze_ticket(ticket["content"], ticket["customer_info"])
+        timer = self.metrics.timer() if self.metrics is not None else None
+
+        # Step 1: Analyze the ticket (or reuse the analysis of its near-duplicate cluster)
+        incident = None
+        if self.near_duplicates is not None and index_duplicates:
+            from src.agents.near_duplicates import analyze_with_clusters
+
+            (analysis,), (incident,) = await analyze_with_clusters(self.analysis_agent, self.near_duplicates, [ticket])
+        else:
+            analysis = await self.analysis_agent.analyze_ticket(ticket["content"], ticket["customer_info"])
+        if timer is not None:
+            timer.lap("analysis")
 
-        # Step 2: Load response templates
-        with open("data/response_templates.json", "r") as file:
-            response_templates = json.load(file)
+        # Step 2: Get response templates (reloaded only if the file changed)
+        response_templates = self.templates
+        if timer is not None:
+            # Resolve the template (and any pending reload) here so it is timed on its own
+            response_templates.get(analysis.category.value)
+            timer.lap("template_loading")
 
         # Step 3: Generate response
         response = await self.response_agent.generate_response(analysis, response_templates, ticket["customer_info"])
+        if timer is not None:
+            timer.lap("response_generation")
+
+        # Step 4: Print results (if verbose)
+        self._print_result(analysis, response)
+        result = self._result(analysis, response, incident)
+        self._record_history([ticket], [result])
+        return result
+
+    async def process_tickets(self, tickets, index_duplicates=True):
+        """
+        Processes several support tickets, analyzing them as a batch.
+
+        With more than one ticket the analysis goes through TicketAnalysisAgent.analyze_batch,
+        which yields the same results as analyzing each ticket on its own.
+
+        Args:
+            tickets (list): Ticket dictionaries, in the format accepted by process_ticket.
+            index_duplicates (bool): Add the tickets to the near-duplicate index (see process_ticket).
+
+        Returns:
+            list: One {"ticket_analysis": ..., "response": ...} dictionary per ticket, in input order.
+        """
+        tickets = list(tickets)
+        if len(tickets) <= 1:
+            return [await self.process_ticket(ticket, index_duplicates) for ticket in tickets]
+
+        timer = self.metrics.timer() if self.metrics is not None else None
+        incidents = [None] * len(tickets)
+        if self.near_duplicates is not None and index_duplicates:
+            from src.agents.near_duplicates import analyze_with_clusters
+
+            analyses, incidents = await analyze_with_clusters(self.analysis_agent, self.near_duplicates, tickets)
+        else:
+            analyses = await self.analysis_agent.analyze_batch(
+                (ticket["content"], ticket["customer_info"]) for ticket in tickets
+            )
+        if timer is not None:
+            timer.lap("analysis", len(tickets))
+            for analysis in analyses:
+                self.templates.get(analysis.category.value)
+            timer.lap("template_loading", len(tickets))
+
+        results = []
+        for ticket, analysis, incident in zip(tickets, analyses, incidents):
+            response = await self.response_agent.generate_response(analysis, self.templates, ticket["customer_info"])
+            self._print_result(analysis, response)
+            results.append(self._result(analysis, response, incident))
+        if timer is not None:
+            timer.lap("response_generation", len(tickets))
+        self._record_history(tickets, results)
+        return results
+
+    def close(self):
+        """
+        Stops the worker processes, if any, and writes the history still buffered.
+        """
+        if self.history is not None:
+            self.history.flush()
+        if self.sharded:
+            agent = self.analysis_agent
+            (agent.agent if isinstance(agent, CachingAnalysisAgent) else agent).close()
+
+    def _record_history(self, tickets, results):
+        # Called last, once the whole batch succeeded, so a failed batch that is retried is not recorded twice
+        if self.history is None:
+            return
+        self.history.add_many(
+            dict(result, ticket_id=ticket.get("ticket_id"), customer_info=ticket.get("customer_info"))
+            for ticket, result in zip(tickets, results)
+        )
+
+    def _register_gauges(self, metrics, analysis_cache):
+        templates = self.templates
+        metrics.register_gauge("template_render_cache_hits", lambda: templates.hits,
+                               "Responses served from the rendered-template memo.")
+        metrics.register_gauge("template_render_cache_misses", lambda: templates.misses,
+                               "Responses rendered from a compiled template.")
+        metrics.register_gauge("template_reloads", lambda: templates.reloads,
+                               "Times the response templates file was reloaded.")
+        if analysis_cache is not None:
+            for stat in analysis_cache.stats():
+                metrics.register_gauge(f"analysis_cache_{stat}",
+                                       lambda stat=stat: analysis_cache.stats()[stat],
+                                       f"Analysis cache {stat.replace('_', ' ')}.")
+        if self.near_duplicates is not None:
+            index = self.near_duplicates
+            for stat in index.stats():
+                metrics.register_gauge(f"near_duplicate_{stat}",
+                                       lambda stat=stat: index.stats()[stat],
+                                       f"Near-duplicate index {stat.replace('_', ' ')}.")
+        if self.history is not None:
+            history = self.history
+            for stat in history.stats():
+                metrics.register_gauge(f"ticket_history_{stat}",
+                                       lambda stat=stat: history.stats()[stat],
+                                       f"Ticket history {stat.replace('_', ' ')}.")
+
+    @staticmethod
+    def _result(analysis, response, incident):
+        result = {"ticket_analysis": analysis, "response": response}
+        if incident is not None:
+            result["incident"] = incident
+        return result
 
-        # Print results
+    def _print_result(self, analysis, response):
+        if not self.verbose:
+            return
         print("\n===== Ticket Analysis Result =====")
         print(f"Category: {analysis.category.value}")
         print(f"Priority: {analysis.priority.name}")
@@ -72,4 +231,5 @@ async def main():
     await processor.process_ticket(ticket)
 
 # Run the main function when the script is executed directly
-asyncio.run(main())
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,360 @@
+"""
+Asyncio HTTP ingestion service for the ticket pipeline.
+
+Endpoints:
+    POST /tickets   {"content": ..., "customer_info": {...}[, "ticket_id": ...]} -> analysis and response
+    GET  /health    liveness and queue depth
+    GET  /metrics   Prometheus text export
+
+Concurrent requests are grouped into micro-batches and analyzed with one
+TicketProcessor.process_tickets call per batch.
+
+Usage:
+    python -m src.service [--port 8080] [--batch-window-ms 5] [--max-batch-size 64] [--max-queue 1024]
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import List, Optional, Tuple
+from src.agents.bulk_orchestration import CustomJSONEncoder, normalize_ticket
+from src.agents.instrumentation import Instrumentation
+from src.processor import TicketProcessor
+
+ROUTES = ("/tickets", "/health", "/metrics")
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class QueueFullError(Exception):
+    """
+    Raised when the micro-batcher's request queue is full.
+    """
+
+
+class MicroBatcher:
+    """
+    Groups individually submitted tickets into batches for TicketProcessor.process_tickets.
+
+    A batch is closed when it reaches max_batch_size or when max_wait seconds have passed
+    since its first ticket. The window is adaptive: it is only waited for while requests
+    are arriving concurrently (the previous batch held more than one ticket, or more than
+    one is already queued), so a lone request is processed without added latency, and after
+    a window that collected nothing the next batch skips it. If a batch raises, its tickets
+    are retried one at a time (without adding them to the near-duplicate index again), so
+    only the failing ticket gets the error.
+    """
+
+    def __init__(self, processor: TicketProcessor, max_batch_size: int = 64, max_wait: float = 0.005,
+                 max_queue: int = 1024, metrics: Optional[Instrumentation] = None):
+        """
+        Args:
+            processor (TicketProcessor): The processor running each batch.
+            max_batch_size (int): Maximum tickets per batch.
+            max_wait (float): Batching window in seconds (0 disables waiting).
+            max_queue (int): Maximum queued tickets; further submissions raise QueueFullError.
+            metrics (Optional[Instrumentation]): Receives batch counters and a queue depth gauge.
+        """
+        self.processor = processor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self.metrics = metrics
+        self.batches = 0
+        self.tickets = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._last_batch_size = 0
+        self._window_useful = True
+        self._task: Optional[asyncio.Task] = None
+        if metrics is not None:
+            metrics.register_gauge("service_queue_depth", self._queue.qsize, "Tickets waiting for a batch.")
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def start(self):
+        """
+        Starts the batching loop.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """
+        Processes the tickets already queued, then stops the batching loop.
+        """
+        if self._task is not None:
+            await self._queue.put(None)
+            await self._task
+            self._task = None
+
+    def submit(self, ticket: dict) -> asyncio.Future:
+        """
+        Queues a normalized ticket and returns a future resolving to its process_tickets result.
+
+        Raises:
+            QueueFullError: If max_queue tickets are already waiting.
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((ticket, future))
+        except asyncio.QueueFull:
+            raise QueueFullError("Request queue is full") from None
+        return future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        stop = False
+        while not stop:
+            item = await queue.get()
+            if item is None:
+                return
+            batch = [item]
+            while len(batch) < self.max_batch_size and not queue.empty():
+                item = queue.get_nowait()
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            if not stop and len(batch) < self.max_batch_size and self.max_wait > 0 and \
+                    (len(batch) > 1 or self._last_batch_size > 1) and self._window_useful:
+                drained = len(batch)
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+                self._window_useful = len(batch) > drained
+            else:
+                # Skipped (or not needed) this time; probe the window again on the next batch
+                self._window_useful = True
+
+            await self._process(batch)
+
+    async def _process(self, batch: List[Tuple[dict, asyncio.Future]]):
+        self._last_batch_size = len(batch)
+        self.batches += 1
+        self.tickets += len(batch)
+        if self.metrics is not None:
+            self.metrics.count("service_batches_total", help="Micro-batches processed.")
+            self.metrics.count("service_batched_tickets_total", amount=len(batch),
+                               help="Tickets processed in micro-batches.")
+        try:
+            results = await self.processor.process_tickets([ticket for ticket, _ in batch])
+        except Exception as error:
+            if len(batch) == 1:
+                _, future = batch[0]
+                if not future.done():
+                    future.set_exception(error)
+                return
+            # One failing ticket must not fail the whole batch: retry them one at a time
+            for item in batch:
+                await self._process_one(item)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _process_one(self, item: Tuple[dict, asyncio.Future]):
+        ticket, future = item
+        try:
+            # Already added to the near-duplicate index by the failed batch
+            (result,) = await self.processor.process_tickets([ticket], index_duplicates=False)
+        except Exception as error:
+            if not future.done():
+                future.set_exception(error)
+            return
+        if not future.done():
+            future.set_result(result)
+
+
+class TicketService:
+    """
+    Minimal HTTP/1.1 server (keep-alive, Content-Length bodies) in front of a MicroBatcher.
+
+    Example:
+        service = TicketService(port=8080)
+        await service.start()
+        await service.serve_forever()
+    """
+
+    def __init__(self, processor: Optional[TicketProcessor] = None, host: str = "127.0.0.1", port: int = 8080,
+                 max_batch_size: int = 64, max_wait: float = 0.005, max_queue: int = 1024,
+                 metrics: Optional[Instrumentation] = None, keep_alive_timeout: float = 15.0,
+                 max_body_bytes: int = 1 << 20):
+        """
+        Args:
+            processor (Optional[TicketProcessor]): Processor to use (defaults to a quiet,
+                instrumented TicketProcessor).
+            host (str): Interface to bind.
+            port (int): Port to bind (0 picks a free port; see self.port after start()).
+            max_batch_size (int): Maximum tickets per micro-batch.
+            max_wait (float): Micro-batching window in seconds.
+            max_queue (int): Maximum queued tickets before answering 503.
+            metrics (Optional[Instrumentation]): Metrics served on /metrics (created if not given).
+            keep_alive_timeout (float): Seconds an idle keep-alive connection stays open.
+            max_body_bytes (int): Largest accepted request body.
+        """
+        self.metrics = metrics or Instrumentation()
+        self.processor = processor or TicketProcessor(verbose=False, metrics=self.metrics)
+        self.batcher = MicroBatcher(self.processor, max_batch_size, max_wait, max_queue, self.metrics)
+        self.host = host
+        self.port = port
+        self.max_queue = max_queue
+        self.keep_alive_timeout = keep_alive_timeout
+        self.max_body_bytes = max_body_bytes
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        """
+        Binds the socket and starts accepting connections.
+        """
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Stops accepting connections and drains the queued tickets.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.close()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.keep_alive_timeout)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    return
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, path, version = request_line.split(" ", 2)
+                except ValueError:
+                    await self._write(writer, 400, _json({"error": "malformed request line"}), False)
+                    return
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    await self._write(writer, 400, _json({"error": "invalid Content-Length"}), False)
+                    return
+                if length > self.max_body_bytes:
+                    await self._write(writer, 413, _json({"error": "request body too large"}), False)
+                    return
+                body = await reader.readexactly(length) if length else b""
+
+                started = time.perf_counter()
+                path = path.split("?", 1)[0]
+                status, content_type, payload = await self._dispatch(method, path, body)
+                self.metrics.observe("http_request", time.perf_counter() - started)
+                self.metrics.count("http_requests_total",
+                                   (("path", path if path in ROUTES else "other"), ("status", str(status))),
+                                   help="HTTP requests, by path and status.")
+                await self._write(writer, status, payload, keep_alive, content_type)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, str, bytes]:
+        if path == "/tickets":
+            if method != "POST":
+                return 405, "application/json", _json({"error": "use POST"})
+            return await self._post_ticket(body)
+        if path == "/health":
+            return 200, "application/json", _json({"status": "ok", "queued": self.batcher.qsize(),
+                                                   "max_queue": self.max_queue})
+        if path == "/metrics":
+            return 200, "text/plain; version=0.0.4", self.metrics.render_prometheus().encode("utf-8")
+        return 404, "application/json", _json({"error": f"unknown path {path}"})
+
+    async def _post_ticket(self, body: bytes) -> Tuple[int, str, bytes]:
+        try:
+            payload = json.loads(body)
+            ticket = normalize_ticket(payload)
+        except ValueError as error:
+            return 400, "application/json", _json({"error": str(error)})
+        try:
+            future = self.batcher.submit(ticket)
+        except QueueFullError as error:
+            return 503, "application/json", _json({"error": str(error)})
+        try:
+            result = await future
+        except Exception as error:
+            return 500, "application/json", _json({"error": str(error)})
+        record = {"ticket_analysis": result["ticket_analysis"].to_dict(), "response": result["response"]}
+        if isinstance(payload, dict) and "ticket_id" in payload:
+            record = {"ticket_id": payload["ticket_id"], **record}
+        return 200, "application/json", _json(record)
+
+    @staticmethod
+    async def _write(writer: asyncio.StreamWriter, status: int, payload: bytes, keep_alive: bool,
+                     content_type: str = "application/json"):
+        headers = [
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(payload)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status == 503:
+            headers.append("Retry-After: 1")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + payload)
+        await writer.drain()
+
+
+def _json(data) -> bytes:
+    return json.dumps(data, cls=CustomJSONEncoder).encode("utf-8")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the ticket pipeline over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind")
+    parser.add_argument("--port", type=int, default=8080, help="port to bind")
+    parser.add_argument("--max-batch-size", type=int, default=64, help="tickets per micro-batch")
+    parser.add_argument("--batch-window-ms", type=float, default=5.0, help="micro-batching window")
+    parser.add_argument("--max-queue", type=int, default=1024, help="queued tickets before answering 503")
+    args = parser.parse_args(argv)
+
+    async def run():
+        service = TicketService(host=args.host, port=args.port, max_batch_size=args.max_batch_size,
+                                max_wait=args.batch_window_ms / 1000, max_queue=args.max_queue)
+        await service.start()
+        print(f"Serving on http://{service.host}:{service.port} (POST /tickets, GET /health, GET /metrics)")
+        try:
+            await service.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
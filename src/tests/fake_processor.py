@@ -0,0 +1,59 @@
+import asyncio
+from src.processor import TicketProcessor
+
+class FakeProcessor:
+    """
+    Wraps a TicketProcessor for the tests, recording what it processes.
+
+    Each call records the ticket contents (order) and batch size (batch_sizes), waits at
+    the gate (set by default; clear() it to hold calls), sleeps for delay seconds and
+    tracks how many calls were in flight at once (max_active). With fail_after, calls
+    after that many batches raise RuntimeError; with fail_on, batches containing a ticket
+    with that content raise ValueError.
+    """
+
+    def __init__(self, fail_after=None, delay=0.0, fail_on=None, processor=None):
+        self.processor = processor or TicketProcessor(verbose=False)
+        self.analysis_agent = self.processor.analysis_agent
+        self.response_agent = self.processor.response_agent
+        self.templates = self.processor.templates
+        self.fail_after = fail_after
+        self.fail_on = fail_on
+        self.delay = delay
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.order = []
+        self.batch_sizes = []
+        self.active = 0
+        self.max_active = 0
+
+    @property
+    def batches(self):
+        return len(self.batch_sizes)
+
+    @property
+    def tickets(self):
+        return sum(self.batch_sizes)
+
+    async def _enter(self, tickets):
+        if self.fail_after is not None and self.batches >= self.fail_after:
+            raise RuntimeError("simulated crash")
+        self.order.extend(ticket["content"] for ticket in tickets)
+        self.batch_sizes.append(len(tickets))
+        if self.fail_on is not None and any(ticket["content"] == self.fail_on for ticket in tickets):
+            raise ValueError("simulated bad ticket")
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await self.gate.wait()
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+
+    async def process_ticket(self, ticket, index_duplicates=True):
+        await self._enter([ticket])
+        return await self.processor.process_ticket(ticket, index_duplicates)
+
+    async def process_tickets(self, tickets, index_duplicates=True):
+        await self._enter(tickets)
+        return await self.processor.process_tickets(tickets, index_duplicates)
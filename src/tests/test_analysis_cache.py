@@ -0,0 +1,76 @@
+import asyncio
+import os
+import tempfile
+from src.agents.analysis_cache import AnalysisCache, CachingAnalysisAgent, analysis_version
+from src.agents.keyword_rules import KeywordRules
+from src.agents.long_content import LongContentPolicy
+from src.agents.ticket_analysis import TicketAnalysisAgent, Priority
+
+async def test_analysis_cache():
+    """
+    Tests the AnalysisCache and CachingAnalysisAgent.
+
+    The test cases cover:
+    - Cached results matching uncached analysis, for exact and normalized duplicates.
+    - LRU eviction and hit/miss/eviction counters.
+    - Persistence across restarts and invalidation when the keyword rules change.
+    - Distinct versions for other long-content policies and sentiment backends.
+    """
+
+    agent = TicketAnalysisAgent()
+    tickets = [
+        ("I can't log in. Urgent!", {}),
+        ("  I can't log in. Urgent!  \n\n", {}),
+        ("Invoice is wrong", {}),
+        ("Please confirm my payroll run\nthanks", {}),
+        ("I can't log in. Urgent!", {}),
+    ]
+
+    # ✅ Test Case 1: Cached results match uncached analysis
+    print("\n🔹 Running Test Case 1: Cached results match")
+    cached = CachingAnalysisAgent(agent, AnalysisCache(max_entries=100))
+    expected = [await agent.analyze_ticket(content, info) for content, info in tickets]
+    assert await cached.analyze_batch(tickets) == expected, "❌ Cached batch differs from uncached analysis"
+    assert [await cached.analyze_ticket(content, info) for content, info in tickets] == expected, "❌ Cached results differ"
+    stats = cached.cache.stats()
+    assert stats["misses"] == 3 and stats["hits"] == 7, f"❌ Unexpected counters: {stats}"
+    print("✅ Test Case 1 Passed!")
+
+    # ✅ Test Case 2: LRU eviction
+    print("\n🔹 Running Test Case 2: LRU eviction")
+    small = CachingAnalysisAgent(agent, AnalysisCache(max_entries=2))
+    await small.analyze_batch(tickets)
+    assert small.cache.stats()["evictions"] == 1, f"❌ Expected one eviction: {small.cache.stats()}"
+    await small.analyze_ticket("I can't log in. Urgent!")
+    assert small.cache.stats()["misses"] == 4, f"❌ Evicted entry should miss: {small.cache.stats()}"
+    print("✅ Test Case 2 Passed!")
+
+    # ✅ Test Case 3: Persistence and invalidation
+    print("\n🔹 Running Test Case 3: Persistence and invalidation")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite")
+        first = CachingAnalysisAgent(agent, AnalysisCache(path=path))
+        await first.analyze_batch(tickets)
+        first.cache.close()
+
+        restarted = CachingAnalysisAgent(agent, AnalysisCache(path=path))
+        assert await restarted.analyze_batch(tickets) == expected, "❌ Persisted results differ"
+        assert restarted.cache.stats()["disk_hits"] == 3, f"❌ Expected disk hits: {restarted.cache.stats()}"
+        restarted.cache.close()
+
+        changed_agent = TicketAnalysisAgent(rules=KeywordRules().extend(urgency_words=["wrong"]))
+        changed = CachingAnalysisAgent(changed_agent, AnalysisCache(path=path))
+        result = await changed.analyze_ticket("Invoice is wrong")
+        assert changed.cache.stats()["disk_hits"] == 0, "❌ Stale entries should be invalidated"
+        assert result.urgency_indicators == ["wrong"] and result.priority == Priority.MEDIUM, f"❌ Unexpected result: {result}"
+        changed.cache.close()
+
+    versions = {analysis_version(variant) for variant in (
+        agent, TicketAnalysisAgent(sentiment_backend="numpy"), TicketAnalysisAgent(long_content=LongContentPolicy()),
+        TicketAnalysisAgent(long_content=LongContentPolicy(max_key_points=5)))}
+    assert len(versions) == 4, "❌ Sentiment backend and long-content policy should change the version"
+    assert analysis_version(TicketAnalysisAgent()) == analysis_version(agent), "❌ Version should be deterministic"
+    print("✅ Test Case 3 Passed!")
+
+# Run the test cases
+asyncio.run(test_analysis_cache())
@@ -0,0 +1,69 @@
+import asyncio
+import random
+from src.agents import analysis_columns
+from src.agents.analysis_columns import TicketAnalysisColumns
+from src.agents.ticket_analysis import TicketAnalysisAgent, TicketCategory, Priority
+
+async def test_analysis_columns():
+    """
+    Tests the columnar TicketAnalysisColumns store.
+
+    The test cases cover:
+    - Row views round-tripping every TicketAnalysis field.
+    - Group-by counts and mean sentiment, with and without numpy.
+    - Slotted TicketAnalysis objects.
+    """
+
+    agent = TicketAnalysisAgent()
+    rng = random.Random(3)
+    phrases = ["I can't login", "invoice is wrong", "feature request: export", "urgent!", "important",
+               "payroll blocked", "please confirm", "this is terrible", "thanks, all good", "asap\nplease"]
+    pairs = [("\n".join(rng.sample(phrases, rng.randint(1, 4))), None) for _ in range(300)]
+    analyses = await agent.analyze_batch(pairs)
+
+    # ✅ Test Case 1: Row views round-trip
+    print("\n🔹 Running Test Case 1: Row views round-trip")
+    columns = await agent.analyze_batch_columnar(pairs, batch_size=64)
+    assert len(columns) == len(analyses), "❌ Length mismatch"
+    for index, analysis in enumerate(analyses):
+        assert columns[index] == analysis, f"❌ Row {index} differs: {columns[index]} vs {analysis}"
+        assert columns.to_analysis(index) == analysis, f"❌ Materialized row {index} differs"
+    print("✅ Test Case 1 Passed!")
+
+    # ✅ Test Case 2: Aggregations
+    print("\n🔹 Running Test Case 2: Aggregations")
+    expected_counts = {}
+    for analysis in analyses:
+        key = (analysis.category, analysis.priority)
+        expected_counts[key] = expected_counts.get(key, 0) + 1
+    expected_mean = {}
+    for category in TicketCategory:
+        scores = [analysis.sentiment for analysis in analyses if analysis.category == category]
+        if scores:
+            expected_mean[category] = sum(scores) / len(scores)
+
+    for use_numpy in (True, False):
+        numpy = analysis_columns.np
+        if not use_numpy:
+            analysis_columns.np = None
+        try:
+            assert columns.count_by("category", "priority") == expected_counts, "❌ Group-by counts differ"
+            assert sum(columns.count_by("priority").values()) == len(analyses), "❌ Priority counts differ"
+            means = columns.mean_sentiment(by="category")
+            assert means.keys() == expected_mean.keys(), "❌ Mean sentiment categories differ"
+            assert all(abs(means[key] - expected_mean[key]) < 1e-9 for key in means), "❌ Mean sentiment differs"
+            assert columns.follow_up_count() == sum(a.follow_up_required for a in analyses), "❌ Follow-up count differs"
+            assert columns.urgency_counts().get("urgent", 0) == sum("urgent" in a.urgency_indicators for a in analyses), \
+                "❌ Urgency counts differ"
+        finally:
+            analysis_columns.np = numpy
+    print("✅ Test Case 2 Passed!")
+
+    # ✅ Test Case 3: Slotted TicketAnalysis
+    print("\n🔹 Running Test Case 3: Slotted TicketAnalysis")
+    assert not hasattr(analyses[0], "__dict__"), "❌ TicketAnalysis should use __slots__"
+    assert analyses[0].priority in Priority, "❌ Unexpected priority"
+    print("✅ Test Case 3 Passed!")
+
+# Run the test cases
+asyncio.run(test_analysis_columns())
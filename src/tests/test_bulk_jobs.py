@@ -0,0 +1,112 @@
+import asyncio
+import contextlib
+import io
+import json
+import os
+import tempfile
+from src.agents.bulk_jobs import CheckpointLog, run_bulk_job
+from src.processor import TicketProcessor
+from src.tests.fake_processor import FakeProcessor
+
+async def test_bulk_jobs():
+    """
+    Tests checkpointed, resumable bulk jobs.
+
+    The test cases cover:
+    - Resuming after a crash, skipping the checkpointed tickets; completed batches are already in the output.
+    - Recovering from a torn last checkpoint line.
+    - Incremental runs against a previous output; legacy processed_tickets.json results are analyzed again.
+    - Duplicate ticket ids become error records instead of repeating the first ticket's result.
+    """
+
+    with open("data/sample_tickets.json", "r") as file:
+        sample = json.load(file)
+    tickets = [dict(ticket, ticket_id=f"T{i}", content=f"{ticket['content']} (#{i})")
+               for i, ticket in enumerate(sample * 14)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # ✅ Test Case 1: Resume after a crash
+        print("\n🔹 Running Test Case 1: Resume after a crash")
+        clean = io.StringIO()
+        await run_bulk_job(tickets, os.path.join(tmp, "clean.jsonl"), clean, processor=FakeProcessor(), batch_size=8)
+
+        checkpoint = os.path.join(tmp, "job.jsonl")
+        partial = io.StringIO()
+        try:
+            await run_bulk_job(tickets, checkpoint, partial, processor=FakeProcessor(fail_after=3), batch_size=8)
+            assert False, "❌ Expected the simulated crash"
+        except RuntimeError:
+            pass
+        assert len(CheckpointLog(checkpoint)) == 24, "❌ Three batches should be checkpointed"
+        expected_lines = clean.getvalue().splitlines()
+        assert partial.getvalue().splitlines() == expected_lines[:24], "❌ Completed batches should be in the output"
+        resumed = FakeProcessor()
+        output = io.StringIO()
+        stats = await run_bulk_job(tickets, checkpoint, output, processor=resumed, batch_size=8)
+        assert stats == {"processed": 18, "resumed": 24, "reused": 0, "errors": 0}, f"❌ Unexpected stats: {stats}"
+        assert resumed.tickets == 18, f"❌ Resume reprocessed {resumed.tickets} tickets"
+        assert output.getvalue() == clean.getvalue(), "❌ Resumed output differs from a clean run"
+        print("✅ Test Case 1 Passed!")
+
+        # ✅ Test Case 2: Torn checkpoint tail
+        print("\n🔹 Running Test Case 2: Torn checkpoint tail")
+        size = os.path.getsize(checkpoint)
+        with open(checkpoint, "a") as file:
+            file.write('{"ticket_id": "T99", "fingerp')
+        log = CheckpointLog(checkpoint)
+        log.close()
+        assert len(log) == 42 and os.path.getsize(checkpoint) == size, "❌ Torn line was not truncated"
+        print("✅ Test Case 2 Passed!")
+
+        # ✅ Test Case 3: Incremental runs
+        print("\n🔹 Running Test Case 3: Incremental runs")
+        previous = os.path.join(tmp, "previous.jsonl")
+        with open(previous, "w") as file:
+            file.write(clean.getvalue())
+        changed = [dict(ticket) for ticket in tickets] + [{"ticket_id": "NEW", "content": "Payroll failed, urgent!"}]
+        changed[5]["content"] = "My invoice shows the wrong amount."
+        counting = FakeProcessor()
+        output = io.StringIO()
+        stats = await run_bulk_job(changed, os.path.join(tmp, "incremental.jsonl"), output,
+                                   processor=counting, previous=previous)
+        assert stats == {"processed": 2, "resumed": 0, "reused": 41, "errors": 0}, f"❌ Unexpected stats: {stats}"
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert records[5]["ticket_analysis"]["category"] == "billing", "❌ Changed ticket was not reprocessed"
+        assert records[-1]["ticket_analysis"]["priority"] == 4, "❌ New ticket was not processed"
+
+        # Legacy outputs carry no fingerprint: their analyses come from older logic and are not reused
+        processor = FakeProcessor()
+        output, notes = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stderr(notes):
+            stats = await run_bulk_job(sample, os.path.join(tmp, "legacy.jsonl"), output,
+                                       processor=processor, previous="data/processed_tickets.json")
+        assert "no earlier results can be reused" in notes.getvalue(), "❌ Unusable previous output was not reported"
+        assert stats == {"processed": len(sample), "resumed": 0, "reused": 0, "errors": 0}, f"❌ Unexpected stats: {stats}"
+        fresh = await TicketProcessor(verbose=False).process_tickets(sample)
+        for record, expected in zip((json.loads(line) for line in output.getvalue().splitlines()), fresh):
+            assert record["ticket_analysis"] == expected["ticket_analysis"].to_dict(), "❌ Analysis differs from a fresh one"
+            assert record["response"] == expected["response"], "❌ Response differs"
+        print("✅ Test Case 3 Passed!")
+
+        # ✅ Test Case 4: Duplicate ticket ids
+        print("\n🔹 Running Test Case 4: Duplicate ticket ids")
+        duplicated = [{"ticket_id": "D1", "content": "I can't log in to my account!"},
+                      {"ticket_id": "D2", "content": "My invoice shows the wrong amount."},
+                      {"ticket_id": "D1", "content": "Payroll failed, urgent!"},
+                      {"content": "Where is the export button?"}, {"ticket_id": 3, "content": "Thanks!"}]
+        for run in range(2):
+            output = io.StringIO()
+            stats = await run_bulk_job(duplicated, os.path.join(tmp, "duplicates.jsonl"), output, processor=processor)
+            expected = {"processed": 3, "resumed": 0, "reused": 0, "errors": 2} if run == 0 else \
+                {"processed": 0, "resumed": 3, "reused": 0, "errors": 2}
+            assert stats == expected, f"❌ Unexpected stats: {stats}"
+            records = [json.loads(line) for line in output.getvalue().splitlines()]
+            assert [record["ticket_id"] for record in records] == ["D1", "D2", "D1", 3, 3], "❌ Records out of order"
+            assert [records[0]["ticket_analysis"]["category"], records[1]["ticket_analysis"]["category"]] == \
+                ["technical", "billing"], "❌ Ticket got another ticket's result"
+            assert "duplicate ticket_id" in records[2]["error"], "❌ Duplicate id was not rejected"
+            assert "duplicate ticket_id" in records[4]["error"], "❌ Explicit id colliding with a position was not rejected"
+        print("✅ Test Case 4 Passed!")
+
+# Run the test cases
+asyncio.run(test_bulk_jobs())
@@ -0,0 +1,80 @@
+import asyncio
+import io
+import json
+import os
+import tempfile
+from src.agents.bulk_orchestration import iter_tickets, stream_bulk_tickets
+from src.processor import TicketProcessor
+from src.tests.fake_processor import FakeProcessor
+
+async def test_bulk_orchestration():
+    """
+    Tests the streaming bulk pipeline.
+
+    The test cases cover:
+    - Lazy reading of JSON-array and JSONL ticket files, across chunk boundaries.
+    - Streaming results matching per-ticket processing, in input order.
+    - Invalid tickets (no string content, non-object customer_info, non-scalar customer fields) and
+      tickets failing in the processor reported as error records without stopping the run.
+    """
+
+    with open("data/sample_tickets.json", "r") as file:
+        sample = json.load(file)
+    tickets = [dict(ticket, ticket_id=f"T{i}") for i, ticket in enumerate(sample * 20)]
+
+    # ✅ Test Case 1: Lazy file reading
+    print("\n🔹 Running Test Case 1: Lazy file reading")
+    with tempfile.TemporaryDirectory() as tmp:
+        array_path = os.path.join(tmp, "tickets.json")
+        jsonl_path = os.path.join(tmp, "tickets.jsonl")
+        with open(array_path, "w") as file:
+            json.dump(tickets, file, indent=4)
+        with open(jsonl_path, "w") as file:
+            file.write("\n".join(json.dumps(ticket) for ticket in tickets) + "\n")
+        for path in (array_path, jsonl_path):
+            for chunk_size in (5, 1 << 16):
+                assert list(iter_tickets(path, chunk_size=chunk_size)) == tickets, f"❌ Mismatch reading {path}"
+    print("✅ Test Case 1 Passed!")
+
+    # ✅ Test Case 2: Ordered streaming output
+    print("\n🔹 Running Test Case 2: Ordered streaming output")
+    processor = TicketProcessor(verbose=False)
+    output = io.StringIO()
+    stats = await stream_bulk_tickets(iter(tickets), output, processor=processor, max_concurrency=3, batch_size=4)
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert stats == {"processed": len(tickets), "errors": 0}, f"❌ Unexpected stats: {stats}"
+    assert [record["ticket_id"] for record in records] == [ticket["ticket_id"] for ticket in tickets], "❌ Output order differs"
+    expected = await processor.process_ticket(sample[0])
+    assert records[0]["ticket_analysis"]["priority"] == int(expected["ticket_analysis"].priority), "❌ Priority mismatch"
+    assert records[0]["response"] == expected["response"], "❌ Response mismatch"
+    print("✅ Test Case 2 Passed!")
+
+    # ✅ Test Case 3: Invalid tickets
+    print("\n🔹 Running Test Case 3: Invalid tickets")
+    output = io.StringIO()
+    invalid = [
+        "Invoice is wrong",
+        {"no_content": True},
+        {"ticket_id": "vip", "content": "Invoice wrong", "customer_info": "VIP"},
+        {"ticket_id": "ok", "content": "I can't log in", "customer_info": {"role": "Admin"}},
+        {"ticket_id": "list", "content": "Invoice wrong", "customer_info": {"customer_name": ["A", "B"]}},
+    ]
+    stats = await stream_bulk_tickets(invalid, output, processor=processor)
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert stats == {"processed": 2, "errors": 3}, f"❌ Unexpected stats: {stats}"
+    assert "customer_name" in records[4]["error"], f"❌ Unexpected record: {records[4]}"
+    assert "error" in records[1] and records[0]["ticket_analysis"]["category"] == "billing", f"❌ Unexpected records: {records}"
+    assert records[2]["ticket_id"] == "vip" and "customer_info" in records[2]["error"], f"❌ Unexpected record: {records[2]}"
+    assert records[3]["ticket_id"] == "ok" and "ticket_analysis" in records[3], f"❌ Valid ticket lost: {records[3]}"
+
+    # A ticket that fails inside the processor only fails itself
+    output = io.StringIO()
+    failing = FakeProcessor(fail_on="boom")
+    stats = await stream_bulk_tickets(["Invoice is wrong", "boom", "I can't log in"], output, processor=failing, batch_size=8)
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert stats == {"processed": 2, "errors": 1}, f"❌ Unexpected stats: {stats}"
+    assert "error" in records[1] and all("ticket_analysis" in records[i] for i in (0, 2)), f"❌ Unexpected records: {records}"
+    print("✅ Test Case 3 Passed!")
+
+# Run the test cases
+asyncio.run(test_bulk_orchestration())
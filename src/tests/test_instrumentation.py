@@ -0,0 +1,86 @@
+import asyncio
+import os
+import tempfile
+import urllib.request
+from src.agents.analysis_cache import AnalysisCache
+from src.agents.instrumentation import Instrumentation
+from src.agents.ticket_analysis import TicketAnalysisAgent
+from src.processor import TicketProcessor
+
+ANALYSIS_STAGES = {"keyword_scan", "sentiment", "category", "urgency", "impact", "priority",
+                   "expertise", "key_points", "response_type", "follow_up"}
+
+async def test_instrumentation():
+    """
+    Tests the opt-in Instrumentation of the ticket pipeline.
+
+    The test cases cover:
+    - Per-step latency histograms and category/priority counters for analyze_ticket and analyze_batch.
+    - Identical analyses with and without instrumentation.
+    - TicketProcessor stages, cache gauges and hooks.
+    - Prometheus text export to a file and over HTTP.
+    """
+
+    tickets = [
+        {"content": "I can't login. This is urgent!", "customer_info": {"customer_name": "Ann", "role": "Admin"}},
+        {"content": "My invoice is wrong", "customer_info": {"customer_name": "Bo", "role": "User"}},
+        {"content": "Please add dark mode\nthanks", "customer_info": {"customer_name": "Cy", "role": "User"}},
+    ]
+
+    # ✅ Test Case 1: Per-step histograms and counters
+    print("\n🔹 Running Test Case 1: Per-step histograms and counters")
+    metrics = Instrumentation()
+    agent = TicketAnalysisAgent(metrics=metrics)
+    plain = TicketAnalysisAgent()
+    for ticket in tickets:
+        analysis = await agent.analyze_ticket(ticket["content"])
+        assert analysis == await plain.analyze_ticket(ticket["content"]), "❌ Instrumentation changed the analysis"
+    assert await agent.analyze_batch([(t["content"], None) for t in tickets]) == \
+        await plain.analyze_batch([(t["content"], None) for t in tickets]), "❌ Instrumented batch differs"
+    snapshot = metrics.snapshot()
+    assert set(snapshot["stages"]) == ANALYSIS_STAGES, f"❌ Unexpected stages: {set(snapshot['stages'])}"
+    assert all(stage["count"] == 6 for stage in snapshot["stages"].values()), "❌ Every stage should count 6 tickets"
+    counts = snapshot["counters"]["analyzed_total"]
+    assert counts[(("category", "access"), ("priority", "URGENT"))] == 2, f"❌ Unexpected counters: {counts}"
+    assert sum(counts.values()) == 6, f"❌ Expected 6 analyzed tickets: {counts}"
+    print("✅ Test Case 1 Passed!")
+
+    # ✅ Test Case 2: Processor stages, gauges and hooks
+    print("\n🔹 Running Test Case 2: Processor stages, gauges and hooks")
+    metrics = Instrumentation()
+    observed = []
+    metrics.add_hook(lambda stage, seconds, count: observed.append((stage, count)))
+    processor = TicketProcessor(verbose=False, analysis_cache=AnalysisCache(), metrics=metrics)
+    await processor.process_ticket(tickets[0])
+    await processor.process_tickets(tickets)
+    stages = metrics.snapshot()["stages"]
+    for stage in ("analysis", "template_loading", "response_generation"):
+        assert stages[stage]["count"] == 4, f"❌ {stage} should count 4 tickets: {stages.get(stage)}"
+    gauges = metrics.snapshot()["gauges"]
+    assert gauges["analysis_cache_hits"] == 1 and gauges["analysis_cache_misses"] == 3, f"❌ Unexpected gauges: {gauges}"
+    assert ("response_generation", 3) in observed, "❌ Hook did not receive the batch observation"
+    print("✅ Test Case 2 Passed!")
+
+    # ✅ Test Case 3: Prometheus export
+    print("\n🔹 Running Test Case 3: Prometheus export")
+    text = metrics.render_prometheus()
+    assert "# TYPE ticket_stage_seconds histogram" in text, "❌ Missing histogram type line"
+    assert 'ticket_stage_seconds_count{stage="analysis"} 4' in text, "❌ Missing stage count"
+    assert 'ticket_stage_seconds_bucket{stage="analysis",le="+Inf"} 4' in text, "❌ Missing +Inf bucket"
+    assert "ticket_analysis_cache_hits 1" in text, "❌ Missing cache gauge"
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "metrics.prom")
+        metrics.dump(path)
+        with open(path) as file:
+            assert "ticket_analyzed_total{" in file.read(), "❌ Dumped file lacks counters"
+    server = metrics.serve(port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        body = urllib.request.urlopen(url, timeout=5).read().decode("utf-8")
+        assert "ticket_stage_seconds_sum" in body, "❌ HTTP endpoint did not serve metrics"
+    finally:
+        server.shutdown()
+    print("✅ Test Case 3 Passed!")
+
+# Run the test cases
+asyncio.run(test_instrumentation())
@@ -0,0 +1,55 @@
+import asyncio
+import random
+from src.agents.keyword_rules import KeywordRules, KeywordMatcher
+
+def naive_scan(rules, text):
+    """
+    Reference implementation: one substring check per keyword, like the original agent.
+    """
+    return {word for word in rules.all_keywords() if word in text}
+
+async def test_keyword_rules():
+    """
+    Tests the compiled KeywordMatcher against the naive per-keyword substring checks.
+
+    The test cases cover:
+    - The built-in rule table on ticket-like text.
+    - Overlapping and nested keywords (prefixes, suffixes, shared middles).
+    - Large tenant-extended rule tables.
+    """
+
+    rules = KeywordRules()
+    matcher = KeywordMatcher(rules)
+
+    # ✅ Test Case 1: Built-in rules
+    print("\n🔹 Running Test Case 1: Built-in rules")
+    text = "urgent: admin login fails, payroll invoice pending. please confirm asap and double-check."
+    assert matcher.scan(text) == naive_scan(rules, text), f"❌ Mismatch: {matcher.scan(text)}"
+    assert matcher.scan("nothing to see here") == set(), "❌ Expected no hits"
+    print("✅ Test Case 1 Passed!")
+
+    # ✅ Test Case 2: Overlapping keywords
+    print("\n🔹 Running Test Case 2: Overlapping keywords")
+    overlapping = rules.extend(
+        category_keywords={"feature": ["feature", "request", "quest", "in"]},
+        urgency_words=["adminvoice", "urge"],
+    )
+    overlap_matcher = KeywordMatcher(overlapping)
+    for text in ["feature request", "adminvoice", "urgently", "adminvoicex", "requested features"]:
+        assert overlap_matcher.scan(text) == naive_scan(overlapping, text), f"❌ Mismatch on {text!r}"
+    print("✅ Test Case 2 Passed!")
+
+    # ✅ Test Case 3: Hundreds of tenant keywords on random text
+    print("\n🔹 Running Test Case 3: Large tenant rule table")
+    rng = random.Random(7)
+    alphabet = "abcdeilnoprstu -"
+    extra = ["".join(rng.choice(alphabet) for _ in range(rng.randint(2, 9))) for _ in range(500)]
+    large = rules.extend(urgency_words=extra)
+    large_matcher = KeywordMatcher(large)
+    for _ in range(200):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 300)))
+        assert large_matcher.scan(text) == naive_scan(large, text), f"❌ Mismatch on {text!r}"
+    print("✅ Test Case 3 Passed!")
+
+# Run the test cases
+asyncio.run(test_keyword_rules())
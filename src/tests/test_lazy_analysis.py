@@ -0,0 +1,62 @@
+import asyncio
+from src.agents.orchestrator import Orchestrator
+from src.agents.ticket_analysis import ANALYSIS_FIELDS, Priority, TicketAnalysisAgent
+from src.benchmarks.synthetic import generate_tickets
+
+async def test_lazy_analysis():
+    """
+    Tests lazy, short-circuiting evaluation of TicketAnalysis fields.
+
+    The test cases cover:
+    - Every field read lazily matching eager analyze_ticket.
+    - VADER skipped when a keyword rule decides the priority, and the skip stats.
+    - Field masks, including the Orchestrator's.
+    """
+
+    agent = TicketAnalysisAgent()
+    contents = [ticket["content"] for ticket in generate_tickets(500, seed=7)]
+
+    # ✅ Test Case 1: Lazy fields match eager evaluation
+    print("\n🔹 Running Test Case 1: Lazy fields match eager evaluation")
+    for content in contents:
+        eager = await agent.analyze_ticket(content)
+        for field in ANALYSIS_FIELDS:
+            assert getattr(agent.analyze_lazy(content), field) == getattr(eager, field), f"❌ {field} differs for {content!r}"
+        assert agent.analyze_lazy(content).to_analysis() == eager, f"❌ Full lazy analysis differs for {content!r}"
+    print("✅ Test Case 1 Passed!")
+
+    # ✅ Test Case 2: VADER is skipped when keywords decide the priority
+    print("\n🔹 Running Test Case 2: VADER short-circuit")
+    agent = TicketAnalysisAgent()
+    urgent = agent.analyze_lazy("Payroll is broken, this is urgent!")
+    assert urgent.priority == Priority.URGENT and urgent.suggested_response_type == "immediate", "❌ Wrong priority"
+    assert "sentiment" not in urgent.evaluated, "❌ Sentiment should not be computed"
+    billing = agent.analyze_lazy("My invoice looks odd")
+    assert billing.priority == Priority.MEDIUM and "sentiment" not in billing.evaluated, "❌ Billing needs no VADER"
+    low = agent.analyze_lazy("This is terrible, awful and broken. I hate it.")
+    assert low.priority == Priority.MEDIUM and "sentiment" in low.evaluated, "❌ Negative sentiment should raise priority"
+    stats = agent.lazy_stats()
+    assert stats == {"analyses": 3, "vader_calls": 1, "vader_skipped": 2, "skip_rate": 2 / 3}, f"❌ Unexpected stats: {stats}"
+    print("✅ Test Case 2 Passed!")
+
+    # ✅ Test Case 3: Field masks
+    print("\n🔹 Running Test Case 3: Field masks")
+    masked = await agent.analyze_ticket("Please confirm the billing change", fields=("priority", "follow_up_required"))
+    assert masked.to_dict() == {"priority": 2, "follow_up_required": True}, f"❌ Unexpected masked dict: {masked.to_dict()}"
+    assert "key_points" not in masked.evaluated and "sentiment" not in masked.evaluated, "❌ Unrequested fields computed"
+    try:
+        agent.analyze_lazy("text", fields=("colour",))
+        assert False, "❌ Expected ValueError for an unknown field"
+    except ValueError:
+        pass
+
+    orchestrator = Orchestrator()
+    ticket = "I can't log in to my account. This is a disaster!"
+    result = await orchestrator.process_ticket(ticket, {"role": "Admin"}, {})
+    compound = orchestrator.sia.polarity_scores(ticket)["compound"]
+    assert result["priority_level"] == ("High" if compound < -0.2 else "Low"), "❌ Orchestrator output changed"
+    assert orchestrator.analysis_agent.lazy_stats()["analyses"] == 1, "❌ Orchestrator should use the field mask"
+    print("✅ Test Case 3 Passed!")
+
+# Run the test cases
+asyncio.run(test_lazy_analysis())
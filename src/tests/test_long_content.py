@@ -0,0 +1,87 @@
+import asyncio
+import tracemalloc
+from src.agents.long_content import LongContentPolicy
+from src.agents.ticket_analysis import Priority, TicketAnalysis, TicketAnalysisAgent, TicketCategory
+from src.processor import TicketProcessor
+
+THREAD = (
+    "Hi team,\n"
+    "Our export keeps failing since this morning and the dashboard shows error 500.\n"
+    "> Earlier you asked whether our invoice was paid.\n"
+    "Please confirm once fixed.\n"
+    "{log}"
+    "\n-- \nAlice Smith | Acme Corp | +1 555 0100\n"
+    "\nOn Mon, May 6, 2024 at 9:12 AM Billing Team <billing@example.com> wrote:\n"
+    "> Your invoice payment failed, this is urgent. Our billing system marks the account as overdue.\n"
+)
+
+async def test_long_content():
+    """
+    Tests bounded-memory analysis of very long tickets.
+
+    The test cases cover:
+    - Short tickets analyzed exactly as before, without a truncation record; the mode is opt-in.
+    - Quoted threads and signatures stripped, chunked keyword scans and key point limits.
+    - Bounded memory for a multi-megabyte ticket, and the same result from every analysis path.
+    """
+
+    agent = TicketAnalysisAgent(long_content=LongContentPolicy())
+    full = TicketAnalysisAgent()
+
+    # ✅ Test Case 1: Short tickets are unchanged
+    print("\n🔹 Running Test Case 1: Short tickets are unchanged")
+    short = THREAD.format(log="")
+    analysis = await agent.analyze_ticket(short)
+    assert analysis == await full.analyze_ticket(short), "❌ Short ticket analysis changed"
+    assert analysis.truncation is None and "truncation" not in analysis.to_dict(), "❌ Unexpected truncation record"
+    assert analysis.priority == Priority.URGENT, "❌ Short tickets are analyzed in full, thread included"
+    assert full.long_content is None, "❌ Long-content mode should be opt-in"
+    assert TicketProcessor(verbose=False, long_content=LongContentPolicy()).analysis_agent.long_content \
+        == LongContentPolicy(), "❌ TicketProcessor should pass the policy on"
+    print("✅ Test Case 1 Passed!")
+
+    # ✅ Test Case 2: Long threads
+    print("\n🔹 Running Test Case 2: Long threads")
+    log = "".join(f"10:{i % 60:02d}:00 worker-{i % 7} retry {i} " + "x" * 600 + "\n" for i in range(40))
+    ticket = THREAD.format(log=log)
+    analysis = await agent.analyze_ticket(ticket)
+    assert analysis.category == TicketCategory.TECHNICAL, f"❌ Quoted billing text was scanned: {analysis.category}"
+    assert analysis.priority != Priority.URGENT and analysis.urgency_indicators == [], "❌ Quoted urgency was scanned"
+    assert analysis.follow_up_required, "❌ Follow-up in the body was missed"
+    assert len(analysis.key_points) == 20 and analysis.key_points[2] == "Please confirm once fixed.", "❌ Key points"
+    assert all(len(point) <= 501 for point in analysis.key_points), "❌ Key points should be shortened"
+    truncation = analysis.truncation
+    assert truncation["thread_removed"] and truncation["key_points_limited"], f"❌ Truncation: {truncation}"
+    assert truncation["quoted_chars_removed"] == len("> Earlier you asked whether our invoice was paid."), \
+        f"❌ Quoted chars: {truncation}"
+    assert truncation["key_points_shortened"] == 17 and truncation["sentiment_sample_chars"] <= 2000, \
+        f"❌ Truncation: {truncation}"
+
+    # A keyword cut by a chunk boundary is still found
+    small = TicketAnalysisAgent(long_content=LongContentPolicy(max_chars=100, chunk_chars=64))
+    text = "a" * 60 + " payment is stuck " + "b" * 200
+    assert (await small.analyze_ticket(text)).category == TicketCategory.BILLING, "❌ Keyword split by a chunk"
+    print("✅ Test Case 2 Passed!")
+
+    # ✅ Test Case 3: Bounded memory
+    print("\n🔹 Running Test Case 3: Bounded memory")
+    huge = THREAD.format(log="".join(f"2024-05-01T10:{i % 60:02d}:00 INFO batch {i} processed\n" for i in range(120000)))
+    assert len(huge) > 5_000_000, "❌ Ticket should be over 5 MB"
+    await agent.analyze_ticket("warm up")
+    tracemalloc.start()
+    analysis = await agent.analyze_ticket(huge)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < 2_000_000, f"❌ Peak memory {peak} bytes"
+    truncation = analysis.truncation
+    assert truncation["analyzed_chars"] + truncation["quoted_chars_removed"] == LongContentPolicy().max_analyzed_chars \
+        and not truncation["thread_removed"], f"❌ Only the first max_analyzed_chars should be read: {truncation}"
+
+    batch = await agent.analyze_batch([(huge, None), (short, None)])
+    assert batch[0] == analysis, "❌ analyze_batch differs"
+    assert agent.analyze_lazy(huge).to_analysis() == analysis, "❌ Lazy analysis differs"
+    assert TicketAnalysis.from_dict(analysis.to_dict()) == analysis, "❌ Truncation record lost in to_dict"
+    print("✅ Test Case 3 Passed!")
+
+# Run the test cases
+asyncio.run(test_long_content())
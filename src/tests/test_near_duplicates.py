@@ -0,0 +1,110 @@
+import asyncio
+from src.agents import near_duplicates
+from src.agents.near_duplicates import NearDuplicateIndex
+from src.benchmarks.synthetic import generate_incident_storm
+from src.processor import TicketProcessor
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+async def test_near_duplicates():
+    """
+    Tests near-duplicate ticket detection.
+
+    The test cases cover:
+    - Tickets differing in names, timestamps and error codes joining one cluster.
+    - Sliding-window and size-bound eviction, and incident cluster sizes.
+    - TicketProcessor reusing a cluster's analysis and reporting incidents.
+    - A near-duplicate adding an urgency phrase is escalated like a fresh analysis.
+    """
+
+    # ✅ Test Case 1: Matching near-duplicates
+    print("\n🔹 Running Test Case 1: Matching near-duplicates")
+    index = NearDuplicateIndex()
+    first, duplicate = index.add("Hi, Alice here. Since 09:12 the export job fails with error 500 (id 5f3a9c0e12ab).")
+    assert not duplicate, "❌ The first ticket should start a cluster"
+    same, duplicate = index.add("Hi, Bob here. Since 14:40 the export job fails with error 503 (id 77aa01bc9e3f).")
+    assert duplicate and same is first, "❌ Variant should join the cluster"
+    other, duplicate = index.add("My last invoice is wrong, please check the billing.")
+    assert not duplicate and other is not first, "❌ Unrelated ticket should start its own cluster"
+    assert index.match("Hi, Carla here. Since 01:00 the export job fails with error 502 (id 0123456789ab).") is first, \
+        "❌ match() should find the cluster"
+    assert first.size == 2 and index.stats()["tickets"] == 3, "❌ match() should not add the ticket"
+
+    signature = index.signature(first.representative)
+    numpy_module, near_duplicates.np = near_duplicates.np, None
+    try:
+        assert list(index.signature(first.representative)) == list(signature), "❌ Pure-Python signature differs"
+    finally:
+        near_duplicates.np = numpy_module
+    print("✅ Test Case 1 Passed!")
+
+    # ✅ Test Case 2: Eviction and incident sizes
+    print("\n🔹 Running Test Case 2: Eviction and incident sizes")
+    clock = FakeClock()
+    index = NearDuplicateIndex(window=60.0, max_clusters=3, clock=clock)
+    for minute in range(5):
+        clock.now = minute * 10.0
+        index.add(f"Payroll service is down since 10:{minute:02d}, error 503. This is urgent!")
+    index.add("Feature request: please add dark mode.")
+    assert [cluster.size for cluster in index.incidents()] == [5], "❌ Incident cluster size"
+    clock.now = 101.0
+    assert index.match("Payroll service is down since 11:00, error 503. This is urgent!") is None, "❌ Stale cluster matched"
+    assert len(index) == 0 and index.evictions == 2, "❌ Clusters should expire after the window"
+    for text in ["My last invoice is wrong.", "I can't login to my account.",
+                 "The mobile app freezes on startup.", "Feature request: bulk edit for tickets."]:
+        index.add(text)
+    assert len(index) == 3 and index.stats()["evictions"] == 3, "❌ max_clusters should evict the oldest cluster"
+    assert index.match("My last invoice is wrong.") is None, "❌ The oldest cluster should be evicted"
+    print("✅ Test Case 2 Passed!")
+
+    # ✅ Test Case 3: TicketProcessor reuses cluster analyses
+    print("\n🔹 Running Test Case 3: TicketProcessor reuses cluster analyses")
+    storm = generate_incident_storm(200, incidents=3, incident_rate=0.9, seed=3)
+    processor = TicketProcessor(verbose=False, near_duplicates=NearDuplicateIndex())
+    analyzed = []
+    analyze_batch = processor.analysis_agent.analyze_batch
+
+    async def counting_batch(tickets, batch_size=None):
+        tickets = list(tickets)
+        analyzed.extend(tickets)
+        return await analyze_batch(tickets, batch_size)
+
+    processor.analysis_agent.analyze_batch = counting_batch
+    results = await processor.process_tickets(storm)
+    single = await processor.process_ticket(storm[0])
+    assert len(analyzed) < len(storm) // 4, f"❌ {len(analyzed)} tickets analyzed, expected mostly reuse"
+    assert single["incident"]["duplicate"] and single["incident"]["cluster_size"] > 1, "❌ Single ticket incident"
+
+    clusters = {}
+    for ticket, result in zip(storm, results):
+        analysis, incident = result["ticket_analysis"], result["incident"]
+        key_points = [line.strip() for line in ticket["content"].split("\n") if line.strip()]
+        assert analysis.key_points == key_points, "❌ Reused analysis should keep the ticket's key points"
+        first_analysis = clusters.setdefault(incident["cluster_id"], analysis)
+        assert analysis.category == first_analysis.category and analysis.priority == first_analysis.priority, \
+            "❌ Cluster members should share the analysis"
+        assert incident["duplicate"] == (first_analysis is not analysis), "❌ Wrong duplicate flag"
+    sizes = sorted((cluster.size for cluster in processor.near_duplicates.incidents()), reverse=True)
+    assert sum(sizes[:3]) >= 150, f"❌ The three incidents should dominate the clusters: {sizes[:5]}"
+    print("✅ Test Case 3 Passed!")
+
+    # ✅ Test Case 4: Near-duplicates keep their own keyword rules
+    print("\n🔹 Running Test Case 4: Near-duplicates keep their own keyword rules")
+    escalated = dict(storm[1], content=storm[1]["content"] + " Payroll runs today, this is urgent!")
+    processor = TicketProcessor(verbose=False, near_duplicates=NearDuplicateIndex())
+    first, duplicate = await processor.process_tickets([storm[0], escalated])
+    fresh = (await TicketProcessor(verbose=False).process_ticket(escalated))["ticket_analysis"]
+    assert duplicate["incident"]["duplicate"], "❌ The escalated ticket should join the cluster"
+    analysis = duplicate["ticket_analysis"]
+    assert analysis.priority == fresh.priority == 4, f"❌ Duplicate was not escalated: {analysis.priority}"
+    assert analysis.urgency_indicators == fresh.urgency_indicators == ["urgent", "payroll"], "❌ Urgency lost"
+    assert analysis.sentiment == first["ticket_analysis"].sentiment, "❌ The cluster's sentiment should be reused"
+    print("✅ Test Case 4 Passed!")
+
+# Run the test cases
+asyncio.run(test_near_duplicates())
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import os
+import tempfile
+from src.agents.bulk_orchestration import process_bulk_tickets, stream_bulk_tickets
+from src.agents.output_formats import BinaryRecordReader, BinaryRecordWriter, read_records
+from src.agents.ticket_analysis import Priority, TicketCategory
+from src.processor import TicketProcessor
+
+async def test_output_formats():
+    """
+    Tests the pluggable output formats.
+
+    The test cases cover:
+    - Round trips of every format back to TicketAnalysis objects and response dicts.
+    - Column scans of the binary format without decoding rows.
+    - Reading a binary file whose footer was never written.
+    - Binary rows with more than 65535 list items; empty and zero-row binary files.
+    - process_bulk_tickets output in the existing JSON layout and in JSONL.
+    """
+
+    with open("data/sample_tickets.json", "r") as file:
+        sample = json.load(file)
+    tickets = [dict(ticket, ticket_id=f"T{i}") for i, ticket in enumerate(sample * 10)]
+    valid = list(tickets)
+    tickets.insert(3, {"ticket_id": "bad", "content": 42})
+    processor = TicketProcessor(verbose=False)
+    expected = await processor.process_tickets(valid)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # ✅ Test Case 1: Round trips
+        print("\n🔹 Running Test Case 1: Round trips")
+        for output_format in ("jsonl", "json", "binary"):
+            path = os.path.join(tmp, f"results.{output_format}")
+            with open(path, "wb" if output_format == "binary" else "w") as output:
+                stats = await stream_bulk_tickets(tickets, output, processor=processor, output_format=output_format)
+            assert stats == {"processed": len(expected), "errors": 1}, f"❌ Unexpected stats: {stats}"
+            records = list(read_records(path))
+            assert records[3]["ticket_id"] == "bad" and "error" in records[3], f"❌ Error record: {records[3]}"
+            del records[3]
+            for record, result, ticket in zip(records, expected, valid):
+                assert record["ticket_id"] == ticket["ticket_id"], f"❌ {output_format}: wrong ticket order"
+                assert record["ticket_analysis"] == result["ticket_analysis"], f"❌ {output_format}: analysis differs"
+                assert record["response"] == result["response"], f"❌ {output_format}: response differs"
+        with open(os.path.join(tmp, "results.jsonl")) as file:
+            assert '", "' not in file.readline(), "❌ JSONL lines should use compact separators"
+        print("✅ Test Case 1 Passed!")
+
+        # ✅ Test Case 2: Binary column scans
+        print("\n🔹 Running Test Case 2: Binary column scans")
+        path = os.path.join(tmp, "results.binary")
+        with BinaryRecordReader(path) as reader:
+            assert len(reader) == len(tickets), "❌ Wrong row count"
+            categories = [result["ticket_analysis"].category for result in expected]
+            priorities = [result["ticket_analysis"].priority for result in expected]
+            assert reader.column("category")[3] is None and reader.column("priority")[3] is None, "❌ Error row"
+            assert [c for c in reader.column("category") if c] == categories, "❌ Category column differs"
+            counts = reader.count_by("priority")
+            assert counts == {p: priorities.count(p) for p in set(priorities)}, f"❌ Unexpected counts: {counts}"
+            urgent = reader.where(priority=Priority.URGENT)
+            assert len(urgent) == priorities.count(Priority.URGENT), "❌ where() missed rows"
+            assert all(reader[i]["ticket_analysis"].priority == Priority.URGENT for i in urgent), "❌ where() is wrong"
+            access = reader.where(category=TicketCategory.ACCESS, priority=Priority.URGENT)
+            assert set(access) <= set(urgent), "❌ Combined filter is wrong"
+            assert reader[-1]["ticket_id"] == tickets[-1]["ticket_id"], "❌ Negative index"
+        print("✅ Test Case 2 Passed!")
+
+        # ✅ Test Case 3: Missing footer
+        print("\n🔹 Running Test Case 3: Missing footer")
+        with open(path, "rb") as file:
+            data = file.read()
+        torn = os.path.join(tmp, "torn.binary")
+        with open(torn, "wb") as file:
+            with BinaryRecordReader(path) as reader:
+                last_row = reader._offsets[len(reader) - 1]
+            file.write(data[:last_row + 10])
+        with BinaryRecordReader(torn) as reader:
+            assert len(reader) == len(tickets) - 1, "❌ Rows before the torn one should be readable"
+            assert reader[5]["response"] == expected[4]["response"], "❌ Row decoded incorrectly"
+        print("✅ Test Case 3 Passed!")
+
+        # ✅ Test Case 4: Large lists and empty files
+        print("\n🔹 Running Test Case 4: Large lists and empty files")
+        large = dict(expected[0], ticket_id="large")
+        large["ticket_analysis"] = expected[0]["ticket_analysis"].to_dict()
+        large["ticket_analysis"]["key_points"] = [f"point {i}" for i in range(70000)]
+        path = os.path.join(tmp, "large.binary")
+        with open(path, "wb") as output:
+            writer = BinaryRecordWriter(output)
+            writer.write(large)
+            writer.finish()
+        (record,) = read_records(path)
+        assert record["ticket_analysis"].key_points == large["ticket_analysis"]["key_points"], "❌ Key points lost"
+        empty = os.path.join(tmp, "empty.binary")
+        with open(empty, "wb") as output:
+            BinaryRecordWriter(output).finish()
+        with BinaryRecordReader(empty) as reader:
+            assert len(reader) == 0 and reader.count_by("category") == {}, "❌ Zero-row file should have no rows"
+        open(empty, "wb").close()
+        with BinaryRecordReader(empty) as reader:
+            assert len(reader) == 0 and list(reader) == [] and reader.column("priority") == [], "❌ Empty file"
+        print("✅ Test Case 4 Passed!")
+
+    # ✅ Test Case 5: process_bulk_tickets formats
+    print("\n🔹 Running Test Case 5: process_bulk_tickets formats")
+    contents = [ticket["content"] for ticket in sample]
+    pretty = json.loads(await process_bulk_tickets(contents, {"role": "Admin"}, {}))
+    lines = (await process_bulk_tickets(contents, {"role": "Admin"}, {}, output_format="jsonl")).splitlines()
+    assert len(lines) == len(pretty) == len(contents), "❌ Wrong number of results"
+    for line, result in zip(lines, pretty):
+        record = json.loads(line)
+        assert record["ticket"] == result["ticket"] and record["priority_level"] == result["priority_level"], "❌ JSONL differs"
+    try:
+        await process_bulk_tickets(contents, {}, {}, output_format="binary")
+        assert False, "❌ Expected ValueError for a binary string result"
+    except ValueError:
+        pass
+    print("✅ Test Case 5 Passed!")
+
+# Run the test cases
+asyncio.run(test_output_formats())
@@ -0,0 +1,89 @@
+import asyncio
+from src.agents.scheduler import PriorityScheduler, parse_eta, sla_seconds_for
+from src.agents.ticket_analysis import Priority
+from src.tests.fake_processor import FakeProcessor
+
+LOW = "The reports page is slow"
+URGENT = "Payroll is down, this is urgent!"
+
+def ticket(content):
+    return {"content": content, "customer_info": {"customer_name": "Test", "role": "User"}}
+
+async def test_scheduler():
+    """
+    Tests the PriorityScheduler.
+
+    The test cases cover:
+    - SLA deadlines derived from the ResponseAgent ETAs.
+    - URGENT tickets jumping ahead of a LOW flood, with per-priority stats.
+    - Aging of waiting LOW tickets and SLA escalation.
+    - Per-priority concurrency limits.
+    """
+
+    # ✅ Test Case 1: SLA from ETAs
+    print("\n🔹 Running Test Case 1: SLA from ETAs")
+    assert parse_eta("1 hour") == 3600 and parse_eta("24 hours") == 86400, "❌ ETA parsing failed"
+    assert sla_seconds_for(Priority.URGENT) == 3600, "❌ URGENT SLA should be 1 hour"
+    assert sla_seconds_for(Priority.LOW) == 86400, "❌ LOW SLA should be 24 hours"
+    try:
+        parse_eta("soon")
+        assert False, "❌ Expected ValueError for an unknown ETA"
+    except ValueError:
+        pass
+    print("✅ Test Case 1 Passed!")
+
+    # ✅ Test Case 2: URGENT jumps the queue
+    print("\n🔹 Running Test Case 2: URGENT jumps the queue")
+    recorder = FakeProcessor(delay=0.001)
+    tickets = [ticket(f"{LOW} #{index}") for index in range(20)] + [ticket(URGENT)]
+    async with PriorityScheduler(recorder, max_concurrency=1) as scheduler:
+        results = await scheduler.run(tickets)
+    assert recorder.order[0] == URGENT, f"❌ URGENT should run first: {recorder.order[:3]}"
+    assert results[-1]["ticket_analysis"].priority == Priority.URGENT, "❌ Results should keep input order"
+    assert results[-1]["scheduling"]["estimated_priority"] == "URGENT", "❌ Wrong pre-classification"
+    assert all(result["scheduling"]["sla_met"] for result in results), "❌ SLA should be met"
+    stats = scheduler.stats()
+    assert stats["URGENT"]["completed"] == 1 and stats["LOW"]["completed"] == 20, f"❌ Unexpected stats: {stats}"
+    assert stats["URGENT"]["wait_p99_ms"] <= stats["LOW"]["wait_p50_ms"], f"❌ URGENT waited too long: {stats}"
+    print("✅ Test Case 2 Passed!")
+
+    # ✅ Test Case 3: Aging and SLA escalation
+    print("\n🔹 Running Test Case 3: Aging and SLA escalation")
+    now = [0.0]
+    recorder = FakeProcessor(delay=0.001)
+    scheduler = PriorityScheduler(recorder, max_concurrency=1, aging_interval=10.0, clock=lambda: now[0])
+    low = await scheduler.submit(ticket(LOW))
+    now[0] = 45.0  # LOW has aged four levels, above a fresh URGENT
+    urgent = await scheduler.submit(ticket(URGENT))
+    async with scheduler:
+        await asyncio.gather(low, urgent)
+    assert recorder.order == [LOW, URGENT], f"❌ Aged LOW ticket should run first: {recorder.order}"
+
+    now[0] = 0.0
+    recorder = FakeProcessor(delay=0.001)
+    scheduler = PriorityScheduler(recorder, max_concurrency=1, aging_interval=1e9,
+                                  sla_seconds={Priority.LOW: 10.0}, clock=lambda: now[0])
+    low = await scheduler.submit(ticket(LOW))
+    urgent = await scheduler.submit(ticket(URGENT))
+    now[0] = 11.0  # LOW is past its SLA
+    async with scheduler:
+        results = await asyncio.gather(low, urgent)
+    assert recorder.order == [LOW, URGENT], f"❌ LOW close to its deadline should run first: {recorder.order}"
+    assert not results[0]["scheduling"]["sla_met"], "❌ LOW should have missed its SLA"
+    assert scheduler.stats()["LOW"]["sla_missed"] == 1, "❌ SLA miss not counted"
+    print("✅ Test Case 3 Passed!")
+
+    # ✅ Test Case 4: Per-priority concurrency limits
+    print("\n🔹 Running Test Case 4: Per-priority concurrency limits")
+    recorder = FakeProcessor(delay=0.001)
+    async with PriorityScheduler(recorder, max_concurrency=4, limits={Priority.LOW: 1}) as scheduler:
+        await scheduler.run([ticket(f"{LOW} #{index}") for index in range(8)])
+    assert recorder.max_active == 1, f"❌ LOW should use one worker, used {recorder.max_active}"
+    recorder = FakeProcessor(delay=0.001)
+    async with PriorityScheduler(recorder, max_concurrency=4) as scheduler:
+        await scheduler.run([ticket(f"{URGENT} #{index}") for index in range(8)])
+    assert recorder.max_active == 4, f"❌ URGENT should use every worker, used {recorder.max_active}"
+    print("✅ Test Case 4 Passed!")
+
+# Run the test cases
+asyncio.run(test_scheduler())
@@ -0,0 +1,152 @@
+import asyncio
+import json
+from src.agents.near_duplicates import NearDuplicateIndex
+from src.agents.ticket_history import TicketHistory
+from src.processor import TicketProcessor
+from src.service import MicroBatcher, QueueFullError, TicketService
+from src.tests.fake_processor import FakeProcessor
+
+async def http(reader, writer, method, path, body=None):
+    payload = json.dumps(body).encode("utf-8") if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(payload)}\r\n\r\n".encode() + payload)
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+    headers = dict(line.split(": ", 1) for line in head.split("\r\n")[1:] if ": " in line)
+    data = await reader.readexactly(int(headers["Content-Length"]))
+    return int(head.split(" ")[1]), headers, data
+
+async def test_service():
+    """
+    Tests the HTTP ingestion service and its micro-batcher.
+
+    The test cases cover:
+    - Keep-alive requests returning the same results as TicketProcessor.
+    - Concurrent requests grouped into micro-batches.
+    - Health, metrics and error responses, and 503 when the queue is full.
+    - A failing ticket failing only its own request, not the rest of its micro-batch, and the
+      retried tickets not indexed or recorded twice.
+    """
+
+    ticket = {"ticket_id": "T-1", "content": "I can't login. This is urgent!",
+              "customer_info": {"customer_name": "Ann", "role": "Admin"}}
+    expected = await TicketProcessor(verbose=False).process_ticket(ticket)
+
+    # ✅ Test Case 1: Keep-alive requests
+    print("\n🔹 Running Test Case 1: Keep-alive requests")
+    service = TicketService(port=0)
+    await service.start()
+    reader, writer = await asyncio.open_connection(service.host, service.port)
+    for _ in range(2):
+        status, headers, data = await http(reader, writer, "POST", "/tickets", ticket)
+        assert status == 200 and headers["Connection"] == "keep-alive", f"❌ Unexpected reply: {status} {headers}"
+        record = json.loads(data)
+        assert record["ticket_id"] == "T-1", "❌ ticket_id not echoed"
+        assert record["ticket_analysis"] == expected["ticket_analysis"].to_dict(), "❌ Analysis differs"
+        assert record["response"] == expected["response"], "❌ Response differs"
+    writer.close()
+    print("✅ Test Case 1 Passed!")
+
+    # ✅ Test Case 2: Concurrent requests are micro-batched
+    print("\n🔹 Running Test Case 2: Micro-batching")
+    batches_before = service.batcher.batches
+
+    async def post():
+        reader, writer = await asyncio.open_connection(service.host, service.port)
+        try:
+            return (await http(reader, writer, "POST", "/tickets", ticket))[0]
+        finally:
+            writer.close()
+
+    statuses = await asyncio.gather(*(post() for _ in range(20)))
+    assert statuses == [200] * 20, f"❌ Unexpected statuses: {statuses}"
+    assert service.batcher.batches - batches_before < 20, "❌ Concurrent requests were not batched"
+    print("✅ Test Case 2 Passed!")
+
+    # ✅ Test Case 3: Health, metrics and errors
+    print("\n🔹 Running Test Case 3: Health, metrics and errors")
+    reader, writer = await asyncio.open_connection(service.host, service.port)
+    status, _, data = await http(reader, writer, "GET", "/health")
+    assert status == 200 and json.loads(data)["status"] == "ok", "❌ Health check failed"
+    status, _, data = await http(reader, writer, "GET", "/metrics")
+    assert status == 200 and b'ticket_http_requests_total{path="/tickets",status="200"} 22' in data, "❌ Metrics missing"
+    status, _, _ = await http(reader, writer, "POST", "/tickets", {"text": "no content"})
+    assert status == 400, f"❌ Expected 400, got {status}"
+    status, _, data = await http(reader, writer, "POST", "/tickets", dict(ticket, customer_info="VIP"))
+    assert status == 400 and b"customer_info" in data, f"❌ Expected 400 for customer_info, got {status}"
+    status, _, _ = await http(reader, writer, "GET", "/tickets")
+    assert status == 405, f"❌ Expected 405, got {status}"
+    status, _, _ = await http(reader, writer, "GET", "/nowhere")
+    assert status == 404, f"❌ Expected 404, got {status}"
+    writer.close()
+    await service.close()
+    print("✅ Test Case 3 Passed!")
+
+    # ✅ Test Case 4: Bounded queue
+    print("\n🔹 Running Test Case 4: Bounded queue")
+    processor = FakeProcessor()
+    processor.gate.clear()
+    service = TicketService(processor=processor, port=0, max_queue=2)
+    await service.start()
+    first = asyncio.create_task(post())
+    while not processor.batch_sizes:
+        await asyncio.sleep(0.01)  # the first batch is now held at the gate
+    queued = [service.batcher.submit(ticket) for _ in range(2)]
+    assert await post() == 503, "❌ Expected 503 when the queue is full"
+    processor.gate.set()
+    assert await first == 200, "❌ Held request should complete"
+    await asyncio.gather(*queued)
+    await service.close()
+
+    batcher = MicroBatcher(processor, max_queue=1)
+    batcher.submit(ticket)
+    try:
+        batcher.submit(ticket)
+        assert False, "❌ Expected QueueFullError"
+    except QueueFullError:
+        pass
+    print("✅ Test Case 4 Passed!")
+
+    # ✅ Test Case 5: Failing ticket isolated
+    print("\n🔹 Running Test Case 5: Failing ticket isolated")
+    processor = FakeProcessor(fail_on="boom")
+    processor.gate.clear()
+    batcher = MicroBatcher(processor, max_wait=0.05)
+    batcher.start()
+    held = batcher.submit(ticket)
+    while not processor.batch_sizes:
+        await asyncio.sleep(0.01)  # the next tickets queue up behind the held one and share a batch
+    futures = [batcher.submit(dict(ticket, content=content)) for content in ("Invoice is wrong", "boom", "I can't log in")]
+    processor.gate.set()
+    results = await asyncio.gather(held, *futures, return_exceptions=True)
+    assert processor.batch_sizes == [1, 3, 1, 1, 1], f"❌ Expected a failed batch of 3, then retries: {processor.batch_sizes}"
+    assert isinstance(results[2], ValueError), f"❌ The failing ticket should get its error: {results[2]}"
+    assert all(isinstance(result, dict) for i, result in enumerate(results) if i != 2), f"❌ Others failed: {results}"
+    assert results[1]["ticket_analysis"].category.value == "billing", "❌ Retried ticket analyzed incorrectly"
+    await batcher.close()
+
+    # A retried batch is not added to the near-duplicate index or the history twice
+    history = TicketHistory()
+    index = NearDuplicateIndex()
+    processor = TicketProcessor(verbose=False, near_duplicates=index, history=history)
+    generate_response = processor.response_agent.generate_response
+
+    async def failing_response(analysis, templates, context):
+        if context.get("fail"):
+            raise ValueError("simulated response failure")
+        return await generate_response(analysis, templates, context)
+
+    processor.response_agent.generate_response = failing_response
+    batcher = MicroBatcher(processor, max_wait=0.05)
+    batcher.start()
+    futures = [batcher.submit(dict(ticket, content=content, customer_info=info)) for content, info in
+               (("Invoice is wrong", {}), ("Export fails with error 500", {"fail": True}), ("I can't log in", {}))]
+    results = await asyncio.gather(*futures, return_exceptions=True)
+    await batcher.close()
+    history.flush()
+    assert isinstance(results[1], ValueError) and batcher.batches == 1, f"❌ Unexpected results: {results}"
+    assert index.stats()["tickets"] == 3, f"❌ Retried tickets were indexed twice: {index.stats()}"
+    assert history.stats()["inserted"] == 2, f"❌ Unexpected history rows: {history.stats()}"
+    print("✅ Test Case 5 Passed!")
+
+# Run the test cases
+asyncio.run(test_service())
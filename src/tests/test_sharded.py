@@ -0,0 +1,63 @@
+import asyncio
+import json
+from src.agents.bulk_orchestration import process_bulk_tickets
+from src.agents.sharded import ShardedAnalyzer
+from src.agents.ticket_analysis import TicketAnalysisAgent
+from src.processor import TicketProcessor
+
+async def test_sharded():
+    """
+    Tests multi-process sharded analysis.
+
+    The test cases cover:
+    - ShardedAnalyzer results matching the local agent, in input order, with fork and spawn workers.
+    - TicketProcessor(workers=N) results matching the single-process processor.
+    - process_bulk_tickets(workers=N) output matching the single-process output.
+    """
+
+    with open("data/sample_tickets.json", "r") as file:
+        sample = json.load(file)
+    tickets = [dict(ticket, ticket_id=f"T{i}") for i, ticket in enumerate(sample * 15)]
+    contents = [ticket["content"] for ticket in tickets]
+
+    # ✅ Test Case 1: Sharded batch analysis
+    print("\n🔹 Running Test Case 1: Sharded batch analysis")
+    agent = TicketAnalysisAgent()
+    expected = await agent.analyze_batch((content, None) for content in contents)
+    for start_method in ("fork", "spawn"):
+        with ShardedAnalyzer(agent, workers=2, chunk_size=7, start_method=start_method) as analyzer:
+            analyses = await analyzer.analyze_batch((content, None) for content in contents)
+            assert analyses == expected, f"❌ {start_method}: sharded analyses differ from the local agent"
+            single = await analyzer.analyze_ticket(contents[1])
+            assert single == expected[1], f"❌ {start_method}: analyze_ticket differs"
+            compounds = await analyzer.score_sentiment(contents)
+            assert compounds == [analysis.sentiment for analysis in expected], f"❌ {start_method}: sentiment differs"
+            assert await analyzer.analyze_batch([]) == [], "❌ An empty batch should return no analyses"
+            assert analyzer.rules is agent.rules, "❌ Other attributes should come from the local agent"
+    print("✅ Test Case 1 Passed!")
+
+    # ✅ Test Case 2: Sharded TicketProcessor
+    print("\n🔹 Running Test Case 2: Sharded TicketProcessor")
+    baseline = await TicketProcessor(verbose=False).process_tickets(tickets)
+    processor = TicketProcessor(verbose=False, workers=2)
+    try:
+        results = await processor.process_tickets(tickets)
+    finally:
+        processor.close()
+    assert results == baseline, "❌ Sharded processor results differ"
+    print("✅ Test Case 2 Passed!")
+
+    # ✅ Test Case 3: Sharded process_bulk_tickets
+    print("\n🔹 Running Test Case 3: Sharded process_bulk_tickets")
+    single = json.loads(await process_bulk_tickets(contents, {"role": "Admin"}, {}, batch_size=16))
+    sharded = json.loads(await process_bulk_tickets(contents, {"role": "Admin"}, {}, batch_size=16, workers=2))
+    assert len(sharded) == len(single) == len(contents), "❌ Wrong number of results"
+    for a, b in zip(single, sharded):
+        a.pop("processed_at", None)
+        b.pop("processed_at", None)
+        assert a == b, f"❌ Sharded bulk result differs: {b}"
+    print("✅ Test Case 3 Passed!")
+
+# Run the test cases (guarded: spawned workers re-import this module)
+if __name__ == "__main__":
+    asyncio.run(test_sharded())
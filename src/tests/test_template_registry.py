@@ -0,0 +1,73 @@
+import asyncio
+import json
+import os
+import tempfile
+from src.agents.template_registry import TemplateRegistry, TemplateError, CompiledTemplate
+
+async def test_template_registry():
+    """
+    Tests the TemplateRegistry and compiled templates.
+
+    The test cases cover:
+    - Compiled rendering matching str.format.
+    - Memoized rendering of repeated responses, and non-string values rendered without the memo.
+    - Reloading only when the templates file changes, keeping the last templates if the file disappears.
+    - Malformed templates being rejected at load time.
+    """
+
+    values = {"name": "Alice", "feature": "dashboard", "priority_level": "URGENT", "eta": "1 hour"}
+
+    # ✅ Test Case 1: Compiled rendering matches str.format
+    print("\n🔹 Running Test Case 1: Compiled rendering")
+    with open("data/response_templates.json", "r") as file:
+        templates = json.load(file)
+    for template in list(templates.values()) + ["{{literal}} {name!r:>12} {eta:.3}", ""]:
+        expected = template.format(**values)
+        assert CompiledTemplate(template).render(values) == expected, f"❌ Mismatch for {template!r}"
+    print("✅ Test Case 1 Passed!")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "templates.json")
+        with open(path, "w") as file:
+            json.dump({"access": "Hello {name}, ETA {eta}."}, file)
+
+        # ✅ Test Case 2: Memoized rendering
+        print("\n🔹 Running Test Case 2: Memoized rendering")
+        registry = TemplateRegistry(path, check_interval=0)
+        first = registry.render("access", values)
+        second = registry.render("access", values)
+        assert first == second == "Hello Alice, ETA 1 hour.", f"❌ Unexpected response: {first!r}"
+        assert (registry.hits, registry.misses) == (1, 1), f"❌ Unexpected cache counters: {registry.hits}, {registry.misses}"
+        assert registry.render("billing", values) == "Hello Alice, we are working on your request.", "❌ Expected default template"
+        for name in (["Alice", "Bob"], {"first": "Alice"}, 42):
+            odd = dict(values, name=name)
+            assert registry.render("access", odd) == "Hello {name}, ETA {eta}.".format(**odd), f"❌ Mismatch for {name!r}"
+        print("✅ Test Case 2 Passed!")
+
+        # ✅ Test Case 3: Reload on change
+        print("\n🔹 Running Test Case 3: Reload on change")
+        assert registry.reload() is False, "❌ Unchanged file should not be reloaded"
+        with open(path, "w") as file:
+            json.dump({"access": "Hi {name}!"}, file)
+        os.utime(path, ns=(1, 1))
+        assert registry.render("access", values) == "Hi Alice!", "❌ Changed template was not picked up"
+        assert registry.reloads == 2, f"❌ Expected 2 loads, got {registry.reloads}"
+        os.remove(path)
+        assert registry.render("access", values) == "Hi Alice!", "❌ Last templates should survive a missing file"
+        print("✅ Test Case 3 Passed!")
+
+        # ✅ Test Case 4: Malformed templates fail at load time
+        print("\n🔹 Running Test Case 4: Malformed templates")
+        for bad in ["Hello {name", "Hello {customer}", "Hello {}", "Hello {name!x}", "Hello {name:d}"]:
+            with open(path, "w") as file:
+                json.dump({"access": bad}, file)
+            try:
+                TemplateRegistry(path)
+            except TemplateError:
+                pass
+            else:
+                assert False, f"❌ Expected TemplateError for {bad!r}"
+        print("✅ Test Case 4 Passed!")
+
+# Run the test cases
+asyncio.run(test_template_registry())
@@ -10,6 +10,7 @@ async def test_ticket_analysis():
     - Negative sentiment detection.
     - Billing inquiries.
     - Follow-up requirement detection.
+    - Batch analysis matching the per-ticket path.
 
     The function ensures that tickets are correctly categorized, prioritized, and analyzed for sentiment and urgency.
     """
@@ -23,7 +24,7 @@ async def test_ticket_analysis():
         "customer_info": {"role": "Finance Director"}
     }
     result1 = await agent.analyze_ticket(ticket1["content"], ticket1["customer_info"])
-    print("🔍 Debug Info:", vars(result1))
+    print("🔍 Debug Info:", result1.to_dict())
 
     assert result1.priority == Priority.URGENT, f"❌ Expected priority URGENT, but got {result1.priority}"
     assert result1.category == TicketCategory.ACCESS, f"❌ Expected category 'ACCESS', got {result1.category}"
@@ -37,7 +38,7 @@ async def test_ticket_analysis():
         "customer_info": {"role": "Customer"}
     }
     result2 = await agent.analyze_ticket(ticket2["content"], ticket2["customer_info"])
-    print("🔍 Debug Info:", vars(result2))
+    print("🔍 Debug Info:", result2.to_dict())
 
     assert result2.sentiment < -0.5, f"❌ Expected sentiment < -0.5, but got {result2.sentiment}"
     assert int(result2.priority) >= int(Priority.MEDIUM), f"❌ Expected priority at least MEDIUM, but got {result2.priority}"
@@ -50,7 +51,7 @@ async def test_ticket_analysis():
         "customer_info": {"role": "Billing Admin"}
     }
     result3 = await agent.analyze_ticket(ticket3["content"], ticket3["customer_info"])
-    print("🔍 Debug Info:", vars(result3))
+    print("🔍 Debug Info:", result3.to_dict())
 
     assert result3.category == TicketCategory.BILLING, f"❌ Expected category 'BILLING', got {result3.category}"
     assert result3.priority == Priority.MEDIUM, f"❌ Expected priority MEDIUM, got {result3.priority}"
@@ -63,10 +64,21 @@ async def test_ticket_analysis():
         "customer_info": {"role": "User"}
     }
     result4 = await agent.analyze_ticket(ticket4["content"], ticket4["customer_info"])
-    print("🔍 Debug Info:", vars(result4))
+    print("🔍 Debug Info:", result4.to_dict())
 
     assert result4.follow_up_required is True, f"❌ Expected follow_up_required to be True, got {result4.follow_up_required}"
     print("✅ Test Case 4 Passed!")
 
+    # ✅ Test Case 5: Batch Analysis Matches Per-Ticket Analysis
+    print("\n🔹 Running Test Case 5: Batch Analysis")
+    tickets = [ticket1, ticket2, ticket3, ticket4, ticket1,
+               {"content": "Feature request:\nplease add dark mode.\n\nImportant for us!", "customer_info": None}]
+    pairs = [(ticket["content"], ticket["customer_info"]) for ticket in tickets]
+    expected = [await agent.analyze_ticket(content, info) for content, info in pairs]
+    for batch_size in (1, 2, 100):
+        results = await agent.analyze_batch(iter(pairs), batch_size=batch_size)
+        assert results == expected, f"❌ Batch results differ from per-ticket results (batch_size={batch_size})"
+    print("✅ Test Case 5 Passed!")
+
 # Run the test cases
 asyncio.run(test_ticket_analysis())
@@ -0,0 +1,146 @@
+import asyncio
+import io
+import os
+import tempfile
+from datetime import datetime, timedelta
+from src.agents.bulk_orchestration import stream_bulk_tickets
+from src.agents.output_formats import read_records
+from src.agents.ticket_analysis import Priority, TicketCategory
+from src.agents.ticket_history import NEGATIVE_SENTIMENT, TicketHistory
+from src.benchmarks.synthetic import generate_tickets
+from src.processor import TicketProcessor
+
+NOW = 1_700_000_000.0
+
+async def test_ticket_history():
+    """
+    Tests the SQLite ticket history.
+
+    The test cases cover:
+    - Dashboard queries matching a scan of every result, with ticket ids and roles recorded by TicketProcessor.
+    - Per-minute aggregates kept up to date across batches, matching the raw rows.
+    - WAL readers seeing only flushed batches, pruning, and importing a bulk output file.
+    """
+
+    tickets = [dict(ticket, ticket_id=f"T{i}") for i, ticket in enumerate(generate_tickets(600, seed=3))]
+    clock = lambda: NOW
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.db")
+
+        # ✅ Test Case 1: Dashboard queries
+        print("\n🔹 Running Test Case 1: Dashboard queries")
+        history = TicketHistory(path, batch_size=64, clock=clock)
+        processor = TicketProcessor(verbose=False, history=history)
+        results = await processor.process_tickets(tickets)
+        processor.close()
+        assert history.stats()["inserted"] == len(tickets), f"❌ Unexpected stats: {history.stats()}"
+        # Spread the same results over the last three hours
+        records = [dict(result, ticket_id=ticket["ticket_id"], customer_info=ticket["customer_info"],
+                        processed_at=NOW - 60 * 60 * 3 + 18 * i)
+                   for i, (ticket, result) in enumerate(zip(tickets, results))]
+        history.add_many(records)
+        history.flush()
+        rows = records + [dict(r, processed_at=NOW) for r in records]  # plus the rows TicketProcessor recorded
+
+        def matches(record, category=None, priority=None, role=None, since=None, sentiment_below=None):
+            analysis = record["ticket_analysis"]
+            return ((category is None or analysis.category == category)
+                    and (priority is None or analysis.priority == priority)
+                    and (role is None or record["customer_info"]["role"] == role)
+                    and (since is None or record["processed_at"] >= since)
+                    and (sentiment_below is None or analysis.sentiment < sentiment_below))
+
+        hour_ago = NOW - 3600
+        filters = [
+            {"category": TicketCategory.ACCESS, "priority": Priority.URGENT, "since": hour_ago, "sentiment_below": -0.5},
+            {"priority": Priority.URGENT, "since": hour_ago},
+            {"role": tickets[0]["customer_info"]["role"]},
+            {"category": TicketCategory.BILLING, "sentiment_below": 0.0},
+        ]
+        for criteria in filters:
+            expected = [r for r in rows if matches(r, **criteria)]
+            found = history.query(**criteria, limit=None)
+            key = lambda r: (r["ticket_id"], r["ticket_analysis"].to_dict()["sentiment"])
+            assert sorted(map(key, found)) == sorted(map(key, expected)), f"❌ Query differs: {criteria}"
+            times = [r["processed_at"] for r in found]
+            assert times == sorted(times, reverse=True), "❌ Records should be most recent first"
+            by_id = {r["ticket_id"]: r["ticket_analysis"] for r in records}
+            assert all(r["ticket_analysis"] == by_id[r["ticket_id"]] for r in found), "❌ Analyses differ"
+            assert history.count(**criteria) == len(expected), f"❌ Count differs: {criteria}"
+        relative = history.count(category="access", priority=4, since=timedelta(hours=1), sentiment_below=-0.5)
+        assert relative == history.count(**filters[0]), "❌ Relative and absolute bounds should agree"
+        assert len(history.query(limit=5)) == 5, "❌ limit ignored"
+        latest = history.query(since=NOW)[0]
+        assert latest["processed_at"] == datetime.utcfromtimestamp(NOW), f"❌ Unexpected time: {latest['processed_at']}"
+        assert {r["role"] for r in history.query(since=NOW, limit=None)} <= {t["customer_info"]["role"] for t in tickets}
+        plan = " ".join(row[3] for row in history._db.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM tickets WHERE category = 'access' AND priority = 4 "
+            "AND processed_at >= ? AND sentiment < -0.5", (hour_ago,)))
+        assert "tickets_category" in plan, f"❌ Dashboard query should use the category index: {plan}"
+        print("✅ Test Case 1 Passed!")
+
+        # ✅ Test Case 2: Per-minute aggregates
+        print("\n🔹 Running Test Case 2: Per-minute aggregates")
+        minutes = {}
+        for r in rows:
+            minute = int(r["processed_at"] // 60) * 60
+            stat = minutes.setdefault(minute, {"tickets": 0, "sentiment": 0.0, "negative": 0, "follow_ups": 0})
+            stat["tickets"] += 1
+            stat["sentiment"] += r["ticket_analysis"].sentiment
+            stat["negative"] += r["ticket_analysis"].sentiment < NEGATIVE_SENTIMENT
+            stat["follow_ups"] += r["ticket_analysis"].follow_up_required
+        series = history.minute_stats()
+        assert [s["minute"] for s in series] == [datetime.utcfromtimestamp(m) for m in sorted(minutes)], "❌ Minutes differ"
+        for s in series:
+            stat = minutes[int((s["minute"] - datetime(1970, 1, 1)).total_seconds())]
+            assert s["tickets"] == stat["tickets"] and s["negative"] == stat["negative"], f"❌ Minute differs: {s}"
+            assert s["follow_ups"] == stat["follow_ups"], f"❌ Follow-ups differ: {s}"
+            assert abs(s["avg_sentiment"] - stat["sentiment"] / stat["tickets"]) < 1e-4, f"❌ Average differs: {s}"
+        counts = history.count_by("category")
+        assert counts == {c: sum(1 for r in rows if r["ticket_analysis"].category == c) for c in counts}, "❌ count_by differs"
+        assert sum(counts.values()) == len(rows), "❌ count_by should cover every row"
+        last_hour = history.count_by("priority", since=timedelta(hours=1))
+        assert sum(last_hour.values()) == history.count(since=int(hour_ago // 60) * 60), "❌ Bounded count_by differs"
+        urgent = history.minute_stats(since=hour_ago, priority=Priority.URGENT)
+        assert sum(s["tickets"] for s in urgent) == history.count(priority=4, since=int(hour_ago // 60) * 60), "❌ Filtered minutes"
+        try:
+            history.count_by("role")
+            assert False, "❌ Expected ValueError for an unaggregated field"
+        except ValueError:
+            pass
+        print("✅ Test Case 2 Passed!")
+
+        # ✅ Test Case 3: WAL readers, pruning and imports
+        print("\n🔹 Running Test Case 3: WAL readers, pruning and imports")
+        reader = TicketHistory(path, clock=clock)
+        before = reader.count()
+        history.add(records[0])
+        assert reader.count() == before, "❌ Buffered records should not be visible"
+        history.flush()
+        assert reader.count() == before + 1, "❌ Flushed batch should be visible to other connections"
+        assert history._db.execute("PRAGMA journal_mode").fetchone()[0] == "wal", "❌ Expected WAL mode"
+        totals = sum(history.count_by("priority").values())
+        deleted = history.prune(hour_ago)
+        assert deleted == sum(1 for r in rows + records[:1] if r["processed_at"] < hour_ago), "❌ Wrong rows pruned"
+        assert reader.count() == before + 1 - deleted, "❌ Pruned rows still visible"
+        assert sum(history.count_by("priority").values()) == totals, "❌ Pruning should keep the aggregates"
+        reader.close()
+        history.close()
+
+        output = io.StringIO()
+        await stream_bulk_tickets(tickets[:20] + [{"ticket_id": "bad", "content": 42}], output,
+                                  processor=TicketProcessor(verbose=False))
+        jsonl = os.path.join(tmp, "results.jsonl")
+        with open(jsonl, "w") as file:
+            file.write(output.getvalue())
+        with TicketHistory(clock=clock) as imported:
+            imported.add_many(read_records(jsonl))
+            imported.flush()
+            assert imported.stats()["skipped"] == 1, f"❌ Error record should be skipped: {imported.stats()}"
+            assert imported.count() == 20, "❌ Imported records missing"
+            assert {r["ticket_id"] for r in imported.query(limit=None)} == {t["ticket_id"] for t in tickets[:20]}
+        print("✅ Test Case 3 Passed!")
+
+# Run the test cases
+asyncio.run(test_ticket_history())
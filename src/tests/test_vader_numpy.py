@@ -0,0 +1,74 @@
+import asyncio
+import random
+from src.agents.vader_lexicon import get_analyzer, get_lexicon
+from src.agents.vader_numpy import VectorizedSentimentAnalyzer
+from src.agents.ticket_analysis import TicketAnalysisAgent
+
+# Maximum allowed difference from nltk's scores
+TOLERANCE = 1e-4
+
+# Words that exercise negation, boosters, capitalization, "but", "least", "kind of" and idioms
+SPECIAL_WORDS = [
+    "not", "never", "isn't", "don't", "can't", "won't,", "without", "Never",
+    "very", "VERY", "really", "extremely", "barely", "hardly", "kinda", "so", "SO", "this",
+    "but", "BUT", "least", "LEAST", "at", "At", "kind", "of", "sort",
+    "the", "shit", "bomb", "bad", "ass", "yeah", "right", "cut", "mustard", "kiss", "death",
+    "hand", "to", "mouth", "just", "enough",
+    "!", "?", "!!!", "??", "good!", "(bad)", "'nice'", ":)", ":-(", "GREAT", "terrible.",
+]
+
+def assert_parity(expected, actual, text):
+    for key in ("neg", "neu", "pos", "compound"):
+        assert abs(expected[key] - actual[key]) <= TOLERANCE, f"❌ {key} differs for {text!r}: {expected} vs {actual}"
+
+async def test_vader_numpy():
+    """
+    Tests the NumPy VectorizedSentimentAnalyzer against nltk's SentimentIntensityAnalyzer.
+
+    The test cases cover:
+    - Hand-written sentences for each VADER rule.
+    - Randomized texts mixing lexicon words with rule trigger words.
+    - The numpy backend giving the same TicketAnalysis results as the nltk backend.
+    """
+
+    reference = get_analyzer("nltk")
+    vectorized = VectorizedSentimentAnalyzer()
+
+    # ✅ Test Case 1: Rule-specific sentences
+    print("\n🔹 Running Test Case 1: Rule-specific sentences")
+    sentences = [
+        "", "   ", "a b c", "I can't log in to my account!",
+        "Your system is absolutely terrible! I am very disappointed.",
+        "The service is good but the support is awful",
+        "This is not good", "This is never so good", "I am at least happy", "least happy",
+        "It was kind of good", "It was sort of bad", "That movie was the bomb", "yeah right, great job",
+        "The product is GREAT and the staff are nice", "GOOD", "good good good bad good",
+        "Why is this broken??", "Why is this broken????", "Help!!!!!!", "I love it :)",
+    ]
+    for text, actual in zip(sentences, vectorized.polarity_scores_batch(sentences)):
+        assert_parity(reference.polarity_scores(text), actual, text)
+    print("✅ Test Case 1 Passed!")
+
+    # ✅ Test Case 2: Randomized parity
+    print("\n🔹 Running Test Case 2: Randomized parity")
+    rng = random.Random(11)
+    lexicon_words = sorted(get_lexicon())
+    texts = []
+    for _ in range(3000):
+        words = [rng.choice(SPECIAL_WORDS) if rng.random() < 0.5 else rng.choice(lexicon_words)
+                 for _ in range(rng.randint(0, 25))]
+        texts.append(" ".join(word.upper() if rng.random() < 0.1 else word for word in words))
+    for text, actual in zip(texts, vectorized.polarity_scores_batch(texts)):
+        assert_parity(reference.polarity_scores(text), actual, text)
+    print("✅ Test Case 2 Passed!")
+
+    # ✅ Test Case 3: Agent backends agree
+    print("\n🔹 Running Test Case 3: Agent backends agree")
+    pairs = [(text, None) for text in sentences + texts[:500]]
+    nltk_results = await TicketAnalysisAgent().analyze_batch(pairs)
+    numpy_results = await TicketAnalysisAgent(sentiment_backend="numpy").analyze_batch(pairs)
+    assert nltk_results == numpy_results, "❌ numpy backend changed the analysis results"
+    print("✅ Test Case 3 Passed!")
+
+# Run the test cases
+asyncio.run(test_vader_numpy())